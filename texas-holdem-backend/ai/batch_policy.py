@@ -0,0 +1,35 @@
+"""
+Vectorised bot policies over game.batch.BatchTables, for headless simulation.
+"""
+from typing import Tuple
+
+import numpy as np
+
+from game.batch import NO_ACTION, BatchTables
+from game.hand_history import ActionCode
+
+def fallback_policy(batch: BatchTables, rng: np.random.Generator) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    The rule set of gemini_player._fallback_logic (without opponent reads) for
+    every waiting table at once: check when free, call below a quarter of the
+    stack (raising 10% of the time when deep enough), otherwise fold.
+    Returns (ActionCode per table or NO_ACTION, raise-to amounts).
+    """
+    waiting = batch.waiting()
+    chips = batch.acting_column(batch.chips)
+    current_bet = batch.acting_column(batch.current_bet)
+    to_call = batch.bet_to_call - current_bet
+
+    raise_roll = rng.random(len(batch)) < 0.1
+    free = to_call <= 0
+    cheap = ~free & (to_call < chips / 4)
+    raising = cheap & raise_roll & (chips > to_call * 2)
+
+    actions = np.full(len(batch), ActionCode.FOLD, dtype=np.int8)
+    actions[free] = ActionCode.CHECK
+    actions[cheap] = ActionCode.CALL
+    actions[raising] = ActionCode.RAISE
+    actions[~waiting] = NO_ACTION
+
+    amounts = np.where(raising, current_bet + to_call + 20, 0)
+    return actions, amounts
@@ -0,0 +1,179 @@
+"""
+Blueprint bot: reads action probabilities from an offline-trained strategy table.
+
+The abstraction maps a live table to an infoset (street, hand bucket, betting
+history) and the table stores one float32 probability per abstract action
+(fold, call/check, raise) for every infoset. The file is mmapped, so a lookup
+is an index computation plus one struct.unpack_from. Train a table with
+tools/train_blueprint.py.
+"""
+import logging
+import mmap
+import os
+import random
+import struct
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from game.card import Card
+from game.hand_evaluator import evaluate_hand
+from game.state import TableState, legal_actions
+
+logger = logging.getLogger('poker.ai.blueprint')
+
+N_STREETS = 4
+N_BUCKETS = 8
+N_HISTORIES = 6
+N_ACTIONS = 3
+N_INFOSETS = N_STREETS * N_BUCKETS * N_HISTORIES
+MAX_RAISES = 2
+
+FOLD, CALL, RAISE = range(N_ACTIONS)
+
+MAGIC = b"BPT1"
+VERSION = 1
+_HEADER = struct.Struct("<4sHHHHH2x")
+_PROBS = struct.Struct(f"<{N_ACTIONS}f")
+
+STREET_OF_STAGE = {"PRE_FLOP": 0, "FLOP": 1, "TURN": 2, "RIVER": 3}
+
+def _preflop_strength(hi: int, lo: int, suited: bool) -> float:
+    if hi == lo:
+        return 0.5 + (hi - 2) / 24
+    gap = hi - lo - 1
+    strength = (hi - 2) / 12 * 0.45 + (lo - 2) / 12 * 0.2
+    strength += 0.06 if suited else 0.0
+    strength += (0.05, 0.03, 0.01)[gap] if gap < 3 else 0.0
+    return strength
+
+PREFLOP_BUCKETS: Dict[Tuple[int, int, bool], int] = {
+    (hi, lo, suited): min(N_BUCKETS - 1, int(_preflop_strength(hi, lo, suited) * N_BUCKETS))
+    for hi in range(2, 15) for lo in range(2, hi + 1) for suited in (False, True)
+}
+
+def _has_draw(cards: Sequence[Card]) -> bool:
+    suits = [0] * 5
+    mask = 0
+    for c in cards:
+        suits[c.suit] += 1
+        mask |= 1 << c.rank
+    if mask & (1 << 14):
+        mask |= 1 << 1
+    if max(suits) == 4:
+        return True
+    return any((mask >> low) & 0b1111 == 0b1111 for low in range(1, 12))
+
+def hand_bucket(hole: Sequence[Card], board: Sequence[Card]) -> int:
+    """Abstract strength bucket in 0..N_BUCKETS-1; higher is stronger."""
+    if len(hole) < 2:
+        return 0
+    if not board:
+        a, b = hole[0], hole[1]
+        hi, lo = max(a.rank, b.rank), min(a.rank, b.rank)
+        return PREFLOP_BUCKETS[(int(hi), int(lo), a.suit == b.suit)]
+
+    category, ranks = evaluate_hand(list(hole) + list(board))
+    if category >= 8:
+        return 7
+    if category >= 6:
+        return 6
+    if category >= 4:
+        return 5
+    if category == 3:
+        return 4
+    if category == 2:
+        top_board = max(c.rank for c in board)
+        paired_with_hole = any(c.rank == ranks[0] for c in hole)
+        return 3 if paired_with_hole and ranks[0] >= top_board else 2
+    draw = len(board) < 5 and _has_draw(list(hole) + list(board))
+    return 1 if draw else 0
+
+def history_index(raises: int, facing: bool) -> int:
+    return min(raises, MAX_RAISES) * 2 + int(facing)
+
+def infoset_index(street: int, bucket: int, history: int) -> int:
+    return (street * N_BUCKETS + bucket) * N_HISTORIES + history
+
+def legal_mask(history: int) -> Tuple[bool, bool, bool]:
+    raises, facing = divmod(history, 2)
+    return bool(facing), True, raises < MAX_RAISES
+
+def write_table(path: str, probabilities: Sequence[float]) -> None:
+    """Writes a strategy table; `probabilities` holds N_ACTIONS floats per infoset."""
+    if len(probabilities) != N_INFOSETS * N_ACTIONS:
+        raise ValueError("Strategy table has the wrong size")
+    tmp = path + ".tmp"
+    with open(tmp, "wb") as f:
+        f.write(_HEADER.pack(MAGIC, VERSION, N_STREETS, N_BUCKETS, N_HISTORIES, N_ACTIONS))
+        f.write(struct.pack(f"<{len(probabilities)}f", *probabilities))
+    os.replace(tmp, path)
+
+class BlueprintTable:
+    """Read-only, mmapped strategy table."""
+
+    def __init__(self, path: str):
+        self._file = open(path, "rb")
+        self._mm = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, streets, buckets, histories, actions = _HEADER.unpack_from(self._mm, 0)
+        if magic != MAGIC or version != VERSION or (streets, buckets, histories, actions) != (N_STREETS, N_BUCKETS, N_HISTORIES, N_ACTIONS):
+            self.close()
+            raise ValueError(f"Incompatible blueprint table: {path}")
+
+    def probabilities(self, index: int) -> Tuple[float, ...]:
+        return _PROBS.unpack_from(self._mm, _HEADER.size + index * _PROBS.size)
+
+    def close(self) -> None:
+        self._mm.close()
+        self._file.close()
+
+_table: Optional[BlueprintTable] = None
+_table_missing = False
+
+def load_table(path: Optional[str] = None) -> Optional[BlueprintTable]:
+    """Opens the table at BLUEPRINT_PATH once per process; None if there is none."""
+    global _table, _table_missing
+    if _table is None and not _table_missing:
+        path = path or os.getenv("BLUEPRINT_PATH", "blueprint.bin")
+        try:
+            _table = BlueprintTable(path)
+        except (OSError, ValueError) as e:
+            logger.warning(f"No blueprint table ({e}); blueprint bots will only check/call")
+            _table_missing = True
+    return _table
+
+def live_infoset(state: TableState, player_id: int) -> int:
+    seat = state.seats[player_id]
+    street = STREET_OF_STAGE.get(state.stage, 3)
+    bucket = hand_bucket(seat.hand, state.community_cards)
+    raises = sum(1 for s in state.seats if (s.last_action or "").startswith("Raise"))
+    facing = state.bet_to_call > seat.current_bet
+    return infoset_index(street, bucket, history_index(raises, facing))
+
+def get_blueprint_decision(state: TableState, player_id: int, table: Optional[BlueprintTable] = None,
+                           rng: Optional[random.Random] = None) -> Dict[str, object]:
+    """Samples an action from the blueprint for the live state."""
+    table = table or load_table()
+    rng = rng or random
+    seat = state.seats[player_id]
+    to_call = state.bet_to_call - seat.current_bet
+    index = live_infoset(state, player_id)
+
+    probs: List[float] = list(table.probabilities(index)) if table else [0.0, 1.0, 0.0]
+    can_raise = any(a == "raise" for a, _ in legal_actions(state))
+    fold_ok, _, raise_ok = legal_mask(index % N_HISTORIES)
+    if not fold_ok or to_call <= 0:
+        probs[FOLD] = 0.0
+    if not (raise_ok and can_raise):
+        probs[RAISE] = 0.0
+    if sum(probs) <= 0:
+        probs = [0.0, 1.0, 0.0]
+
+    choice = rng.choices(range(N_ACTIONS), weights=probs)[0]
+    if choice == FOLD:
+        return {"action": "fold", "amount": 0}
+    if choice == RAISE:
+        return {"action": "raise", "amount": state.bet_to_call + max(state.big_blind, state.pot // 2)}
+    return {"action": "call" if to_call > 0 else "check", "amount": 0}
+
+def decide(state: Dict[str, object], snapshot: TableState, player_id: int, opponent_model=None) -> Dict[str, object]:
+    """Entry point for ai.registry."""
+    return get_blueprint_decision(snapshot, player_id)
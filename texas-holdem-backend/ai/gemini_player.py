@@ -3,21 +3,37 @@ import json
 import logging
 import re
 import random
-from typing import Dict, Any
-import google.generativeai as genai
+from typing import Dict, Any, Optional
 from dotenv import load_dotenv
 from tenacity import retry, stop_after_attempt, wait_fixed
 
+from game.card import Card
+from game.hand_evaluator import BoardEvaluator
+from .opponent_model import OpponentModel
+
 load_dotenv()
 
 logger = logging.getLogger('poker.ai')
 
 API_KEY = os.getenv("GOOGLE_API_KEY")
-if API_KEY:
-    genai.configure(api_key=API_KEY)
-    model = genai.GenerativeModel("models/gemini-2.0-flash")
-else:
-    model = None
+API_ENDPOINT = os.getenv("GEMINI_API_ENDPOINT")
+_model = None
+_model_ready = False
+
+def get_model():
+    """The Gemini model, or None without an API key. The client library is only imported on first call."""
+    global _model, _model_ready
+    if not _model_ready:
+        if API_KEY:
+            import google.generativeai as genai
+            if API_ENDPOINT:
+                # e.g. the local tools.fake_gemini server used for load testing
+                genai.configure(api_key=API_KEY, transport="rest", client_options={"api_endpoint": API_ENDPOINT})
+            else:
+                genai.configure(api_key=API_KEY)
+            _model = genai.GenerativeModel("models/gemini-2.0-flash")
+        _model_ready = True
+    return _model
 
 PERSONALITIES = {
     "Viper": "You are a Loose-Aggressive maniac. You love to bluff and put pressure on opponents. You rarely fold pre-flop. You want to dominate the table.",
@@ -32,36 +48,50 @@ def _calculate_pot_odds(pot: int, to_call: int) -> str:
     ratio = total_pot / to_call
     return f"{ratio:.1f}:1"
 
-def _summarize_opponents(players: list, my_id: int) -> str:
+def _summarize_opponents(players: list, my_id: int, opponent_model: Optional[OpponentModel] = None) -> str:
     lines = []
     for p in players:
         if p['id'] == my_id: continue
         status = "folded" if p['isFolded'] else f"${p['chips']} chips, bet ${p['currentBet']}"
         action = f" - last: {p['lastAction']}" if p.get('lastAction') else ""
-        lines.append(f"  - {p['name']}: {status}{action}")
+        reads = f" - reads: {opponent_model.describe(p['id'])}" if opponent_model else ""
+        lines.append(f"  - {p['name']}: {status}{action}{reads}")
     return "\n".join(lines)
 
-@retry(stop=stop_after_attempt(3), wait=wait_fixed(1))
-def get_ai_decision(game_state: Dict[str, Any], player_id: int) -> Dict[str, Any]:
-    if not model:
-        return _fallback_logic(game_state, player_id)
-
-    my_player = next((p for p in game_state['players'] if p['id'] == player_id), None)
-    if not my_player: return {"action": "fold", "amount": 0}
-
+def _describe_hand(hand: list, community_cards: list) -> str:
+    try:
+        hole = [Card.from_str(c) for c in hand]
+        board = [Card.from_str(c) for c in community_cards]
+    except (ValueError, IndexError):
+        return "unknown"
+    if len(hole) != 2:
+        return "unknown"
+
+    info = BoardEvaluator(board).hand_info(hole)
+    parts = [info.made]
+    if info.draws:
+        parts.append(", ".join(info.draws))
+    if info.outs:
+        parts.append(f"{info.outs} outs to improve")
+    return "; ".join(parts)
+
+def _build_prompt(game_state: Dict[str, Any], my_player: Dict[str, Any], player_id: int,
+                  opponent_model: Optional[OpponentModel]) -> str:
     persona_text = PERSONALITIES.get(my_player.get('name'), PERSONALITIES["default"])
 
     to_call = game_state['betToCall'] - my_player['currentBet']
     pot_odds = _calculate_pot_odds(game_state['pot'], to_call)
-    opponents = _summarize_opponents(game_state['players'], player_id)
+    opponents = _summarize_opponents(game_state['players'], player_id, opponent_model)
+    made_hand = _describe_hand(my_player['hand'], game_state['communityCards'])
 
-    prompt = f"""You are playing Texas Hold'em. 
+    return f"""You are playing Texas Hold'em. 
 IDENTITY: {persona_text}
 
 YOUR STATE:
 - Name: {my_player.get('name')}
 - Chips: ${my_player['chips']}
 - Hand: {my_player['hand']}
+- Made Hand: {made_hand}
 - Current Bet: ${my_player['currentBet']}
 
 TABLE:
@@ -84,46 +114,116 @@ Respond with JSON ONLY: {{"action": "string", "amount": integer}}
 Valid actions: fold, check, call, raise.
 """
 
-    try:
-        response = model.generate_content(prompt)
-        text = response.text.strip()
-        
-        json_match = re.search(r"```json\s*(\{.*?\})\s*```", text, re.DOTALL)
-        if json_match:
-            clean_json = json_match.group(1)
+def _parse_decision(text: str, to_call: int) -> Dict[str, Any]:
+    text = text.strip()
+
+    json_match = re.search(r"```json\s*(\{.*?\})\s*```", text, re.DOTALL)
+    if json_match:
+        clean_json = json_match.group(1)
+    else:
+        start_idx = text.find('{')
+        end_idx = text.rfind('}')
+        if start_idx != -1 and end_idx != -1:
+            clean_json = text[start_idx : end_idx + 1]
         else:
-            start_idx = text.find('{')
-            end_idx = text.rfind('}')
-            if start_idx != -1 and end_idx != -1:
-                clean_json = text[start_idx : end_idx + 1]
-            else:
-                clean_json = text
+            clean_json = text
+
+    decision = json.loads(clean_json)
+    
+    if decision['action'] == 'fold' and to_call == 0:
+        decision['action'] = 'check'
+
+    if decision['action'] not in ['fold', 'check', 'call', 'bet', 'raise']:
+        raise ValueError("Invalid Action")
+    return decision
+
+@retry(stop=stop_after_attempt(3), wait=wait_fixed(1), reraise=True)
+def _ask(model, prompt: str, to_call: int) -> Dict[str, Any]:
+    response = model.generate_content(prompt)
+    return _parse_decision(response.text, to_call)
+
+@retry(stop=stop_after_attempt(3), wait=wait_fixed(1), reraise=True)
+async def _ask_async(model, prompt: str, to_call: int) -> Dict[str, Any]:
+    if API_ENDPOINT:
+        # The REST transport only has a blocking client; keep it off the event loop
+        import asyncio  # only asyncio servers get here; keep it out of eventlet start-up
+        response = await asyncio.to_thread(model.generate_content, prompt)
+    else:
+        response = await model.generate_content_async(prompt)
+    return _parse_decision(response.text, to_call)
+
+def get_ai_decision(game_state: Dict[str, Any], player_id: int,
+                    opponent_model: Optional[OpponentModel] = None) -> Dict[str, Any]:
+    model = get_model()
+    if not model:
+        return _fallback_logic(game_state, player_id, opponent_model)
+
+    my_player = next((p for p in game_state['players'] if p['id'] == player_id), None)
+    if not my_player: return {"action": "fold", "amount": 0}
+    prompt = _build_prompt(game_state, my_player, player_id, opponent_model)
 
-        decision = json.loads(clean_json)
-        
-        if decision['action'] == 'fold' and to_call == 0:
-            decision['action'] = 'check'
+    try:
+        decision = _ask(model, prompt, game_state['betToCall'] - my_player['currentBet'])
+        logger.info(f"[{game_state['gameId'][:8]}] AI {my_player['name']}: {decision['action']} {decision.get('amount', '')}")
+        return decision
+    except Exception as e:
+        logger.warning(f"AI Error for {player_id}: {e}")
+        return _fallback_logic(game_state, player_id, opponent_model)
 
-        if decision['action'] not in ['fold', 'check', 'call', 'bet', 'raise']:
-            raise ValueError("Invalid Action")
+async def get_ai_decision_async(game_state: Dict[str, Any], player_id: int,
+                                opponent_model: Optional[OpponentModel] = None) -> Dict[str, Any]:
+    """get_ai_decision() for asyncio servers: awaits the Gemini call instead of blocking on it."""
+    model = get_model()
+    if not model:
+        return _fallback_logic(game_state, player_id, opponent_model)
 
+    my_player = next((p for p in game_state['players'] if p['id'] == player_id), None)
+    if not my_player: return {"action": "fold", "amount": 0}
+    prompt = _build_prompt(game_state, my_player, player_id, opponent_model)
+
+    try:
+        decision = await _ask_async(model, prompt, game_state['betToCall'] - my_player['currentBet'])
         logger.info(f"[{game_state['gameId'][:8]}] AI {my_player['name']}: {decision['action']} {decision.get('amount', '')}")
         return decision
     except Exception as e:
         logger.warning(f"AI Error for {player_id}: {e}")
-        return _fallback_logic(game_state, player_id)
+        return _fallback_logic(game_state, player_id, opponent_model)
+
+def decide(state: Dict[str, Any], snapshot, player_id: int,
+           opponent_model: Optional[OpponentModel] = None) -> Dict[str, Any]:
+    """Entry point for ai.registry."""
+    return get_ai_decision(state, player_id, opponent_model)
 
-def _fallback_logic(game_state: dict, player_id: int) -> dict:
+async def decide_async(state: Dict[str, Any], snapshot, player_id: int,
+                       opponent_model: Optional[OpponentModel] = None) -> Dict[str, Any]:
+    return await get_ai_decision_async(state, player_id, opponent_model)
+
+def _fallback_logic(game_state: dict, player_id: int, opponent_model: Optional[OpponentModel] = None) -> dict:
     p_list = game_state.get('players', [])
     p = next((x for x in p_list if x['id'] == player_id), None)
     if not p: return {"action": "fold", "amount": 0}
 
     to_call = game_state['betToCall'] - p['currentBet']
+    others = [x for x in p_list if x['id'] != player_id and not x['isFolded']]
 
     if to_call == 0:
+        if opponent_model and others and p['chips'] > 40:
+            reads = [opponent_model.get(x['id']) for x in others]
+            if all(t and t.fold_to_bet_rate > 0.5 for t in reads) and random.random() < 0.3:
+                return {"action": "raise", "amount": p['currentBet'] + 20}
         return {"action": "check", "amount": 0}
-    
-    if to_call < (p['chips'] / 4):
+
+    call_limit = p['chips'] / 4
+    aggressor = next((x for x in others if x['currentBet'] == game_state['betToCall']
+                      and (x.get('lastAction') or '').startswith('Raise')), None)
+    if opponent_model and aggressor:
+        read = opponent_model.get(aggressor['id'])
+        if read and read.style() == "loose-aggressive":
+            call_limit = p['chips'] / 3
+        elif read and read.style().startswith("tight"):
+            call_limit = p['chips'] / 6
+
+    if to_call < call_limit:
         if random.random() < 0.1 and p['chips'] > to_call * 2:
              return {"action": "raise", "amount": p['currentBet'] + to_call + 20}
         return {"action": "call", "amount": 0}
@@ -0,0 +1,183 @@
+"""
+Local search bot: determinized Monte Carlo search with UCB1 at the root.
+
+Each iteration samples the hidden cards (opponent hole cards and the rest of
+the deck) consistent with what the bot can see, plays one root action through
+the engine's own rules via engine.apply() and rolls the hand out with a cheap
+policy. Rollouts are split across worker processes and every decision stays
+inside a fixed wall-clock budget.
+"""
+import logging
+import math
+import multiprocessing
+import os
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor, wait
+from typing import Dict, List, Optional, Tuple
+
+from game.card import Card
+from game.engine import apply
+from game.state import TableState, is_terminal, legal_actions
+
+logger = logging.getLogger('poker.ai.mcts')
+
+ALL_CARDS = [Card.from_int(code) for code in range(52)]
+MAX_ROLLOUT_STEPS = 200
+MCTS_BUDGET_MS = float(os.getenv("MCTS_BUDGET_MS", "50"))
+EXPLORATION = 1.4
+
+Action = Tuple[str, int]
+Stats = Dict[Action, List[float]]
+
+_pool: Optional[ProcessPoolExecutor] = None
+_pool_size = 0
+
+def determinize(state: TableState, player_id: int, rng: random.Random) -> TableState:
+    """Replaces every card `player_id` cannot see with a random consistent deal."""
+    known = {c.to_int() for c in state.seats[player_id].hand}
+    known.update(c.to_int() for c in state.community_cards)
+    unseen = [ALL_CARDS[code] for code in range(52) if code not in known]
+    rng.shuffle(unseen)
+
+    seats = []
+    pos = 0
+    for seat in state.seats:
+        if seat.id != player_id and seat.hand:
+            seat = seat._replace(hand=tuple(unseen[pos:pos + 2]))
+            pos += 2
+        seats.append(seat)
+    return state._replace(seats=tuple(seats), deck=tuple(unseen[pos:]))
+
+def rollout_action(state: TableState, rng: random.Random) -> Action:
+    seat = state.seats[state.active_player_id]
+    to_call = state.bet_to_call - seat.current_bet
+    roll = rng.random()
+    if to_call <= 0:
+        if roll < 0.15 and seat.chips > state.big_blind:
+            return "raise", state.bet_to_call + state.big_blind
+        return "check", 0
+    if roll < 0.25:
+        return "fold", 0
+    if roll < 0.35 and seat.chips > to_call * 2:
+        return "raise", state.bet_to_call + to_call + state.big_blind
+    return "call", 0
+
+def rollout(state: TableState, player_id: int, rng: random.Random) -> int:
+    """Plays the hand out and returns the chips `player_id` ends with."""
+    current = state
+    for _ in range(MAX_ROLLOUT_STEPS):
+        if is_terminal(current):
+            break
+        current = apply(current, *rollout_action(current, rng))
+    return current.seats[player_id].chips
+
+def search(state: TableState, player_id: int, budget_s: float, seed: Optional[int] = None,
+           deadline: Optional[float] = None) -> Stats:
+    """
+    Runs UCB1 over the root actions until `budget_s` has elapsed, or until the
+    time.monotonic() `deadline` if that comes first; returns [visits, total
+    reward] per action.
+    """
+    if deadline is not None:
+        # A worker that picks the job up late only uses what is left of the caller's budget
+        budget_s = min(budget_s, deadline - time.monotonic())
+    deadline = time.perf_counter() + budget_s
+    rng = random.Random(seed)
+    actions = legal_actions(state)
+    stats: Stats = {a: [0, 0.0] for a in actions}
+    total = 0
+    me = state.seats[player_id]
+    # Rewards are scaled to roughly [-1, 1] so the UCB exploration term is meaningful
+    scale = float(max(me.chips + me.current_bet + state.pot, 1))
+
+    while actions and time.perf_counter() < deadline:
+        untried = [a for a in actions if stats[a][0] == 0]
+        if untried:
+            action = untried[0]
+        else:
+            log_total = math.log(total)
+            action = max(actions, key=lambda a: stats[a][1] / stats[a][0] + EXPLORATION * math.sqrt(log_total / stats[a][0]))
+
+        world = determinize(state, player_id, rng)
+        try:
+            reward = (rollout(apply(world, *action), player_id, rng) - me.chips) / scale
+        except ValueError as e:
+            logger.debug(f"Rollout aborted: {e}")
+            reward = 0.0
+        stats[action][0] += 1
+        stats[action][1] += reward
+        total += 1
+    return stats
+
+def _get_pool(workers: int) -> ProcessPoolExecutor:
+    global _pool, _pool_size
+    if _pool is None or _pool_size != workers:
+        if _pool is not None:
+            _pool.shutdown(wait=False, cancel_futures=True)
+        # spawn keeps workers independent of the (possibly monkey-patched) server process
+        _pool = ProcessPoolExecutor(workers, mp_context=multiprocessing.get_context("spawn"))
+        _pool_size = workers
+    return _pool
+
+def warm_up(workers: Optional[int] = None) -> None:
+    """Starts the worker processes ahead of the first decision."""
+    workers = workers or os.cpu_count() or 1
+    if workers > 1:
+        pool = _get_pool(workers)
+        wait([pool.submit(time.sleep, 0) for _ in range(workers)])
+
+def load() -> None:
+    """Load hook for ai.registry: spawns the pool so the first decision does not pay for it."""
+    warm_up()
+
+def merge_stats(parts: List[Stats]) -> Stats:
+    merged: Stats = {}
+    for part in parts:
+        for action, (visits, reward) in part.items():
+            entry = merged.setdefault(action, [0, 0.0])
+            entry[0] += visits
+            entry[1] += reward
+    return merged
+
+def get_mcts_decision(state: TableState, player_id: int, budget_ms: float = 50,
+                      workers: Optional[int] = None) -> Dict[str, object]:
+    """Picks the most visited root action within `budget_ms` of wall-clock time."""
+    started = time.perf_counter()
+    actions = legal_actions(state)
+    if not actions or state.active_player_id != player_id:
+        return {"action": "fold", "amount": 0}
+    if len(actions) == 1:
+        return {"action": actions[0][0], "amount": actions[0][1]}
+
+    workers = workers or os.cpu_count() or 1
+    # Leave headroom for pickling the state and collecting results
+    budget_s = budget_ms / 1000.0 * (0.8 if workers > 1 else 0.95)
+
+    if workers > 1:
+        pool = _get_pool(workers)
+        seeds = [random.getrandbits(32) for _ in range(workers)]
+        remaining = budget_ms / 1000.0 - (time.perf_counter() - started)
+        deadline = time.monotonic() + budget_s
+        futures = [pool.submit(search, state, player_id, budget_s, seed, deadline) for seed in seeds]
+        done, late = wait(futures, timeout=max(remaining, 0.0))
+        # Searches that have not started are dropped; running ones stop at `deadline` on their own
+        for future in late:
+            future.cancel()
+        stats = merge_stats([f.result() for f in done if f.exception() is None])
+    else:
+        stats = search(state, player_id, budget_s)
+
+    visited = {a: s for a, s in stats.items() if s[0] > 0}
+    if not visited:
+        # No rollout finished in time: never put chips in blind
+        to_call = state.bet_to_call - state.seats[player_id].current_bet
+        return {"action": "fold" if to_call > 0 else "check", "amount": 0}
+
+    action, amount = max(visited, key=lambda a: (visited[a][0], visited[a][1] / visited[a][0]))
+    logger.debug(f"MCTS seat {player_id}: {action} {amount} after {sum(s[0] for s in visited.values())} rollouts")
+    return {"action": action, "amount": amount}
+
+def decide(state: Dict[str, object], snapshot: TableState, player_id: int, opponent_model=None) -> Dict[str, object]:
+    """Entry point for ai.registry."""
+    return get_mcts_decision(snapshot, player_id, MCTS_BUDGET_MS)
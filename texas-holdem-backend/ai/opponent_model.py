@@ -0,0 +1,119 @@
+from typing import Dict, Optional
+
+from game.engine import GameEngine, GameObserver
+from game.player import Player
+
+class Tendencies:
+    """Exponentially decayed tendency counters for one seat."""
+
+    __slots__ = ("hands", "vpip", "pfr", "aggressive", "passive", "folds_to_bet", "faced_bet",
+                 "_vpip_now", "_pfr_now")
+
+    def __init__(self) -> None:
+        self.hands = 0.0
+        self.vpip = 0.0
+        self.pfr = 0.0
+        self.aggressive = 0.0
+        self.passive = 0.0
+        self.folds_to_bet = 0.0
+        self.faced_bet = 0.0
+        self._vpip_now = False
+        self._pfr_now = False
+
+    def start_hand(self, decay: float) -> None:
+        self.hands = self.hands * decay + 1
+        self.vpip *= decay
+        self.pfr *= decay
+        self.aggressive *= decay
+        self.passive *= decay
+        self.folds_to_bet *= decay
+        self.faced_bet *= decay
+        self._vpip_now = False
+        self._pfr_now = False
+
+    @property
+    def vpip_rate(self) -> float:
+        return self.vpip / self.hands if self.hands else 0.0
+
+    @property
+    def pfr_rate(self) -> float:
+        return self.pfr / self.hands if self.hands else 0.0
+
+    @property
+    def aggression_factor(self) -> float:
+        return self.aggressive / self.passive if self.passive else self.aggressive
+
+    @property
+    def fold_to_bet_rate(self) -> float:
+        return self.folds_to_bet / self.faced_bet if self.faced_bet else 0.0
+
+    def style(self) -> str:
+        looseness = "loose" if self.vpip_rate >= 0.35 else "tight"
+        aggression = "aggressive" if self.aggression_factor >= 1.5 or self.pfr_rate >= 0.2 else "passive"
+        return f"{looseness}-{aggression}"
+
+class OpponentModel(GameObserver):
+    """
+    Per-table opponent model fed by engine events. Every action is an O(1)
+    counter update; older hands fade out through `decay` applied once per hand.
+    """
+
+    def __init__(self, decay: float = 0.97, min_hands: float = 5.0):
+        self.decay = decay
+        self.min_hands = min_hands
+        self.seats: Dict[int, Tendencies] = {}
+        # Observers see the table after each action, so the bet a seat faced is tracked here
+        self._bet_to_call = 0
+
+    def get(self, player_id: int) -> Optional[Tendencies]:
+        """Tendencies for a seat, or None until enough hands have been seen."""
+        t = self.seats.get(player_id)
+        if t is None or t.hands < self.min_hands:
+            return None
+        return t
+
+    def on_hand_start(self, engine: GameEngine) -> None:
+        self._bet_to_call = 0
+        for p in engine.players:
+            if p.hand:
+                t = self.seats.get(p.id)
+                if t is None:
+                    t = self.seats[p.id] = Tendencies()
+                t.start_hand(self.decay)
+
+    def on_street(self, engine: GameEngine) -> None:
+        self._bet_to_call = 0
+
+    def on_action(self, engine: GameEngine, player: Player, action: str, added: int) -> None:
+        if action == "blind":
+            self._bet_to_call = engine.big_blind  # the engine asks for the full big blind even if it was short
+            return
+        to_call = self._bet_to_call - (player.current_bet - added)
+        self._bet_to_call = engine.bet_to_call
+        t = self.seats.get(player.id)
+        if t is None:
+            return
+
+        if to_call > 0:
+            t.faced_bet += 1
+            if action == "fold":
+                t.folds_to_bet += 1
+
+        if engine.stage == "PRE_FLOP":
+            if action in ("call", "raise", "all_in") and not t._vpip_now:
+                t._vpip_now = True
+                t.vpip += 1
+            if action == "raise" and not t._pfr_now:
+                t._pfr_now = True
+                t.pfr += 1
+        elif action == "raise":
+            t.aggressive += 1
+        elif action in ("call", "all_in"):
+            t.passive += 1
+
+    def describe(self, player_id: int) -> str:
+        t = self.get(player_id)
+        if t is None:
+            return "no reads yet"
+        return (f"{t.style()}, VPIP {t.vpip_rate:.0%}, PFR {t.pfr_rate:.0%}, "
+                f"AF {t.aggression_factor:.1f}, folds to bets {t.fold_to_bet_rate:.0%}")
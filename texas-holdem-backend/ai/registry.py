@@ -0,0 +1,93 @@
+"""
+Pluggable AI backends, imported on first use.
+
+A backend is registered by name with the "module:function" path of its
+decision function, so nothing heavy (the Gemini client, numpy-backed tables,
+search pools) is imported until a table first asks that backend for a move.
+Decision functions share one signature:
+
+    decide(state: dict, snapshot: TableState, player_id: int,
+           opponent_model: Optional[OpponentModel]) -> {"action": ..., "amount": ...}
+
+where `state` is GameEngine.to_dict() for the deciding seat. A backend may
+also name a coroutine with the same signature for asyncio servers; otherwise
+the sync function runs in a worker thread there. An optional `warm` function
+runs once when the backend loads, e.g. to start worker processes.
+"""
+import importlib
+import logging
+import time
+from typing import Any, Callable, Dict, Optional, Tuple
+
+logger = logging.getLogger('poker.ai')
+
+Decision = Dict[str, Any]
+
+class Backend:
+    def __init__(self, name: str, target: str, async_target: Optional[str] = None, paced: bool = False,
+                 warm: Optional[str] = None):
+        self.name = name
+        self.target = target
+        self.async_target = async_target
+        self.warm = warm
+        # Paced backends wait AI_MOVE_DELAY before answering so they feel like a person
+        self.paced = paced
+        self.load_ms: Optional[float] = None
+        self._decide: Optional[Callable[..., Decision]] = None
+        self._decide_async: Optional[Callable[..., Any]] = None
+
+    @property
+    def loaded(self) -> bool:
+        return self._decide is not None
+
+    def load(self) -> "Backend":
+        if self._decide is None:
+            started = time.perf_counter()
+            self._decide = _resolve(self.target)
+            if self.async_target:
+                self._decide_async = _resolve(self.async_target)
+            if self.warm:
+                _resolve(self.warm)()
+            self.load_ms = round((time.perf_counter() - started) * 1000, 1)
+            logger.info(f"Loaded AI backend {self.name} in {self.load_ms} ms")
+        return self
+
+    def decide(self, state: dict, snapshot, player_id: int, opponent_model=None) -> Decision:
+        return self.load()._decide(state, snapshot, player_id, opponent_model)
+
+    async def decide_async(self, state: dict, snapshot, player_id: int, opponent_model=None) -> Decision:
+        self.load()
+        if self._decide_async is not None:
+            return await self._decide_async(state, snapshot, player_id, opponent_model)
+        import asyncio  # only asyncio servers get here; keep it out of eventlet and tool start-up
+        return await asyncio.to_thread(self._decide, state, snapshot, player_id, opponent_model)
+
+def _resolve(target: str) -> Callable:
+    module_name, _, attr = target.partition(":")
+    return getattr(importlib.import_module(module_name), attr)
+
+_backends: Dict[str, Backend] = {}
+
+def register(name: str, target: str, async_target: Optional[str] = None, paced: bool = False,
+             warm: Optional[str] = None) -> Backend:
+    """Adds (or replaces) a backend; its module is not imported until first use."""
+    backend = Backend(name, target, async_target, paced, warm)
+    _backends[name] = backend
+    return backend
+
+def get(name: str) -> Backend:
+    try:
+        return _backends[name]
+    except KeyError:
+        raise ValueError(f"Unknown AI backend: {name}") from None
+
+def names() -> Tuple[str, ...]:
+    return tuple(_backends)
+
+def load_times() -> Dict[str, Optional[float]]:
+    """Import time in ms of every backend, or None for those not loaded yet."""
+    return {name: backend.load_ms for name, backend in _backends.items()}
+
+register("gemini", "ai.gemini_player:decide", "ai.gemini_player:decide_async", paced=True)
+register("mcts", "ai.mcts_player:decide", warm="ai.mcts_player:load")
+register("blueprint", "ai.blueprint:decide")
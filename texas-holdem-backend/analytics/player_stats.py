@@ -0,0 +1,201 @@
+"""
+Player statistics over recorded hand histories.
+
+One streaming pass per segment keeps memory constant in the number of hands;
+segments can be aggregated in a process pool and the partial results merged.
+An optional JSON state file remembers which segments were already counted so
+re-runs only read new ones.
+"""
+import csv
+import json
+import os
+from dataclasses import asdict, dataclass, fields
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Iterable, List, Optional
+
+from game.hand_history import ActionCode, HandRecord, read_segment, segment_paths
+
+VOLUNTARY = (ActionCode.CALL, ActionCode.RAISE, ActionCode.ALL_IN)
+PASSIVE = (ActionCode.CALL, ActionCode.ALL_IN)
+
+@dataclass
+class PlayerStats:
+    name: str
+    hands: int = 0
+    vpip_hands: int = 0
+    pfr_hands: int = 0
+    aggressive_actions: int = 0
+    passive_actions: int = 0
+    showdowns: int = 0
+    showdowns_won: int = 0
+    net_chips: int = 0
+    net_big_blinds: float = 0.0
+
+    def merge(self, other: "PlayerStats") -> None:
+        for f in fields(self):
+            if f.name != "name":
+                setattr(self, f.name, getattr(self, f.name) + getattr(other, f.name))
+
+    @property
+    def vpip(self) -> float:
+        return self.vpip_hands / self.hands if self.hands else 0.0
+
+    @property
+    def pfr(self) -> float:
+        return self.pfr_hands / self.hands if self.hands else 0.0
+
+    @property
+    def aggression_factor(self) -> float:
+        """Post-flop (bets + raises) / calls."""
+        if not self.passive_actions:
+            return float(self.aggressive_actions)
+        return self.aggressive_actions / self.passive_actions
+
+    @property
+    def showdown_winrate(self) -> float:
+        return self.showdowns_won / self.showdowns if self.showdowns else 0.0
+
+    @property
+    def bb_per_100(self) -> float:
+        return 100 * self.net_big_blinds / self.hands if self.hands else 0.0
+
+    def to_row(self) -> Dict[str, object]:
+        return {
+            "name": self.name,
+            "hands": self.hands,
+            "vpip": round(self.vpip, 4),
+            "pfr": round(self.pfr, 4),
+            "aggression_factor": round(self.aggression_factor, 3),
+            "showdowns": self.showdowns,
+            "showdown_winrate": round(self.showdown_winrate, 4),
+            "net_chips": self.net_chips,
+            "bb_per_100": round(self.bb_per_100, 2),
+        }
+
+class StatsAggregate:
+    """Per-name statistics; bots are named after their PERSONALITIES persona."""
+
+    def __init__(self) -> None:
+        self.players: Dict[str, PlayerStats] = {}
+        self.hands = 0
+        self.segments: List[str] = []
+
+    def _player(self, name: str) -> PlayerStats:
+        stats = self.players.get(name)
+        if stats is None:
+            stats = self.players[name] = PlayerStats(name)
+        return stats
+
+    def add_hand(self, hand: HandRecord) -> None:
+        self.hands += 1
+        dealt = {s.seat: s for s in hand.seats if s.cards}
+        invested = dict.fromkeys(dealt, 0)
+        vpip, pfr, folded = set(), set(), set()
+
+        for a in hand.actions:
+            if a.seat not in dealt:
+                continue
+            invested[a.seat] += a.amount
+            if a.action == ActionCode.FOLD:
+                folded.add(a.seat)
+            elif a.street == 0:
+                if a.action in VOLUNTARY:
+                    vpip.add(a.seat)
+                if a.action == ActionCode.RAISE:
+                    pfr.add(a.seat)
+            elif a.action == ActionCode.RAISE:
+                self._player(dealt[a.seat].name).aggressive_actions += 1
+            elif a.action in PASSIVE:
+                self._player(dealt[a.seat].name).passive_actions += 1
+
+        for seat, record in dealt.items():
+            stats = self._player(record.name)
+            stats.hands += 1
+            stats.vpip_hands += seat in vpip
+            stats.pfr_hands += seat in pfr
+            if hand.showdown and seat not in folded:
+                stats.showdowns += 1
+                stats.showdowns_won += seat in hand.payouts
+            net = hand.payouts.get(seat, 0) + hand.refunds.get(seat, 0) - invested[seat]
+            stats.net_chips += net
+            stats.net_big_blinds += net / hand.big_blind if hand.big_blind else 0.0
+
+    def add_hands(self, hands: Iterable[HandRecord]) -> "StatsAggregate":
+        for hand in hands:
+            self.add_hand(hand)
+        return self
+
+    def merge(self, other: "StatsAggregate") -> "StatsAggregate":
+        self.hands += other.hands
+        self.segments.extend(other.segments)
+        for name, stats in other.players.items():
+            self._player(name).merge(stats)
+        return self
+
+    def rows(self) -> List[Dict[str, object]]:
+        return [s.to_row() for s in sorted(self.players.values(), key=lambda s: s.name)]
+
+    def write_csv(self, path: str) -> None:
+        rows = self.rows()
+        with open(path, "w", newline="") as f:
+            writer = csv.DictWriter(f, fieldnames=list(PlayerStats("").to_row()))
+            writer.writeheader()
+            writer.writerows(rows)
+
+    def write_json(self, path: str) -> None:
+        with open(path, "w") as f:
+            json.dump({"hands": self.hands, "players": self.rows()}, f, indent=2)
+
+    def to_state(self) -> Dict[str, object]:
+        return {
+            "hands": self.hands,
+            "segments": self.segments,
+            "players": [asdict(s) for s in self.players.values()],
+        }
+
+    @classmethod
+    def from_state(cls, state: Dict[str, object]) -> "StatsAggregate":
+        agg = cls()
+        agg.hands = state.get("hands", 0)
+        agg.segments = list(state.get("segments", []))
+        for raw in state.get("players", []):
+            agg.players[raw["name"]] = PlayerStats(**raw)
+        return agg
+
+def aggregate_segment(path: str) -> StatsAggregate:
+    agg = StatsAggregate().add_hands(read_segment(path))
+    agg.segments.append(os.path.basename(path))
+    return agg
+
+def aggregate_segments(paths: List[str], processes: Optional[int] = None) -> StatsAggregate:
+    """Aggregates segments, fanning out to a process pool when there is more than one."""
+    total = StatsAggregate()
+    if processes == 1 or len(paths) <= 1:
+        for part in map(aggregate_segment, paths):
+            total.merge(part)
+        return total
+
+    # spawn, not fork: the server process is eventlet monkey-patched and forked pools deadlock there
+    with ProcessPoolExecutor(processes, mp_context=multiprocessing.get_context("spawn")) as pool:
+        for part in pool.map(aggregate_segment, paths):
+            total.merge(part)
+    return total
+
+def update_stats(directory: str, state_path: Optional[str] = None, processes: Optional[int] = None) -> StatsAggregate:
+    """Adds sealed segments not yet recorded in `state_path` and saves the merged state back."""
+    total = StatsAggregate()
+    if state_path and os.path.exists(state_path):
+        with open(state_path) as f:
+            total = StatsAggregate.from_state(json.load(f))
+
+    done = set(total.segments)
+    fresh = [p for p in segment_paths(directory) if os.path.basename(p) not in done]
+    total.merge(aggregate_segments(fresh, processes))
+
+    if state_path:
+        tmp = state_path + ".tmp"
+        with open(tmp, "w") as f:
+            json.dump(total.to_state(), f)
+        os.replace(tmp, state_path)
+    return total
@@ -1,15 +1,27 @@
+import time
+_import_started = time.perf_counter()
+
 import eventlet
 eventlet.monkey_patch()
 
-import time
+import os
 import logging
-from flask import Flask, jsonify, request
+from typing import Optional
+from dotenv import load_dotenv
+from flask import Blueprint, Flask, current_app, jsonify, request
 from flask_socketio import SocketIO, emit, join_room
 from flask_cors import CORS
 
 from game.engine import GameEngine
-from game.player import Player
-from ai.gemini_player import get_ai_decision
+from game.equity import equity_stream
+from game.lobby import Lobby
+from game.shot_clock import ShotClock, turn_key
+from game.timer_wheel import TimerWheel
+from ai import registry
+from services import (
+    LOBBY_BOT_BACKEND, bot_to_act, equity_request, games, human_seat, new_table,
+    new_tournament, opponent_models, parse_game_request, parse_tables_request, seat_room, tournaments,
+)
 
 logging.basicConfig(
     level=logging.INFO,
@@ -17,14 +29,111 @@ logging.basicConfig(
     datefmt='%H:%M:%S'
 )
 logger = logging.getLogger('poker')
+load_dotenv()
+
+# Routes and socket handlers are registered here and bound to an app by create_app()
+api = Blueprint('api', __name__)
+
+def current_socketio() -> SocketIO:
+    """The SocketIO server of the app handling the current request or background task."""
+    return current_app.extensions['socketio']
+
+def _in_app_context(flask_app: Flask, target, *args) -> None:
+    with flask_app.app_context():
+        target(*args)
+
+def spawn(target, *args) -> None:
+    """Starts a background task on the current app's server, inside that app's context."""
+    current_socketio().start_background_task(_in_app_context, current_app._get_current_object(), target, *args)
+
+AI_MOVE_DELAY = float(os.getenv("AI_MOVE_DELAY", "1.0"))
+
+# Equity is streamed in small batches with a pause between them, so one client
+# costs at most roughly batch time / (batch time + interval) of the server
+EQUITY_BATCH = int(os.getenv("EQUITY_BATCH", "100"))
+EQUITY_INTERVAL = float(os.getenv("EQUITY_INTERVAL", "0.1"))
+# game id -> {sid: seat}; each client sees (and gets equity for) one human seat
+game_clients: dict[str, dict[str, int]] = {}
+equity_keys: dict[str, tuple] = {}
+
+# Tournaments run every table in one background task; standings are pushed at most every STANDINGS_INTERVAL seconds
+STANDINGS_INTERVAL = float(os.getenv("STANDINGS_INTERVAL", "1.0"))
+
+# Lobby players wait at most LOBBY_FILL_AFTER seconds before the empty seats go to bots
+LOBBY_FILL_AFTER = float(os.getenv("LOBBY_FILL_AFTER", "5.0"))
+LOBBY_INTERVAL = float(os.getenv("LOBBY_INTERVAL", "0.5"))
+lobby = Lobby(fill_after=LOBBY_FILL_AFTER)
+lobby_tickets: dict[str, str] = {}  # sid -> ticket id
+lobby_loop_running = False
+
+# Every table's shot clock runs on one timer wheel, advanced by a single background task while any clock runs
+CLOCK_TICK = float(os.getenv("CLOCK_TICK", "0.1"))
+clock_wheel = TimerWheel(tick=CLOCK_TICK)
+clock_loop_running = False
+
+def stream_equity(sid: str, key: tuple, hole: list, board: list, opponents: int) -> None:
+    for estimate in equity_stream(hole, board, opponents, batch=EQUITY_BATCH):
+        if equity_keys.get(sid) != key:
+            return  # the hand moved on; a newer stream (if any) owns this client
+        current_socketio().emit('equity', {
+            "handNo": key[0],
+            "hand": [c.to_str() for c in hole],
+            "communityCards": [c.to_str() for c in board],
+            "opponents": opponents,
+            "equity": round(estimate.equity, 4),
+            "samples": estimate.samples,
+            "stdError": round(estimate.std_error, 4),
+            "done": estimate.done,
+        }, to=sid)
+        current_socketio().sleep(EQUITY_INTERVAL)
 
-app = Flask(__name__)
-app.config['SECRET_KEY'] = 'poker_secret'
-CORS(app)
+def schedule_equity(game: GameEngine) -> None:
+    """Starts an equity stream for each client of `game` whose hole cards, board or opponent count changed."""
+    requests = {}
+    for sid, seat in game_clients.get(game.id, {}).items():
+        if seat not in requests:
+            requests[seat] = equity_request(game, seat)
+        key, hole, board, opponents = requests[seat]
+        if equity_keys.get(sid, ()) != key:
+            equity_keys[sid] = key
+            if key:
+                spawn(stream_equity, sid, key, hole, board, opponents)
 
-socketio = SocketIO(app, cors_allowed_origins="*", async_mode='eventlet') 
+def broadcast_update(game: GameEngine) -> None:
+    """Sends every human seat its own view of the table."""
+    for player in game.players:
+        if player.is_human:
+            current_socketio().emit('update', game.to_dict(for_player_id=player.id), to=seat_room(game.id, player.id))
+    schedule_equity(game)
+    sync_clock(game)
 
-games: dict[str, GameEngine] = {}
+def on_clock_event(game: GameEngine, event: dict) -> None:
+    """Pushes a countdown to the table; after a timeout, also the new state and the next bot's turn."""
+    for player in game.players:
+        if player.is_human:
+            current_socketio().emit('clock', event, to=seat_room(game.id, player.id))
+    if event["phase"] == "expired":
+        logger.info(f"[{game.id[:8]}] Seat {event['playerId']} timed out: {event['action']}")
+        broadcast_update(game)
+        # A bot that timed out is still inside its own AI cycle, which carries on when its answer arrives
+        if bot_to_act(game) and game.players[event["playerId"]].is_human:
+            spawn(run_ai_cycle, game.id)
+
+shot_clock = ShotClock(clock_wheel, on_clock_event)
+
+def run_clock() -> None:
+    global clock_loop_running
+    while len(clock_wheel):
+        current_socketio().sleep(CLOCK_TICK)
+        clock_wheel.advance()
+    clock_loop_running = False
+
+def sync_clock(game: GameEngine) -> None:
+    global clock_loop_running
+    shot_clock.sync(game)
+    if len(clock_wheel) and not clock_loop_running:
+        clock_loop_running = True
+        spawn(run_clock)
 
 def run_ai_cycle(game_id: str) -> None:
     game = games.get(game_id)
@@ -47,79 +156,257 @@ def run_ai_cycle(game_id: str) -> None:
                 break
 
             state = game.to_dict(for_player_id=current_id)
+            snapshot = game.snapshot()
+            turn = turn_key(game)
 
-        time.sleep(1.0)  
-        
-        move = get_ai_decision(state, current_id)
+        backend = registry.get(current_player.ai_backend)
+        if backend.paced:
+            time.sleep(AI_MOVE_DELAY)
+        move = backend.decide(state, snapshot, current_id, opponent_models.get(game_id))
         logger.info(f"[{game_id[:8]}] AI {current_player.name}: {move['action']} {move.get('amount', '')}")
 
         with game.lock:
+            if turn_key(game) != turn:
+                continue  # the shot clock moved the table on while the bot was thinking
             try:
                 game.process_player_action(
                     current_id, move['action'], move.get('amount', 0)
                 )
-                socketio.emit('update', game.to_dict(for_player_id=0), to=game_id)
+                broadcast_update(game)
             except Exception as e:
                 logger.error(f"[{game_id[:8]}] Error processing AI {current_id}: {e}")
                 game.process_player_action(current_id, "fold")
-                socketio.emit('update', game.to_dict(for_player_id=0), to=game_id)
+                broadcast_update(game)
 
-@app.route('/api/game', methods=['POST'])
-def create_game():
-    data = request.json or {}
-    p_name = data.get('playerName', 'Human')
+def run_tournament(tournament_id: str) -> None:
+    from ai.batch_policy import fallback_policy  # numpy; only tournament servers pay for it
+    tournament = tournaments[tournament_id]
+    room = f"tournament:{tournament_id}"
+    last_push = 0.0
+    while not tournament.finished:
+        busts = tournament.step(fallback_policy)
+        now = time.monotonic()
+        if busts and now - last_push >= STANDINGS_INTERVAL:
+            current_socketio().emit('standings', tournament.standings(), to=room)
+            last_push = now
+        current_socketio().sleep(0)  # let requests and other games run between steps
 
-    human = Player(id=0, name=p_name, chips=1000, is_human=True)
-    bots = [
-        Player(id=1, name="Viper", chips=1000),
-        Player(id=2, name="Mountain", chips=1000),
-        Player(id=3, name="Shark", chips=1000)
-    ]
+    winner = tournament.winner()
+    logger.info(f"[{tournament_id[:8]}] Tournament won by {winner.name} after {tournament.hands_played} hands")
+    current_socketio().emit('standings', tournament.standings(), to=room)
 
-    engine = GameEngine([human] + bots)
-    games[engine.id] = engine
+def create_table(humans: list[str], seats: int = 4, chips: int = 1000, blinds: tuple[int, int] = (10, 20),
+                 backend: str = "gemini", backends: Optional[dict[int, str]] = None) -> GameEngine:
+    """new_table(), then starts the bots if one of them acts first."""
+    engine = new_table(humans, seats, chips, blinds, backend, backends)
+    sync_clock(engine)
+    if bot_to_act(engine):
+        spawn(run_ai_cycle, engine.id)
+    return engine
 
-    if engine.active_player_id != 0:
-        socketio.start_background_task(run_ai_cycle, engine.id)
+@api.route('/api/health', methods=['GET'])
+def health():
+    """Start-up timings, and the load time of every AI backend used so far."""
+    return jsonify({"importMs": IMPORT_MS, "startupMs": startup_ms, "aiBackends": registry.load_times()})
 
+@api.route('/api/game', methods=['POST'])
+def create_game():
+    try:
+        p_name, backends = parse_game_request(request.json or {})
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+
+    engine = create_table([p_name], backends=backends)
     return jsonify(engine.to_dict(for_player_id=0))
 
-@app.route('/api/game/<game_id>/next', methods=['POST'])
+@api.route('/api/tables', methods=['POST'])
+def create_tables():
+    """Bulk-creates bot-only tables, e.g. {"count": 200, "seats": 6, "stakes": "mid", "aiBackend": "mcts"}."""
+    try:
+        settings = parse_tables_request(request.json or {})
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+
+    count = settings.pop("count")
+    ids = [create_table([], **settings).id for _ in range(count)]
+    return jsonify({"gameIds": ids})
+
+@api.route('/api/game/<game_id>/next', methods=['POST'])
 def next_hand(game_id):
     game = games.get(game_id)
     if not game:
         return jsonify({"error": "Not found"}), 404
 
     game.start_new_hand()
+    broadcast_update(game)
 
-    if game.active_player_id != 0:
-        socketio.start_background_task(run_ai_cycle, game.id)
+    if bot_to_act(game):
+        spawn(run_ai_cycle, game.id)
 
     return jsonify(game.to_dict(for_player_id=0))
 
-@socketio.on('join')
+@api.route('/api/tournament', methods=['POST'])
+def create_tournament():
+    try:
+        tournament_id, tournament = new_tournament(request.json or {})
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+
+    spawn(run_tournament, tournament_id)
+    return jsonify({"id": tournament_id, **tournament.standings()})
+
+@api.route('/api/tournament/<tournament_id>', methods=['GET'])
+def get_tournament(tournament_id):
+    tournament = tournaments.get(tournament_id)
+    if not tournament:
+        return jsonify({"error": "Not found"}), 404
+    return jsonify({"id": tournament_id, **tournament.standings()})
+
+def on_join_tournament(data):
+    tournament_id = data.get('tournamentId')
+    tournament = tournaments.get(tournament_id)
+    if not tournament:
+        emit('error', {'message': 'Tournament not found'})
+        return
+    join_room(f"tournament:{tournament_id}")
+    emit('standings', tournament.standings())
+
 def on_join(data):
-    room = data.get('gameId')
-    join_room(room)
-    if room in games:
-        emit('update', games[room].to_dict(for_player_id=0))
+    game_id = data.get('gameId')
+    game = games.get(game_id)
+    seat = human_seat(game, data)
+    if seat is None:
+        emit('error', {'message': 'No such game or seat'})
+        return
+    join_room(seat_room(game_id, seat))
+    game_clients.setdefault(game_id, {})[request.sid] = seat
+    emit('update', game.to_dict(for_player_id=seat))
+    clock = shot_clock.state(game)
+    if clock:
+        emit('clock', clock)
+    schedule_equity(game)
+
+def on_disconnect():
+    equity_keys.pop(request.sid, None)
+    for clients in game_clients.values():
+        clients.pop(request.sid, None)
+    ticket_id = lobby_tickets.pop(request.sid, None)
+    if ticket_id:
+        lobby.cancel(ticket_id)
 
-@socketio.on('action')
 def on_action(data):
     game_id = data.get('gameId')
     game = games.get(game_id)
-    if not game:
+    seat = human_seat(game, data)
+    if seat is None:
         return
 
     try:
-        game.process_player_action(0, data['action'], data.get('amount', 0))
-        emit('update', game.to_dict(for_player_id=0), to=game_id)
+        game.process_player_action(seat, data['action'], data.get('amount', 0))
+        broadcast_update(game)
 
-        if game.active_player_id != 0:
-            socketio.start_background_task(run_ai_cycle, game_id)
+        if bot_to_act(game):
+            spawn(run_ai_cycle, game_id)
 
     except ValueError as e:
         emit('error', {'message': str(e)})
 
+def seat_matches() -> None:
+    """Turns every lobby match into a table and tells each seated player where to go."""
+    for match in lobby.match():
+        engine = create_table([t.name for t in match.tickets], match.seats, match.buy_in, match.blinds,
+                              LOBBY_BOT_BACKEND)
+        for seat, ticket in enumerate(match.tickets):
+            if ticket.sid is None:
+                continue
+            lobby_tickets.pop(ticket.sid, None)
+            current_socketio().server.enter_room(ticket.sid, seat_room(engine.id, seat), namespace='/')
+            game_clients.setdefault(engine.id, {})[ticket.sid] = seat
+            current_socketio().emit('seated', {"ticketId": ticket.id, "gameId": engine.id, "playerId": seat}, to=ticket.sid)
+        broadcast_update(engine)
+
+def run_lobby() -> None:
+    """Seats bot-filled tables for stale queues and pushes lobby state while anyone is waiting."""
+    global lobby_loop_running
+    last_state = None
+    while True:
+        seat_matches()
+        state = lobby.state()
+        if state != last_state:
+            current_socketio().emit('lobby', state, to='lobby')
+            last_state = state
+        if not len(lobby):
+            break
+        current_socketio().sleep(LOBBY_INTERVAL)
+    lobby_loop_running = False
+
+def on_lobby_subscribe(data=None):
+    join_room('lobby')
+    emit('lobby', lobby.state())
+
+def on_lobby_join(data):
+    global lobby_loop_running
+    if request.sid in lobby_tickets:
+        emit('error', {'message': 'Already queued'})
+        return
+    try:
+        seats = int(data.get('seats', 4))
+        ticket = lobby.enqueue(data.get('playerName', 'Human'), data.get('stakes', 'low'), seats, sid=request.sid)
+    except (TypeError, ValueError) as e:
+        emit('error', {'message': str(e)})
+        return
+    lobby_tickets[request.sid] = ticket.id
+    emit('queued', {"ticketId": ticket.id, "stakes": ticket.stakes, "seats": ticket.seats})
+
+    seat_matches()
+    if not lobby_loop_running:
+        lobby_loop_running = True
+        spawn(run_lobby)
+
+def on_lobby_leave(data=None):
+    ticket_id = lobby_tickets.pop(request.sid, None)
+    emit('left', {"ticketId": ticket_id, "cancelled": bool(ticket_id and lobby.cancel(ticket_id))})
+
+SOCKET_HANDLERS = {
+    'join_tournament': on_join_tournament,
+    'join': on_join,
+    'disconnect': on_disconnect,
+    'action': on_action,
+    'lobby_subscribe': on_lobby_subscribe,
+    'lobby_join': on_lobby_join,
+    'lobby_leave': on_lobby_leave,
+}
+
+IMPORT_MS = round((time.perf_counter() - _import_started) * 1000, 1)
+startup_ms: Optional[float] = None
+
+def create_app(config: Optional[dict] = None) -> Flask:
+    """Builds a Flask app with its own SocketIO server (in app.extensions['socketio'])."""
+    global startup_ms
+    started = time.perf_counter()
+    flask_app = Flask(__name__)
+    flask_app.config['SECRET_KEY'] = 'poker_secret'
+    flask_app.config.update(config or {})
+    CORS(flask_app)
+    flask_app.register_blueprint(api)
+    sio = SocketIO(flask_app, cors_allowed_origins="*", async_mode='eventlet')
+    for event, handler in SOCKET_HANDLERS.items():
+        sio.on_event(event, handler)
+    startup_ms = round(IMPORT_MS + (time.perf_counter() - started) * 1000, 1)
+    logger.info(f"Server ready in {startup_ms} ms (imports {IMPORT_MS} ms)")
+    return flask_app
+
+def __getattr__(name: str):
+    # `from app import app` keeps working, but only callers that want the app build it
+    if name == 'app':
+        globals()['app'] = create_app()
+        return globals()['app']
+    if name == 'socketio':
+        # The default app's server
+        flask_app = globals().get('app') or __getattr__('app')
+        return flask_app.extensions['socketio']
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
 if __name__ == '__main__':
-    socketio.run(app, host='0.0.0.0', port=5001, debug=True)
+    flask_app = create_app()
+    flask_app.extensions['socketio'].run(flask_app, host='0.0.0.0', port=5001, debug=True)
@@ -0,0 +1,419 @@
+"""
+The same REST routes and Socket.IO events as app.py, served natively on asyncio.
+
+No monkey patching: handlers are coroutines, Gemini calls are awaited,
+local searches (MCTS, blueprint) run in worker threads and every pause is an
+asyncio sleep. Run it under any ASGI server, e.g.
+
+    uvicorn asgi_app:app --host 0.0.0.0 --port 5001
+    uvicorn --factory asgi_app:create_app --host 0.0.0.0 --port 5001
+"""
+import time
+_import_started = time.perf_counter()
+
+import asyncio
+import json
+import logging
+import os
+import re
+from typing import Awaitable, Callable, Optional
+
+import socketio
+from dotenv import load_dotenv
+
+from game.engine import GameEngine
+from game.equity import equity_stream
+from game.lobby import Lobby
+from game.shot_clock import ShotClock, turn_key
+from game.timer_wheel import TimerWheel
+from ai import registry
+from services import (
+    LOBBY_BOT_BACKEND, bot_to_act, equity_request, games, human_seat, new_table,
+    new_tournament, opponent_models, parse_game_request, parse_tables_request, seat_room, tournaments,
+)
+
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s [%(levelname)s] %(name)s: %(message)s',
+    datefmt='%H:%M:%S'
+)
+logger = logging.getLogger('poker')
+load_dotenv()
+
+sio = socketio.AsyncServer(async_mode='asgi', cors_allowed_origins='*')
+
+AI_MOVE_DELAY = float(os.getenv("AI_MOVE_DELAY", "1.0"))
+EQUITY_BATCH = int(os.getenv("EQUITY_BATCH", "100"))
+EQUITY_INTERVAL = float(os.getenv("EQUITY_INTERVAL", "0.1"))
+STANDINGS_INTERVAL = float(os.getenv("STANDINGS_INTERVAL", "1.0"))
+LOBBY_FILL_AFTER = float(os.getenv("LOBBY_FILL_AFTER", "5.0"))
+LOBBY_INTERVAL = float(os.getenv("LOBBY_INTERVAL", "0.5"))
+CLOCK_TICK = float(os.getenv("CLOCK_TICK", "0.1"))
+
+game_clients: dict[str, dict[str, int]] = {}
+equity_keys: dict[str, tuple] = {}
+lobby = Lobby(fill_after=LOBBY_FILL_AFTER)
+lobby_tickets: dict[str, str] = {}
+lobby_task: Optional[asyncio.Task] = None
+# Keeps fire-and-forget tasks referenced until they finish
+background_tasks: set[asyncio.Task] = set()
+clock_wheel = TimerWheel(tick=CLOCK_TICK)
+clock_task: Optional[asyncio.Task] = None
+
+def spawn(coro: Awaitable) -> asyncio.Task:
+    task = asyncio.ensure_future(coro)
+    background_tasks.add(task)
+    task.add_done_callback(background_tasks.discard)
+    return task
+
+# --- table updates ---
+
+async def stream_equity(sid: str, key: tuple, hole: list, board: list, opponents: int) -> None:
+    for estimate in equity_stream(hole, board, opponents, batch=EQUITY_BATCH):
+        if equity_keys.get(sid) != key:
+            return  # the hand moved on; a newer stream (if any) owns this client
+        await sio.emit('equity', {
+            "handNo": key[0],
+            "hand": [c.to_str() for c in hole],
+            "communityCards": [c.to_str() for c in board],
+            "opponents": opponents,
+            "equity": round(estimate.equity, 4),
+            "samples": estimate.samples,
+            "stdError": round(estimate.std_error, 4),
+            "done": estimate.done,
+        }, to=sid)
+        await asyncio.sleep(EQUITY_INTERVAL)
+
+def schedule_equity(game: GameEngine) -> None:
+    """Starts an equity stream for each client of `game` whose hole cards, board or opponent count changed."""
+    requests = {}
+    for sid, seat in game_clients.get(game.id, {}).items():
+        if seat not in requests:
+            requests[seat] = equity_request(game, seat)
+        key, hole, board, opponents = requests[seat]
+        if equity_keys.get(sid, ()) != key:
+            equity_keys[sid] = key
+            if key:
+                spawn(stream_equity(sid, key, hole, board, opponents))
+
+async def broadcast_update(game: GameEngine) -> None:
+    """Sends every human seat its own view of the table."""
+    for player in game.players:
+        if player.is_human:
+            await sio.emit('update', game.to_dict(for_player_id=player.id), to=seat_room(game.id, player.id))
+    schedule_equity(game)
+    sync_clock(game)
+
+async def push_clock(game: GameEngine, event: dict) -> None:
+    """Pushes a countdown to the table; after a timeout, also the new state and the next bot's turn."""
+    for player in game.players:
+        if player.is_human:
+            await sio.emit('clock', event, to=seat_room(game.id, player.id))
+    if event["phase"] == "expired":
+        logger.info(f"[{game.id[:8]}] Seat {event['playerId']} timed out: {event['action']}")
+        await broadcast_update(game)
+        # A bot that timed out is still inside its own AI cycle, which carries on when its answer arrives
+        if bot_to_act(game) and game.players[event["playerId"]].is_human:
+            spawn(run_ai_cycle(game.id))
+
+shot_clock = ShotClock(clock_wheel, lambda game, event: spawn(push_clock(game, event)))
+
+async def run_clock() -> None:
+    while len(clock_wheel):
+        await asyncio.sleep(CLOCK_TICK)
+        clock_wheel.advance()
+
+def sync_clock(game: GameEngine) -> None:
+    global clock_task
+    shot_clock.sync(game)
+    # One task advances every table's clock; it is not a background task, since it lives as long as any clock
+    if len(clock_wheel) and (clock_task is None or clock_task.done()):
+        clock_task = asyncio.ensure_future(run_clock())
+
+async def decide(game: GameEngine, current_id: int) -> dict:
+    backend = registry.get(game.players[current_id].ai_backend)
+    state = game.to_dict(for_player_id=current_id)
+    snapshot = game.snapshot()
+    if backend.paced:
+        await asyncio.sleep(AI_MOVE_DELAY)
+    return await backend.decide_async(state, snapshot, current_id, opponent_models.get(game.id))
+
+async def run_ai_cycle(game_id: str) -> None:
+    game = games.get(game_id)
+    if not game:
+        return
+
+    # Coroutines only interleave at awaits, so reading the state and applying a move need no lock
+    while game.stage != "HAND_OVER" and bot_to_act(game):
+        current_id = game.active_player_id
+        current_player = game.players[current_id]
+        turn = turn_key(game)
+        move = await decide(game, current_id)
+        if turn_key(game) != turn:
+            continue  # the table moved on (e.g. the shot clock) while the bot was thinking
+        logger.info(f"[{game_id[:8]}] AI {current_player.name}: {move['action']} {move.get('amount', '')}")
+
+        try:
+            game.process_player_action(current_id, move['action'], move.get('amount', 0))
+        except Exception as e:
+            logger.error(f"[{game_id[:8]}] Error processing AI {current_id}: {e}")
+            game.process_player_action(current_id, "fold")
+        await broadcast_update(game)
+
+def create_table(humans: list[str], seats: int = 4, chips: int = 1000, blinds: tuple[int, int] = (10, 20),
+                 backend: str = "gemini", backends: Optional[dict[int, str]] = None) -> GameEngine:
+    """new_table(), then starts the bots if one of them acts first."""
+    engine = new_table(humans, seats, chips, blinds, backend, backends)
+    sync_clock(engine)
+    if bot_to_act(engine):
+        spawn(run_ai_cycle(engine.id))
+    return engine
+
+async def run_tournament(tournament_id: str) -> None:
+    from ai.batch_policy import fallback_policy  # numpy; only tournament servers pay for it
+    tournament = tournaments[tournament_id]
+    room = f"tournament:{tournament_id}"
+    last_push = 0.0
+    while not tournament.finished:
+        busts = tournament.step(fallback_policy)
+        now = time.monotonic()
+        if busts and now - last_push >= STANDINGS_INTERVAL:
+            await sio.emit('standings', tournament.standings(), to=room)
+            last_push = now
+        await asyncio.sleep(0)  # let requests and other games run between steps
+
+    winner = tournament.winner()
+    logger.info(f"[{tournament_id[:8]}] Tournament won by {winner.name} after {tournament.hands_played} hands")
+    await sio.emit('standings', tournament.standings(), to=room)
+
+# --- REST routes; each handler takes (body, *path groups) and returns (status, payload) ---
+
+Handler = Callable[..., Awaitable[tuple[int, dict]]]
+
+async def health(data: dict) -> tuple[int, dict]:
+    """Start-up timings, and the load time of every AI backend used so far."""
+    return 200, {"importMs": IMPORT_MS, "startupMs": startup_ms, "aiBackends": registry.load_times()}
+
+async def create_game(data: dict) -> tuple[int, dict]:
+    try:
+        p_name, backends = parse_game_request(data)
+    except ValueError as e:
+        return 400, {"error": str(e)}
+    engine = create_table([p_name], backends=backends)
+    return 200, engine.to_dict(for_player_id=0)
+
+async def create_tables(data: dict) -> tuple[int, dict]:
+    try:
+        settings = parse_tables_request(data)
+    except ValueError as e:
+        return 400, {"error": str(e)}
+    count = settings.pop("count")
+    return 200, {"gameIds": [create_table([], **settings).id for _ in range(count)]}
+
+async def next_hand(data: dict, game_id: str) -> tuple[int, dict]:
+    game = games.get(game_id)
+    if not game:
+        return 404, {"error": "Not found"}
+    game.start_new_hand()
+    await broadcast_update(game)
+    if bot_to_act(game):
+        spawn(run_ai_cycle(game.id))
+    return 200, game.to_dict(for_player_id=0)
+
+async def create_tournament(data: dict) -> tuple[int, dict]:
+    try:
+        tournament_id, tournament = new_tournament(data)
+    except ValueError as e:
+        return 400, {"error": str(e)}
+    spawn(run_tournament(tournament_id))
+    return 200, {"id": tournament_id, **tournament.standings()}
+
+async def get_tournament(data: dict, tournament_id: str) -> tuple[int, dict]:
+    tournament = tournaments.get(tournament_id)
+    if not tournament:
+        return 404, {"error": "Not found"}
+    return 200, {"id": tournament_id, **tournament.standings()}
+
+ROUTES: list[tuple[str, re.Pattern, Handler]] = [
+    ("GET", re.compile(r"/api/health"), health),
+    ("POST", re.compile(r"/api/game"), create_game),
+    ("POST", re.compile(r"/api/tables"), create_tables),
+    ("POST", re.compile(r"/api/game/([^/]+)/next"), next_hand),
+    ("POST", re.compile(r"/api/tournament"), create_tournament),
+    ("GET", re.compile(r"/api/tournament/([^/]+)"), get_tournament),
+]
+
+CORS_HEADERS = [
+    (b"access-control-allow-origin", b"*"),
+    (b"access-control-allow-headers", b"Content-Type"),
+    (b"access-control-allow-methods", b"GET, POST, OPTIONS"),
+]
+
+async def _respond(send, status: int, payload: Optional[dict]) -> None:
+    body = json.dumps(payload).encode() if payload is not None else b""
+    headers = CORS_HEADERS + [(b"content-type", b"application/json"), (b"content-length", str(len(body)).encode())]
+    await send({"type": "http.response.start", "status": status, "headers": headers})
+    await send({"type": "http.response.body", "body": body})
+
+async def rest_app(scope, receive, send) -> None:
+    if scope["type"] != "http":
+        return
+    if scope["method"] == "OPTIONS":
+        await _respond(send, 204, None)
+        return
+
+    matched_path = False
+    for method, pattern, handler in ROUTES:
+        match = pattern.fullmatch(scope["path"])
+        if not match:
+            continue
+        matched_path = True
+        if method != scope["method"]:
+            continue
+
+        body = b""
+        while True:
+            message = await receive()
+            body += message.get("body", b"")
+            if not message.get("more_body"):
+                break
+        try:
+            data = json.loads(body) if body else {}
+        except ValueError:
+            await _respond(send, 400, {"error": "Invalid JSON"})
+            return
+        status, payload = await handler(data if isinstance(data, dict) else {}, *match.groups())
+        await _respond(send, status, payload)
+        return
+
+    await _respond(send, 405 if matched_path else 404, {"error": "Method not allowed" if matched_path else "Not found"})
+
+# --- socket events ---
+
+@sio.on('join_tournament')
+async def on_join_tournament(sid, data):
+    tournament_id = data.get('tournamentId')
+    tournament = tournaments.get(tournament_id)
+    if not tournament:
+        await sio.emit('error', {'message': 'Tournament not found'}, to=sid)
+        return
+    await sio.enter_room(sid, f"tournament:{tournament_id}")
+    await sio.emit('standings', tournament.standings(), to=sid)
+
+@sio.on('join')
+async def on_join(sid, data):
+    game_id = data.get('gameId')
+    game = games.get(game_id)
+    seat = human_seat(game, data)
+    if seat is None:
+        await sio.emit('error', {'message': 'No such game or seat'}, to=sid)
+        return
+    await sio.enter_room(sid, seat_room(game_id, seat))
+    game_clients.setdefault(game_id, {})[sid] = seat
+    await sio.emit('update', game.to_dict(for_player_id=seat), to=sid)
+    clock = shot_clock.state(game)
+    if clock:
+        await sio.emit('clock', clock, to=sid)
+    schedule_equity(game)
+
+@sio.on('disconnect')
+async def on_disconnect(sid, *args):
+    equity_keys.pop(sid, None)
+    for clients in game_clients.values():
+        clients.pop(sid, None)
+    ticket_id = lobby_tickets.pop(sid, None)
+    if ticket_id:
+        lobby.cancel(ticket_id)
+
+@sio.on('action')
+async def on_action(sid, data):
+    game_id = data.get('gameId')
+    game = games.get(game_id)
+    seat = human_seat(game, data)
+    if seat is None:
+        return
+
+    try:
+        game.process_player_action(seat, data['action'], data.get('amount', 0))
+    except ValueError as e:
+        await sio.emit('error', {'message': str(e)}, to=sid)
+        return
+    await broadcast_update(game)
+    if bot_to_act(game):
+        spawn(run_ai_cycle(game_id))
+
+async def seat_matches() -> None:
+    """Turns every lobby match into a table and tells each seated player where to go."""
+    for match in lobby.match():
+        engine = create_table([t.name for t in match.tickets], match.seats, match.buy_in, match.blinds,
+                              LOBBY_BOT_BACKEND)
+        for seat, ticket in enumerate(match.tickets):
+            if ticket.sid is None:
+                continue
+            lobby_tickets.pop(ticket.sid, None)
+            await sio.enter_room(ticket.sid, seat_room(engine.id, seat))
+            game_clients.setdefault(engine.id, {})[ticket.sid] = seat
+            await sio.emit('seated', {"ticketId": ticket.id, "gameId": engine.id, "playerId": seat}, to=ticket.sid)
+        await broadcast_update(engine)
+
+async def run_lobby() -> None:
+    """Seats bot-filled tables for stale queues and pushes lobby state while anyone is waiting."""
+    last_state = None
+    while True:
+        await seat_matches()
+        state = lobby.state()
+        if state != last_state:
+            await sio.emit('lobby', state, to='lobby')
+            last_state = state
+        if not len(lobby):
+            break
+        await asyncio.sleep(LOBBY_INTERVAL)
+
+@sio.on('lobby_subscribe')
+async def on_lobby_subscribe(sid, data=None):
+    await sio.enter_room(sid, 'lobby')
+    await sio.emit('lobby', lobby.state(), to=sid)
+
+@sio.on('lobby_join')
+async def on_lobby_join(sid, data):
+    global lobby_task
+    if sid in lobby_tickets:
+        await sio.emit('error', {'message': 'Already queued'}, to=sid)
+        return
+    try:
+        seats = int(data.get('seats', 4))
+        ticket = lobby.enqueue(data.get('playerName', 'Human'), data.get('stakes', 'low'), seats, sid=sid)
+    except (TypeError, ValueError) as e:
+        await sio.emit('error', {'message': str(e)}, to=sid)
+        return
+    lobby_tickets[sid] = ticket.id
+    await sio.emit('queued', {"ticketId": ticket.id, "stakes": ticket.stakes, "seats": ticket.seats}, to=sid)
+
+    await seat_matches()
+    if lobby_task is None or lobby_task.done():
+        lobby_task = spawn(run_lobby())
+
+@sio.on('lobby_leave')
+async def on_lobby_leave(sid, data=None):
+    ticket_id = lobby_tickets.pop(sid, None)
+    cancelled = bool(ticket_id and lobby.cancel(ticket_id))
+    await sio.emit('left', {"ticketId": ticket_id, "cancelled": cancelled}, to=sid)
+
+IMPORT_MS = round((time.perf_counter() - _import_started) * 1000, 1)
+startup_ms: Optional[float] = None
+
+def create_app() -> socketio.ASGIApp:
+    """The ASGI app: Socket.IO traffic goes to `sio`, everything else to the REST routes."""
+    global startup_ms
+    started = time.perf_counter()
+    asgi = socketio.ASGIApp(sio, other_asgi_app=rest_app)
+    startup_ms = round(IMPORT_MS + (time.perf_counter() - started) * 1000, 1)
+    logger.info(f"Server ready in {startup_ms} ms (imports {IMPORT_MS} ms)")
+    return asgi
+
+def __getattr__(name: str):
+    # `uvicorn asgi_app:app` and `from asgi_app import app` build the app on first access
+    if name == 'app':
+        globals()['app'] = create_app()
+        return globals()['app']
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
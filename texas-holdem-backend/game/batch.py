@@ -0,0 +1,97 @@
+"""
+Struct-of-arrays view over many GameEngine tables for batched bot policies.
+
+Chips, bets and seat flags live in (tables, seats) NumPy arrays so a policy
+can decide for every table that is waiting on a bot in one vectorised call.
+The engines stay authoritative: decisions are applied through
+process_player_action and only the rows that changed are copied back.
+"""
+from typing import Iterable, List, Optional
+
+import numpy as np
+
+from .engine import GameEngine
+from .hand_history import ActionCode
+
+NO_ACTION = -1
+
+ACTION_NAMES = {
+    ActionCode.FOLD: "fold",
+    ActionCode.CHECK: "check",
+    ActionCode.CALL: "call",
+    ActionCode.RAISE: "raise",
+}
+
+def deal_orders(tables: int, cards: int, rng: np.random.Generator) -> np.ndarray:
+    """
+    Pre-generates the first `cards` cards of an independent shuffle for each of
+    `tables` tables as Card.to_int() codes; feed rows to Deck.from_codes.
+    """
+    decks = np.tile(np.arange(52, dtype=np.int8), (tables, 1))
+    return rng.permuted(decks, axis=1)[:, :cards]
+
+class BatchTables:
+    def __init__(self, engines: List[GameEngine], seats: Optional[int] = None):
+        """`seats` is the row width; it defaults to the largest table and must cover later reseating."""
+        self.engines = list(engines)
+        n = len(self.engines)
+        seats = seats or max((len(e.players) for e in self.engines), default=0)
+
+        self.chips = np.zeros((n, seats), dtype=np.int64)
+        self.current_bet = np.zeros((n, seats), dtype=np.int64)
+        self.folded = np.ones((n, seats), dtype=bool)
+        self.all_in = np.zeros((n, seats), dtype=bool)
+        self.pot = np.zeros(n, dtype=np.int64)
+        self.bet_to_call = np.zeros(n, dtype=np.int64)
+        self.big_blind = np.zeros(n, dtype=np.int64)
+        self.active = np.full(n, -1, dtype=np.int64)
+        self.refresh(range(n))
+
+    def __len__(self) -> int:
+        return len(self.engines)
+
+    def refresh(self, rows: Iterable[int]) -> None:
+        """Copies the given tables' state out of their engines."""
+        rows = list(rows)
+        if not rows:
+            return
+        width = self.chips.shape[1]
+        engines = [self.engines[row] for row in rows]
+        # One fancy-indexed write per array; per-element NumPy writes cost more than the engine step
+        chips, bets, folded, all_in = [], [], [], []
+        for engine in engines:
+            pad = width - len(engine.players)
+            chips.append([p.chips for p in engine.players] + [0] * pad)
+            bets.append([p.current_bet for p in engine.players] + [0] * pad)
+            folded.append([p.is_folded for p in engine.players] + [True] * pad)
+            all_in.append([p.is_all_in for p in engine.players] + [False] * pad)
+        self.chips[rows] = chips
+        self.current_bet[rows] = bets
+        self.folded[rows] = folded
+        self.all_in[rows] = all_in
+        self.pot[rows] = [e.pot for e in engines]
+        self.bet_to_call[rows] = [e.bet_to_call for e in engines]
+        self.big_blind[rows] = [e.big_blind for e in engines]
+        self.active[rows] = [e.active_player_id if e.stage != "HAND_OVER" else -1 for e in engines]
+
+    def waiting(self) -> np.ndarray:
+        """Mask of tables with a seat to act."""
+        return self.active >= 0
+
+    def acting_column(self, values: np.ndarray) -> np.ndarray:
+        """Per-table value of the seat to act (0 for tables nobody is waiting on)."""
+        seat = np.where(self.waiting(), self.active, 0)
+        return values[np.arange(len(self.engines)), seat]
+
+    def apply(self, actions: np.ndarray, amounts: np.ndarray) -> int:
+        """Applies one decision per waiting table; returns how many were applied."""
+        rows = np.flatnonzero(actions != NO_ACTION)
+        for row in rows.tolist():
+            engine = self.engines[row]
+            name = ACTION_NAMES[ActionCode(int(actions[row]))]
+            try:
+                engine.process_player_action(engine.active_player_id, name, int(amounts[row]))
+            except ValueError:
+                engine.process_player_action(engine.active_player_id, "fold")
+        self.refresh(rows.tolist())
+        return len(rows)
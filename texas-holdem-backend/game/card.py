@@ -58,3 +58,25 @@ class Card:
             rank_char = 'A'
 
         return f"{rank_char}{self.suit.name[0]}"
+
+    def to_int(self) -> int:
+        """Returns a compact code in 0..51, suit-major."""
+        return (self.suit - 1) * 13 + (self.rank - 2)
+
+    @classmethod
+    def from_int(cls, code: int) -> "Card":
+        return cls(Rank(code % 13 + 2), Suit(code // 13 + 1))
+
+    @classmethod
+    def from_str(cls, text: str) -> "Card":
+        """Parses the to_str() format ('AS', 'TH'); '10H' is accepted too."""
+        rank_text, suit_char = text[:-1].upper(), text[-1].upper()
+        rank_value = {"T": 10, "J": 11, "Q": 12, "K": 13, "A": 14}.get(rank_text)
+        if rank_value is None:
+            if not rank_text.isdigit():
+                raise ValueError(f"Invalid card: {text}")
+            rank_value = int(rank_text)
+        suit = next((s for s in Suit if s.name[0] == suit_char), None)
+        if suit is None or not 2 <= rank_value <= 14:
+            raise ValueError(f"Invalid card: {text}")
+        return cls(Rank(rank_value), suit)
@@ -1,24 +1,86 @@
 import random
-from typing import List, Tuple
+from typing import List, Optional, Sequence
 from .card import Card, Rank, Suit
 
+# Shared, never-mutated card objects in to_int() order
+FULL_DECK = tuple(Card(rank, suit) for suit in Suit for rank in Rank)
+
 class Deck:
-    def __init__(self) -> None:
-        self._cards: List[Card] = [
-            Card(rank, suit) 
-            for suit in Suit 
-            for rank in Rank
-        ]
+    """
+    A deck with a lazy Fisher-Yates shuffle: shuffling only resets a cursor,
+    and each dealt card costs one swap. Pass `rng` (or `seed`) for
+    reproducible deals. Every shuffle takes a single seed from `rng` and
+    draws its swaps from a stream of its own, so peeking at the remaining
+    cards (which settles the whole order early) never shifts later shuffles.
+    """
+
+    def __init__(self, rng: Optional[random.Random] = None, seed: Optional[int] = None) -> None:
+        self._rng = rng or (random.Random(seed) if seed is not None else random)
+        self._order: List[Card] = list(FULL_DECK)
+        self._cursor = 0
+        self._fixed = 0
         self.shuffle()
 
+    @classmethod
+    def from_cards(cls, cards: Sequence[Card], rng: Optional[random.Random] = None) -> "Deck":
+        """A deck that deals `cards` in the given order, without shuffling."""
+        deck = cls.__new__(cls)
+        deck._rng = rng or random
+        deck._stream = None  # nothing to shuffle until the next reset
+        deck._order = list(cards)
+        deck._cursor = 0
+        deck._fixed = len(deck._order)
+        return deck
+
+    @classmethod
+    def from_codes(cls, codes: Sequence[int]) -> "Deck":
+        """Like from_cards, for Card.to_int() codes (e.g. a pre-generated order)."""
+        return cls.from_cards([FULL_DECK[int(code)] for code in codes])
+
     def shuffle(self) -> None:
-        random.shuffle(self._cards)
+        """Reshuffles the undealt cards; the work happens lazily as cards are dealt."""
+        self._stream = random.Random(self._rng.getrandbits(64))
+        self._fixed = self._cursor
+
+    def reset(self) -> None:
+        """Returns all 52 cards to the deck and reshuffles it."""
+        # Always from the same starting order, however far the last shuffle got
+        self._order = list(FULL_DECK)
+        self._cursor = 0
+        self.shuffle()
+
+    def _fix(self, end: int) -> None:
+        # Partial Fisher-Yates: settle positions [_fixed, end) with one swap each
+        if end <= self._fixed:
+            return
+        order = self._order
+        n = len(order)
+        rand = self._stream.random
+        for i in range(self._fixed, end):
+            j = i + int(rand() * (n - i))
+            order[i], order[j] = order[j], order[i]
+        self._fixed = max(self._fixed, end)
+
+    def remaining(self) -> List[Card]:
+        """The undealt cards in the order they will be dealt."""
+        self._fix(len(self._order))
+        return self._order[self._cursor:]
+
+    @property
+    def _cards(self) -> List[Card]:
+        return self.remaining()
+
+    def __len__(self) -> int:
+        return len(self._order) - self._cursor
 
     def deal(self, amount: int = 1) -> List[Card]:
         """Deals n cards from top of deck."""
-        if len(self._cards) < amount:
+        end = self._cursor + amount
+        if end > len(self._order):
             raise ValueError("Not enough cards in deck")
-        
-        dealt = self._cards[:amount]
-        del self._cards[:amount]
+
+        if end > self._fixed:
+            self._fix(end)
+        dealt = self._order[self._cursor:end]
+        self._cursor = end
         return dealt
@@ -1,198 +1,497 @@
 import uuid
+import random
+import logging
+import operator
 import threading
-from typing import List, Dict, Any
+from bisect import bisect_left, bisect_right
+from typing import List, Dict, Any, Optional
 from .card import Card
 from .deck import Deck
 from .player import Player
-from .hand_evaluator import evaluate_hand
+from .hand_evaluator import BoardEvaluator
+from .state import SeatState, TableState
+
+logger = logging.getLogger('poker.engine')
+
+class GameObserver:
+    """
+    Receives engine events as they happen. Subclasses override what they need.
+    Actions are reported as 'blind', 'fold', 'check', 'call', 'raise' or 'all_in'
+    together with the chips the player added.
+    """
+
+    def on_hand_start(self, engine: "GameEngine") -> None:
+        pass
+
+    def on_action(self, engine: "GameEngine", player: Player, action: str, added: int) -> None:
+        pass
+
+    def on_street(self, engine: "GameEngine") -> None:
+        pass
+
+    def on_hand_end(self, engine: "GameEngine") -> None:
+        pass
+
+def _tracked(name: str) -> property:
+    """A public field backed by `_<name>`; assigning it from outside marks the round bookkeeping stale."""
+    slot = "_" + name
+
+    def assign(engine: "GameEngine", value: Any) -> None:
+        setattr(engine, slot, value)
+        engine._dirty = True
+
+    return property(operator.attrgetter(slot), assign)
 
 class GameEngine:
-    def __init__(self, players: List[Player]):
+    """
+    Betting rounds are tracked incrementally, so each action costs O(1) no
+    matter how many seats the table has:
+
+    - live and can-act counts (not folded; not folded and not all-in);
+    - how many can-act seats have acted since the last raise. Raising starts
+      a new epoch instead of clearing per-seat flags;
+    - `_next` links from every seat to the next seat that can act. Seats that
+      fold or go all-in are spliced out, and their own link still leads
+      forward, so the first actor after any seat is a short walk;
+    - side pots as layers of the chips committed this hand, cut at each
+      all-in total.
+
+    When a hand ends, `payouts` holds what each seat won. Chips a seat bet
+    that nobody matched go back to it and are listed in `refunds` instead.
+
+    Tests and tools sometimes edit seats and fields directly. Assigning
+    `stage`, `pot`, `bet_to_call` or `active_player_id` rebuilds the
+    bookkeeping before the next action; after editing only seats, call
+    resync().
+    """
+
+    stage = _tracked("stage")
+    pot = _tracked("pot")
+    bet_to_call = _tracked("bet_to_call")
+    active_player_id = _tracked("active_player_id")
+
+    def __init__(self, players: List[Player], small_blind: int = 10, big_blind: int = 20,
+                 observers: Optional[List[GameObserver]] = None, seed: Optional[int] = None):
         self.id = str(uuid.uuid4())
         self.lock = threading.RLock()
         self.players = players
-        self.deck = Deck()
+        # Per-game RNG: the same seed replays the same deals
+        self.rng = random.Random(seed)
+        self.deck = Deck(self.rng)
         self.community_cards: List[Card] = []
-        self.pot = 0
+        self.board = BoardEvaluator()
+        self._pot = 0
+        self.small_blind = small_blind
+        self.big_blind = big_blind
+        self.observers: List[GameObserver] = list(observers or [])
 
+        self.hand_no = 0
         self.dealer_pos = 0
-        self.active_player_id = 0
-        self.bet_to_call = 0
-        self.stage = "PRE_FLOP"
+        self._active_player_id = 0
+        self._bet_to_call = 0
+        self._stage = "PRE_FLOP"
         self.winners: List[int] = []
+        self.payouts: Dict[int, int] = {}
+        self.refunds: Dict[int, int] = {}
 
         self.start_new_hand()
 
-    def start_new_hand(self) -> None:
-        self.deck = Deck()
+    @classmethod
+    def from_snapshot(cls, state: TableState) -> "GameEngine":
+        """Builds an engine positioned at `state` without dealing a new hand."""
+        engine = cls.__new__(cls)
+        engine.id = str(uuid.uuid4())
+        engine.lock = threading.RLock()
+        engine.rng = random.Random()
+        engine.board = BoardEvaluator()
+        engine.players = []
+        engine.observers = []
+        engine.restore(state)
+        return engine
+
+    def snapshot(self) -> TableState:
+        """Captures the full hand state as an immutable TableState."""
+        return TableState(
+            seats=tuple(
+                SeatState(p.id, p.name, p.chips, p.is_human, tuple(p.hand), p.current_bet,
+                          p.is_folded, p.is_all_in, p.last_action, p.committed)
+                for p in self.players
+            ),
+            deck=tuple(self.deck.remaining()),
+            community_cards=tuple(self.community_cards),
+            pot=self.pot,
+            small_blind=self.small_blind,
+            big_blind=self.big_blind,
+            hand_no=self.hand_no,
+            dealer_pos=self.dealer_pos,
+            active_player_id=self.active_player_id,
+            bet_to_call=self.bet_to_call,
+            stage=self.stage,
+            winners=tuple(self.winners),
+            payouts=tuple(self.payouts.items()),
+            refunds=tuple(self.refunds.items()),
+        )
+
+    def restore(self, state: TableState) -> None:
+        """Rewinds the engine to `state`, reusing Player objects where seats line up."""
+        if len(self.players) != len(state.seats):
+            self.players = [Player(id=s.id, name=s.name, chips=s.chips) for s in state.seats]
+        for p, s in zip(self.players, state.seats):
+            p.id = s.id
+            p.name = s.name
+            p.chips = s.chips
+            p.is_human = s.is_human
+            p.hand = list(s.hand)
+            p.current_bet = s.current_bet
+            p.is_folded = s.is_folded
+            p.is_all_in = s.is_all_in
+            p.last_action = s.last_action
+            p.committed = s.committed
+
+        self.deck = Deck.from_cards(state.deck, self.rng)
+        self.community_cards = list(state.community_cards)
+        self._pot = state.pot
+        self.small_blind = state.small_blind
+        self.big_blind = state.big_blind
+        self.hand_no = state.hand_no
+        self.dealer_pos = state.dealer_pos
+        self._active_player_id = state.active_player_id
+        self._bet_to_call = state.bet_to_call
+        self._stage = state.stage
+        self.winners = list(state.winners)
+        self.payouts = dict(state.payouts)
+        self.refunds = dict(state.refunds)
+        self.resync()
+
+    def resync(self) -> None:
+        """Rebuilds the round bookkeeping from the seats in O(n); see the class docstring."""
+        players = self.players
+        n = len(players)
+        in_ring = [False] * n
+        acted_in = [-1] * n
+        ring = []
+        levels = set()
+        live = acted = committed = 0
+        for i, p in enumerate(players):
+            committed += p.committed
+            if p.is_folded:
+                continue
+            live += 1
+            if p.is_all_in:
+                levels.add(p.committed)
+                continue
+            in_ring[i] = True
+            ring.append(i)
+            # A seat has acted in this round if it made a move (blinds don't count) and still matches the bet
+            if p.last_action is not None and p.last_action != "Blind" and p.current_bet == self._bet_to_call:
+                acted_in[i] = 0
+                acted += 1
+
+        # Every seat links to the next seat that can act; seats that can act also link back
+        next_seat = [0] * n
+        prev_seat = [0] * n
+        if ring:
+            following = ring[0]
+            for i in range(n - 1, -1, -1):
+                next_seat[i] = following
+                if in_ring[i]:
+                    following = i
+            for seat in ring:
+                prev_seat[next_seat[seat]] = seat
+
+        self._in_ring, self._next, self._prev = in_ring, next_seat, prev_seat
+        self._live, self._can_act = live, len(ring)
+        self._epoch, self._acted_in, self._acted = 0, acted_in, acted
+        self._levels = sorted(levels)
+        if levels:
+            self._layers = [0] * (len(levels) + 1)
+            for p in players:
+                self._spread(0, p.committed)
+        else:
+            self._layers = [committed]
+        # Pot money no seat committed (only possible when the pot was set directly) goes to the main pot
+        self._dead = self._pot - committed
+        self._dirty = False
+
+    def _leave_ring(self, seat: int) -> None:
+        """Splices a folded or all-in seat out of the acting order."""
+        self._in_ring[seat] = False
+        self._can_act -= 1
+        if self._acted_in[seat] == self._epoch:
+            self._acted -= 1
+        before, after = self._prev[seat], self._next[seat]
+        self._next[before] = after
+        self._prev[after] = before
+
+    def _next_to_act(self, seat: int) -> int:
+        """The first seat after `seat` that can act; only call while one can."""
+        seat = self._next[seat]
+        while not self._in_ring[seat]:
+            seat = self._next[seat]
+        return seat
+
+    def _spread(self, low: int, high: int) -> None:
+        """Adds the chips a seat committed between `low` and `high` to the pot layers they fall in."""
+        levels = self._levels
+        i = bisect_right(levels, low)
+        while low < high:
+            part = min(high, levels[i] if i < len(levels) else high) - low
+            self._layers[i] += part
+            low += part
+            i += 1
+
+    def _cap(self, level: int) -> None:
+        """Cuts the pot layers at an all-in total; O(n), once per all-in seat."""
+        levels = self._levels
+        j = bisect_left(levels, level)
+        if j < len(levels) and levels[j] == level:
+            return
+        below = levels[j - 1] if j else 0
+        part = sum(min(p.committed, level) - below for p in self.players if p.committed > below)
+        levels.insert(j, level)
+        self._layers.insert(j, part)
+        self._layers[j + 1] -= part
+
+    def _commit(self, player: Player, amount: int) -> int:
+        """Moves up to `amount` of the player's chips into the pot."""
+        before = player.committed
+        added = player.bet(amount)
+        self._pot += added
+        if self._levels:
+            self._spread(before, before + added)
+        else:
+            self._layers[0] += added
+        if player.is_all_in and self._in_ring[player.id]:
+            self._leave_ring(player.id)
+            self._cap(player.committed)
+        return added
+
+    def _notify(self, event: str, *args: Any) -> None:
+        for observer in self.observers:
+            try:
+                getattr(observer, event)(self, *args)
+            except Exception as e:
+                # Observers (history, stats) must never break gameplay
+                logger.error(f"[{self.id[:8]}] Observer {type(observer).__name__}.{event} failed: {e}")
+
+    def start_new_hand(self, deck: Optional[Deck] = None) -> None:
+        """Deals the next hand, from `deck` if given (e.g. a pre-generated order)."""
+        if deck is not None:
+            self.deck = deck
+        else:
+            self.deck.reset()
         self.community_cards = []
-        self.pot = 0
+        self.board.reset()
+        self._pot = 0
         self.winners = []
-        self.stage = "PRE_FLOP"
+        self.payouts = {}
+        self.refunds = {}
+        self._stage = "PRE_FLOP"
+        self._bet_to_call = 0
+        self.hand_no += 1
 
         self.dealer_pos = (self.dealer_pos + 1) % len(self.players)
 
-        active_count = 0
         for p in self.players:
             p.reset_hand_state()
             if p.chips > 0:
                 p.hand = self.deck.deal(2)
-                active_count += 1
             else:
                 p.is_folded = True
+        self.resync()
 
-        if active_count < 2:
-            pass
-
-        sb_pos = (self.dealer_pos + 1) % len(self.players)
-        bb_pos = (self.dealer_pos + 2) % len(self.players)
+        # Blinds sit at fixed offsets from the button; a busted blind seat just posts nothing
+        self.sb_pos = (self.dealer_pos + 1) % len(self.players)
+        self.bb_pos = (self.dealer_pos + 2) % len(self.players)
+        self._notify("on_hand_start")
 
-        self._post_blind(sb_pos, 10)
-        self._post_blind(bb_pos, 20)
-        self.bet_to_call = 20
+        self._post_blind(self.sb_pos, self.small_blind)
+        self._post_blind(self.bb_pos, self.big_blind)
+        self._bet_to_call = self.big_blind
 
-        self.active_player_id = (bb_pos + 1) % len(self.players)
+        # Busted seats and seats all-in from a blind are skipped; with nobody to act the board runs out
+        if self._live < 2:
+            self._end_hand_prematurely()
+        elif self._can_act:
+            self._active_player_id = self._next_to_act(self.bb_pos)
+        else:
+            self._advance_stage()
 
     def _post_blind(self, player_idx: int, amount: int) -> None:
         player = self.players[player_idx]
         if player.chips > 0:
-            bet = player.bet(amount)
-            self.pot += bet
+            bet = self._commit(player, amount)
             player.last_action = "Blind"
+            self._notify("on_action", player, "blind", bet)
 
     def process_player_action(self, player_id: int, action: str, amount: int = 0) -> None:
-        if player_id != self.active_player_id:
+        if self._dirty:
+            self.resync()
+        if player_id != self._active_player_id:
             raise ValueError("Not this player's turn")
 
         player = self.players[player_id]
+        added = 0
 
         if action == "fold":
             player.fold()
+            self._live -= 1
+            self._leave_ring(player_id)
+            kind = "fold"
 
         elif action in ["check", "call"]:
-            call_amt = self.bet_to_call - player.current_bet
+            call_amt = self._bet_to_call - player.current_bet
             if call_amt > 0:
-                added = player.bet(call_amt)
-                self.pot += added
+                added = self._commit(player, call_amt)
                 player.last_action = "Call"
+                kind = "call"
             else:
                 player.last_action = "Check"
+                kind = "check"
 
         elif action in ["bet", "raise"]:
-            diff = amount - player.current_bet
-            added = player.bet(diff)
-            self.pot += added
+            # A raise to less than the current bet is treated as a call
+            diff = max(amount, self._bet_to_call) - player.current_bet
+            added = self._commit(player, diff)
 
-            if player.current_bet > self.bet_to_call:
-                self.bet_to_call = player.current_bet
+            if player.current_bet > self._bet_to_call:
+                self._bet_to_call = player.current_bet
                 player.last_action = f"Raise ${player.current_bet}"
-            else:
+                kind = "raise"
+                # Everyone else has to answer the raise
+                self._epoch += 1
+                self._acted = 0
+            elif player.is_all_in:
                 player.last_action = "All In"
+                kind = "all_in"
+            else:
+                player.last_action = "Call"
+                kind = "call"
+
+        else:
+            kind = None
 
+        if kind and kind != "fold" and self._in_ring[player_id]:
+            self._acted_in[player_id] = self._epoch
+            self._acted += 1
+        if kind:
+            self._notify("on_action", player, kind, added)
         self._rotate_turn()
 
     def _rotate_turn(self) -> None:
-        active_players = [p for p in self.players if not p.is_folded and not p.is_all_in]
-
-        if len([p for p in self.players if not p.is_folded]) == 1:
+        if self._live == 1:
             self._end_hand_prematurely()
-            return
-
-        next_idx = self.active_player_id
-        for i in range(1, len(self.players)):
-            idx = (self.active_player_id + i) % len(self.players)
-            p = self.players[idx]
-            if not p.is_folded and not p.is_all_in:
-                next_idx = idx
-                break
-        
-        all_matched = all(
-            p.current_bet == self.bet_to_call or p.is_all_in 
-            for p in active_players
-        )
-        
-        all_acted = all(p.last_action is not None for p in active_players)
-        
-        round_over = False
-        if all_matched and all_acted:
-            is_preflop = (self.stage == "PRE_FLOP")
-            bb_pos = (self.dealer_pos + 2) % len(self.players)
-            bb_player = self.players[bb_pos]
-            
-            if is_preflop and self.bet_to_call == 20 and bb_player.last_action == "Blind":
-                if next_idx != bb_pos:
-                    pass
-                round_over = False
-            else:
-                round_over = True
-
-        if round_over:
+        elif self._acted == self._can_act:
+            # Everyone who can still act has matched the last raise (preflop that includes the big blind's option)
             self._advance_stage()
         else:
-            self.active_player_id = next_idx
+            self._active_player_id = self._next_to_act(self._active_player_id)
 
     def _advance_stage(self) -> None:
         for p in self.players:
             p.reset_round_state()
-        self.bet_to_call = 0
-
-        if self.stage == "PRE_FLOP":
-            self.stage = "FLOP"
-            self.community_cards.extend(self.deck.deal(3))
-        elif self.stage == "FLOP":
-            self.stage = "TURN"
-            self.community_cards.extend(self.deck.deal(1))
-        elif self.stage == "TURN":
-            self.stage = "RIVER"
-            self.community_cards.extend(self.deck.deal(1))
-        elif self.stage == "RIVER":
+        self._bet_to_call = 0
+        self._epoch += 1
+        self._acted = 0
+
+        if self._stage == "PRE_FLOP":
+            self._stage = "FLOP"
+            self._deal_board(3)
+        elif self._stage == "FLOP":
+            self._stage = "TURN"
+            self._deal_board(1)
+        elif self._stage == "TURN":
+            self._stage = "RIVER"
+            self._deal_board(1)
+        elif self._stage == "RIVER":
             self._resolve_showdown()
             return
 
-        idx = self.dealer_pos
-        for i in range(1, len(self.players) + 1):
-            next_idx = (idx + i) % len(self.players)
-            p = self.players[next_idx]
-            if not p.is_folded and not p.is_all_in:
-                self.active_player_id = next_idx
-                return
+        self._notify("on_street")
 
-        if self.stage != "HAND_OVER":
+        if self._can_act:
+            self._active_player_id = self._next_to_act(self.dealer_pos)
+        elif self._stage != "HAND_OVER":
             self._advance_stage()
 
-    def _resolve_showdown(self) -> None:
-        self.stage = "SHOWDOWN"
-        self.active_player_id = -1
+    def _deal_board(self, amount: int) -> None:
+        cards = self.deck.deal(amount)
+        self.community_cards.extend(cards)
+        self.board.add(cards)
 
-        remaining = [p for p in self.players if not p.is_folded]
+    def current_board(self) -> BoardEvaluator:
+        """Board aggregates for the current community cards (rebuilt if they were set directly)."""
+        if not self.board.matches(self.community_cards):
+            self.board = BoardEvaluator(self.community_cards)
+        return self.board
 
-        results = []
-        for p in remaining:
-            score_tuple = evaluate_hand(p.hand + self.community_cards)
-            results.append((p, score_tuple))
+    def _resolve_showdown(self) -> None:
+        self._stage = "SHOWDOWN"
+        self._active_player_id = -1
 
-        if not results:
+        board = self.current_board()
+        scores = {p.id: board.evaluate(p.hand) for p in self.players if not p.is_folded}
+        if not scores:
             return
 
-        best_score = max(results, key=lambda x: x[1])[1]
-        winners = [p for p, score in results if score == best_score]
-
-        self.winners = [p.id for p in winners]
-
-        if winners:
-            share = self.pot // len(winners)
-            for p in winners:
-                p.chips += share
-
-        self.stage = "HAND_OVER"
+        # Award the layers top down. A layer goes to the best hand among the live seats that put chips
+        # into it; a layer nobody live reached (only possible after direct edits) falls to the one below
+        n = len(self.players)
+        carry = self._dead
+        for i in range(len(self._layers) - 1, -1, -1):
+            amount = self._layers[i] + carry
+            if not amount:
+                continue
+            below = self._levels[i - 1] if i else 0
+            eligible = [seat for seat in scores if self.players[seat].committed > below]
+            if not eligible and i == 0:
+                eligible = list(scores)
+            if not eligible:
+                carry = amount
+                continue
+            carry = 0
+
+            best = max(scores[seat] for seat in eligible)
+            # Odd chips go to the winners closest to the dealer's left
+            layer_winners = sorted((seat for seat in eligible if scores[seat] == best),
+                                   key=lambda seat: (seat - self.dealer_pos - 1) % n)
+            share, odd = divmod(amount, len(layer_winners))
+            for k, seat in enumerate(layer_winners):
+                won = share + (1 if k < odd else 0)
+                self.players[seat].chips += won
+                self.payouts[seat] = self.payouts.get(seat, 0) + won
+
+        self._split_refund()
+        self.winners = sorted(self.payouts)
+        self._stage = "HAND_OVER"
+        self._notify("on_hand_end")
+
+    def _split_refund(self) -> None:
+        """Moves the part of the biggest commitment nobody matched from payouts to refunds."""
+        top = second = 0
+        seat = -1
+        for p in self.players:
+            if p.committed > top:
+                top, second, seat = p.committed, top, p.id
+            elif p.committed > second:
+                second = p.committed
+        amount = min(top - second, self.payouts.get(seat, 0))
+        if amount > 0:
+            self.refunds[seat] = amount
+            self.payouts[seat] -= amount
+            if not self.payouts[seat]:
+                del self.payouts[seat]
 
     def _end_hand_prematurely(self) -> None:
         """Everyone folded except one."""
         winner = next(p for p in self.players if not p.is_folded)
-        winner.chips += self.pot
+        winner.chips += self._pot
+        self.payouts = {winner.id: self._pot}
+        self._split_refund()
         self.winners = [winner.id]
-        self.stage = "HAND_OVER"
-        self.active_player_id = -1
+        self._stage = "HAND_OVER"
+        self._active_player_id = -1
+        self._notify("on_hand_end")
 
     def to_dict(self, for_player_id: int) -> Dict[str, Any]:
         return {
@@ -211,3 +510,23 @@ class GameEngine:
                 for p in self.players
             ]
         }
+
+
+_scratch = threading.local()
+
+def apply(state: TableState, action: str, amount: int = 0) -> TableState:
+    """
+    Pure transition: returns the state after `action`, leaving `state` untouched.
+    Runs the real betting rules on a per-thread scratch engine. Chained calls
+    (feeding back the state the previous call returned, as rollouts do) skip
+    the restore, since the scratch engine is already sitting on that state.
+    """
+    engine = getattr(_scratch, "engine", None)
+    if engine is None:
+        engine = _scratch.engine = GameEngine.from_snapshot(state)
+    elif state is not _scratch.last:
+        engine.restore(state)
+    _scratch.last = None  # a failed action below may leave the engine half-way
+    engine.process_player_action(state.active_player_id, action, amount)
+    _scratch.last = engine.snapshot()
+    return _scratch.last
@@ -0,0 +1,73 @@
+"""
+Monte Carlo showdown equity against a number of unknown opponent hands.
+
+equity_stream() refines the estimate in small batches so callers can push
+intermediate results and stop (or be cancelled) between batches.
+"""
+import math
+import random
+from typing import Iterator, NamedTuple, Optional, Sequence
+
+from .card import Card
+from .deck import FULL_DECK
+from .hand_evaluator import BoardEvaluator
+
+class EquityEstimate(NamedTuple):
+    equity: float
+    samples: int
+    std_error: float
+    done: bool
+
+def sample_equity(hole: Sequence[Card], board: Sequence[Card], opponents: int,
+                  samples: int, rng: random.Random) -> float:
+    """Summed equity shares (win = 1, split = 1/n) over `samples` random run-outs."""
+    known = {c.to_int() for c in hole} | {c.to_int() for c in board}
+    unseen = [c for c in FULL_DECK if c.to_int() not in known]
+    missing = 5 - len(board)
+    needed = missing + 2 * opponents
+    hole = list(hole)
+    board = list(board)
+
+    total = 0.0
+    for _ in range(samples):
+        drawn = rng.sample(unseen, needed)
+        full_board = BoardEvaluator(board + drawn[:missing])
+        mine = full_board.evaluate(hole)
+        ties = 0
+        lost = False
+        for i in range(opponents):
+            theirs = full_board.evaluate(drawn[missing + 2 * i:missing + 2 * i + 2])
+            if theirs > mine:
+                lost = True
+                break
+            if theirs == mine:
+                ties += 1
+        if not lost:
+            total += 1.0 / (ties + 1)
+    return total
+
+def equity_stream(hole: Sequence[Card], board: Sequence[Card], opponents: int,
+                  batch: int = 100, max_samples: int = 4000, tolerance: float = 0.01,
+                  rng: Optional[random.Random] = None) -> Iterator[EquityEstimate]:
+    """
+    Yields a refined estimate after every `batch` run-outs until the standard
+    error drops below `tolerance` or `max_samples` run-outs have been played.
+    """
+    rng = rng or random.Random()
+    if opponents <= 0:
+        yield EquityEstimate(1.0, 0, 0.0, True)
+        return
+
+    total = 0.0
+    samples = 0
+    while samples < max_samples:
+        step = min(batch, max_samples - samples)
+        total += sample_equity(hole, board, opponents, step, rng)
+        samples += step
+        equity = total / samples
+        # Bernoulli bound on the standard error; split pots only make it smaller
+        std_error = math.sqrt(max(equity * (1 - equity), 1e-9) / samples)
+        done = samples >= max_samples or std_error < tolerance
+        yield EquityEstimate(equity, samples, std_error, done)
+        if done:
+            return
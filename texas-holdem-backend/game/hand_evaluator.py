@@ -1,5 +1,5 @@
 from collections import Counter
-from typing import List, Tuple, Union
+from typing import List, NamedTuple, Sequence, Tuple, Union
 from .card import Card, Rank
 
 def evaluate_hand(cards: List[Card]) -> Tuple[int, List[int]]:
@@ -75,3 +75,177 @@ def evaluate_hand(cards: List[Card]) -> Tuple[int, List[int]]:
         return (2, [pairs[0]] + kickers)
 
     return (1, [c.rank.value for c in sorted_cards[:5]])
+
+HAND_NAMES = {
+    0: "Nothing", 1: "High Card", 2: "Pair", 3: "Two Pair", 4: "Three of a Kind",
+    5: "Straight", 6: "Flush", 7: "Full House", 8: "Four of a Kind", 9: "Straight Flush",
+}
+
+_WHEEL = (1 << 12) | 0b1111
+
+def _straight_table() -> List[int]:
+    table = [0] * (1 << 13)
+    # Walk every superset of each straight's window, lowest straight first so higher ones overwrite
+    for high, window in [(5, _WHEEL)] + [(h, 0b11111 << (h - 6)) for h in range(6, 15)]:
+        free = ((1 << 13) - 1) & ~window
+        extra = free
+        while True:
+            table[window | extra] = high
+            if not extra:
+                break
+            extra = (extra - 1) & free
+    return table
+
+# Highest straight (top rank, 5 for the wheel) in a 13-bit rank mask, bit r-2 for rank r
+STRAIGHT_HIGH = _straight_table()
+
+def _straight_ranks(high: int) -> List[int]:
+    return [5, 4, 3, 2, 14] if high == 5 else list(range(high, high - 5, -1))
+
+def _top_ranks(mask: int, n: int) -> List[int]:
+    ranks = []
+    for r in range(14, 1, -1):
+        if mask >> (r - 2) & 1:
+            ranks.append(r)
+            if len(ranks) == n:
+                break
+    return ranks
+
+class HandInfo(NamedTuple):
+    category: int
+    made: str
+    draws: List[str]
+    outs: int
+
+class BoardEvaluator:
+    """
+    Board-only aggregates (rank counts, suit counts, per-suit rank masks) kept
+    up to date as streets are dealt, so a player's hand is scored by merging
+    two hole cards instead of re-sorting the whole board. Scores are identical
+    to evaluate_hand().
+    """
+
+    __slots__ = ("cards", "rank_counts", "rank_mask", "suit_counts", "suit_masks")
+
+    def __init__(self, cards: Sequence[Card] = ()) -> None:
+        self.reset()
+        self.add(cards)
+
+    def reset(self) -> None:
+        self.cards: List[Card] = []
+        self.rank_counts = [0] * 15
+        self.rank_mask = 0
+        self.suit_counts = [0] * 5
+        self.suit_masks = [0] * 5
+
+    def add(self, cards: Sequence[Card]) -> None:
+        for c in cards:
+            self.cards.append(c)
+            self.rank_counts[c.rank] += 1
+            self.rank_mask |= 1 << (c.rank - 2)
+            self.suit_counts[c.suit] += 1
+            self.suit_masks[c.suit] |= 1 << (c.rank - 2)
+
+    def matches(self, cards: Sequence[Card]) -> bool:
+        return len(cards) == len(self.cards) and all(a == b for a, b in zip(cards, self.cards))
+
+    def evaluate(self, hole: Sequence[Card]) -> Tuple[int, List[int]]:
+        """Same result as evaluate_hand(hole + board)."""
+        if len(hole) + len(self.cards) < 5:
+            return (0, [])
+        return self._score(hole)
+
+    def _score(self, extra: Sequence[Card]) -> Tuple[int, List[int]]:
+        counts = self.rank_counts[:]
+        mask = self.rank_mask
+        suit_counts = self.suit_counts[:]
+        suit_masks = self.suit_masks[:]
+        for c in extra:
+            bit = 1 << (c.rank - 2)
+            counts[c.rank] += 1
+            mask |= bit
+            suit_counts[c.suit] += 1
+            suit_masks[c.suit] |= bit
+
+        flush_mask = 0
+        for s in range(1, 5):
+            if suit_counts[s] >= 5:
+                flush_mask = suit_masks[s]
+                high = STRAIGHT_HIGH[flush_mask]
+                if high:
+                    return (9, _straight_ranks(high))
+                break
+
+        quads: List[int] = []
+        trips: List[int] = []
+        pairs: List[int] = []
+        for r in range(14, 1, -1):
+            n = counts[r]
+            if n == 4:
+                quads.append(r)
+            elif n == 3:
+                trips.append(r)
+            elif n == 2:
+                pairs.append(r)
+
+        if quads:
+            return (8, [quads[0], _top_ranks(mask & ~(1 << (quads[0] - 2)), 1)[0]])
+        if trips and (pairs or len(trips) > 1):
+            return (7, [trips[0], max(pairs + trips[1:])])
+        if flush_mask:
+            return (6, _top_ranks(flush_mask, 5))
+        high = STRAIGHT_HIGH[mask]
+        if high:
+            return (5, _straight_ranks(high))
+        if trips:
+            return (4, [trips[0]] + _top_ranks(mask & ~(1 << (trips[0] - 2)), 2))
+        if len(pairs) >= 2:
+            top = pairs[:2]
+            rest = mask & ~(1 << (top[0] - 2)) & ~(1 << (top[1] - 2))
+            return (3, top + _top_ranks(rest, 1))
+        if pairs:
+            return (2, [pairs[0]] + _top_ranks(mask & ~(1 << (pairs[0] - 2)), 3))
+        return (1, _top_ranks(mask, 5))
+
+    def hand_info(self, hole: Sequence[Card]) -> HandInfo:
+        """Made hand, draws and improving outs for `hole` on this board (for bot prompts)."""
+        category, ranks = self._score(hole)
+        made = HAND_NAMES[category]
+        if category == 2 and self.cards:
+            board_top = max(c.rank for c in self.cards)
+            if any(c.rank == ranks[0] for c in hole) and ranks[0] >= board_top:
+                made = "Top Pair" if ranks[0] == board_top else "Overpair"
+            elif self.rank_counts[ranks[0]] == 2:
+                made = "Pair on board"
+        elif category == 2:
+            made = "Pocket Pair"
+
+        draws: List[str] = []
+        outs = 0
+        if 3 <= len(self.cards) < 5:
+            seen = {c.to_int() for c in hole} | {c.to_int() for c in self.cards}
+            for code in range(52):
+                if code in seen:
+                    continue
+                card = Card.from_int(code)
+                improved = self._score(list(hole) + [card])[0]
+                # Pairing the board helps everyone, so it only counts when it makes trips or better
+                if improved > category and (improved >= 4 or not self.rank_counts[card.rank]):
+                    outs += 1
+            if category < 6:
+                mine = 0
+                for c in hole:
+                    mine |= 1 << c.suit
+                for s in range(1, 5):
+                    if mine >> s & 1 and self.suit_counts[s] + sum(1 for c in hole if c.suit == s) == 4:
+                        draws.append("flush draw")
+            if category < 5:
+                mask = self.rank_mask
+                for c in hole:
+                    mask |= 1 << (c.rank - 2)
+                completing = sum(1 for r in range(13) if not mask >> r & 1 and STRAIGHT_HIGH[mask | 1 << r])
+                if completing >= 2:
+                    draws.append("open-ended straight draw")
+                elif completing == 1:
+                    draws.append("gutshot straight draw")
+        return HandInfo(category, made, draws, outs)
@@ -0,0 +1,398 @@
+"""
+Hand histories as fixed-width binary records in rotating segment files.
+
+Every record is RECORD_SIZE bytes and starts with a one byte tag:
+    H  hand header      G  game id        S  seat + hole cards
+    A  action           B  board          W  payout            R  refund
+    E  end of hand
+Cards are stored as Card.to_int() codes, NO_CARD marks an empty slot.
+Segments are written as '<n>-<pid>-<token>.hh.part' and renamed to drop the
+'.part' once sealed, so readers only ever see complete files. The pid and
+token name the writer, so several processes can share a directory and a
+new writer only recovers open segments whose owner is gone.
+"""
+import os
+import re
+import struct
+import threading
+import time
+import uuid
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from enum import IntEnum
+from typing import Dict, Iterator, List, Optional, Set
+
+from .card import Card
+from .engine import GameEngine, GameObserver
+from .player import Player
+
+RECORD_SIZE = 24
+NO_CARD = 255
+NAME_BYTES = 16
+U32_MAX = 0xFFFFFFFF
+
+STREETS = ["PRE_FLOP", "FLOP", "TURN", "RIVER"]
+
+class ActionCode(IntEnum):
+    BLIND = 0
+    FOLD = 1
+    CHECK = 2
+    CALL = 3
+    RAISE = 4
+    ALL_IN = 5
+
+_HEADER = struct.Struct("<cIdBBIIB")
+_GAME = struct.Struct("<c16s7x")
+_SEAT = struct.Struct("<cBIBB16s")
+_ACTION = struct.Struct("<cBBBIII8x")
+_BOARD = struct.Struct("<c5B18x")
+_PAYOUT = struct.Struct("<cBI18x")
+_END = struct.Struct("<cIB18x")
+
+for _fmt in (_HEADER, _GAME, _SEAT, _ACTION, _BOARD, _PAYOUT, _END):
+    assert _fmt.size == RECORD_SIZE
+
+@dataclass
+class SeatRecord:
+    seat: int
+    name: str
+    chips: int
+    cards: List[int] = field(default_factory=list)
+
+@dataclass
+class ActionRecord:
+    seat: int
+    street: int
+    action: ActionCode
+    amount: int
+    total_bet: int
+    pot: int
+
+@dataclass
+class HandRecord:
+    game_id: str
+    hand_no: int
+    timestamp: float
+    dealer: int
+    small_blind: int
+    big_blind: int
+    seats: List[SeatRecord] = field(default_factory=list)
+    actions: List[ActionRecord] = field(default_factory=list)
+    board: List[int] = field(default_factory=list)
+    pot: int = 0
+    payouts: Dict[int, int] = field(default_factory=dict)
+    refunds: Dict[int, int] = field(default_factory=dict)
+    showdown: bool = False
+    big_blind_seat: Optional[int] = None  # None in files written before it was recorded
+
+    @property
+    def winners(self) -> List[int]:
+        return list(self.payouts)
+
+def _u32(value: int) -> int:
+    return min(max(int(value), 0), U32_MAX)
+
+def _u8(value: int) -> int:
+    return min(max(int(value), 0), 255)
+
+def encode_hand(hand: HandRecord) -> bytes:
+    """Encodes a hand; out-of-range numbers are clamped rather than failing the whole record."""
+    parts = [
+        _HEADER.pack(b"H", _u32(hand.hand_no), hand.timestamp, _u8(hand.dealer), _u8(len(hand.seats)),
+                     _u32(hand.small_blind), _u32(hand.big_blind),
+                     0 if hand.big_blind_seat is None else _u8(hand.big_blind_seat + 1)),
+        _GAME.pack(b"G", uuid.UUID(hand.game_id).bytes),
+    ]
+    for s in hand.seats:
+        c1, c2 = (s.cards + [NO_CARD, NO_CARD])[:2]
+        parts.append(_SEAT.pack(b"S", _u8(s.seat), _u32(s.chips), c1, c2, s.name.encode("utf-8")[:NAME_BYTES]))
+    for a in hand.actions:
+        parts.append(_ACTION.pack(b"A", _u8(a.seat), a.street, a.action, _u32(a.amount), _u32(a.total_bet), _u32(a.pot)))
+    parts.append(_BOARD.pack(b"B", *(hand.board + [NO_CARD] * 5)[:5]))
+    for seat, amount in hand.payouts.items():
+        parts.append(_PAYOUT.pack(b"W", _u8(seat), _u32(amount)))
+    for seat, amount in hand.refunds.items():
+        parts.append(_PAYOUT.pack(b"R", _u8(seat), _u32(amount)))
+    parts.append(_END.pack(b"E", _u32(hand.pot), hand.showdown))
+    return b"".join(parts)
+
+class _Decoder:
+    """Turns a stream of whole records into hands; a hand may span several chunks."""
+
+    def __init__(self) -> None:
+        self.hand: Optional[HandRecord] = None
+
+    def feed(self, data: bytes) -> Iterator[HandRecord]:
+        hand = self.hand
+        for offset in range(0, len(data), RECORD_SIZE):
+            tag = data[offset:offset + 1]
+            if tag == b"A":
+                _, seat, street, action, amount, total, pot = _ACTION.unpack_from(data, offset)
+                hand.actions.append(ActionRecord(seat, street, ActionCode(action), amount, total, pot))
+            elif tag == b"S":
+                _, seat, chips, c1, c2, name = _SEAT.unpack_from(data, offset)
+                cards = [c for c in (c1, c2) if c != NO_CARD]
+                hand.seats.append(SeatRecord(seat, name.rstrip(b"\0").decode("utf-8", "ignore"), chips, cards))
+            elif tag == b"H":
+                _, hand_no, ts, dealer, _, sb, bb, bb_seat = _HEADER.unpack_from(data, offset)
+                hand = HandRecord("", hand_no, ts, dealer, sb, bb, big_blind_seat=bb_seat - 1 if bb_seat else None)
+            elif tag == b"G":
+                hand.game_id = str(uuid.UUID(bytes=_GAME.unpack_from(data, offset)[1]))
+            elif tag == b"B":
+                hand.board = [c for c in _BOARD.unpack_from(data, offset)[1:] if c != NO_CARD]
+            elif tag == b"W":
+                _, seat, amount = _PAYOUT.unpack_from(data, offset)
+                hand.payouts[seat] = amount
+            elif tag == b"R":
+                _, seat, amount = _PAYOUT.unpack_from(data, offset)
+                hand.refunds[seat] = amount
+            elif tag == b"E":
+                _, hand.pot, showdown = _END.unpack_from(data, offset)
+                hand.showdown = bool(showdown)
+                yield hand
+                hand = None
+            else:
+                raise ValueError(f"Corrupt hand history record: {tag!r}")
+        self.hand = hand
+
+# '<n>.hh' segments come from writers that did not put their owner in the name
+SEGMENT_RE = re.compile(r"^(\d{8})(?:-(\d+)-([0-9a-f]+))?\.hh(\.part)?$")
+
+def segment_paths(directory: str, include_open: bool = False) -> List[str]:
+    """Segment files in write order. Open segments are skipped unless asked for."""
+    if not os.path.isdir(directory):
+        return []
+    found = []
+    for name in os.listdir(directory):
+        m = SEGMENT_RE.match(name)
+        if m and (include_open or not m.group(4)):
+            found.append((int(m.group(1)), name))
+    return [os.path.join(directory, name) for _, name in sorted(found)]
+
+# Tokens of the writers open in this process
+_open_writers: Set[str] = set()
+
+def _owner_alive(pid: int, token: str) -> bool:
+    if pid == os.getpid():
+        return token in _open_writers
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True  # someone else's process
+    except OSError:
+        return False
+    return True
+
+def read_segment(path: str, chunk_records: int = 4096) -> Iterator[HandRecord]:
+    """Streams hands from one segment; memory stays bounded by the chunk size."""
+    decoder = _Decoder()
+    with open(path, "rb") as f:
+        while True:
+            chunk = f.read(RECORD_SIZE * chunk_records)
+            # A torn final record (crash mid-write) is dropped along with its hand.
+            chunk = chunk[:len(chunk) - len(chunk) % RECORD_SIZE]
+            if not chunk:
+                break
+            yield from decoder.feed(chunk)
+
+def iter_hands(path: str) -> Iterator[HandRecord]:
+    """Iterates every hand in a segment file or in all sealed segments of a directory."""
+    paths = segment_paths(path) if os.path.isdir(path) else [path]
+    for segment in paths:
+        yield from read_segment(segment)
+
+class HandHistoryWriter:
+    """
+    Thread-safe buffered writer shared by all tables of a process.
+    Hands are encoded into memory and only hit the disk once `buffer_bytes`
+    have accumulated; segments are sealed once they exceed `segment_bytes`.
+    """
+
+    def __init__(self, directory: str, segment_bytes: int = 8 * 1024 * 1024, buffer_bytes: int = 64 * 1024):
+        self.directory = directory
+        self.segment_bytes = segment_bytes
+        self.buffer_bytes = buffer_bytes
+        self.lock = threading.Lock()
+        self._buffer = bytearray()
+        self._file = None
+        self._segment_size = 0
+        self._token = uuid.uuid4().hex[:12]
+        self._owner = f"{os.getpid()}-{self._token}"
+
+        os.makedirs(directory, exist_ok=True)
+        existing = segment_paths(directory, include_open=True)
+        for path in existing:
+            m = SEGMENT_RE.match(os.path.basename(path))
+            # Seal what a crashed writer left open; live writers keep their segments
+            if m.group(4) and (m.group(2) is None or not _owner_alive(int(m.group(2)), m.group(3))):
+                os.replace(path, path[:-len(".part")])
+        self._next_index = int(os.path.basename(existing[-1])[:8]) + 1 if existing else 1
+        _open_writers.add(self._token)
+
+    def write(self, hand: HandRecord) -> None:
+        data = encode_hand(hand)
+        with self.lock:
+            self._buffer += data
+            if len(self._buffer) >= self.buffer_bytes:
+                self._flush_locked()
+
+    def flush(self) -> None:
+        with self.lock:
+            self._flush_locked()
+
+    def close(self) -> None:
+        with self.lock:
+            self._flush_locked()
+            self._seal_locked()
+        _open_writers.discard(self._token)
+
+    def _flush_locked(self) -> None:
+        if not self._buffer:
+            return
+        if self._file is None:
+            path = os.path.join(self.directory, f"{self._next_index:08d}-{self._owner}.hh.part")
+            self._next_index += 1
+            self._file = open(path, "ab")
+            self._segment_size = 0
+        self._file.write(self._buffer)
+        self._file.flush()
+        self._segment_size += len(self._buffer)
+        self._buffer.clear()
+        if self._segment_size >= self.segment_bytes:
+            self._seal_locked()
+
+    def _seal_locked(self) -> None:
+        if self._file is None:
+            return
+        path = self._file.name
+        self._file.close()
+        self._file = None
+        os.replace(path, path[:-len(".part")])
+
+class HandRecorder(GameObserver):
+    """Builds a HandRecord from engine events and hands it to a writer when the hand ends."""
+
+    def __init__(self, writer: HandHistoryWriter):
+        self.writer = writer
+        self.hand: Optional[HandRecord] = None
+
+    def on_hand_start(self, engine: GameEngine) -> None:
+        self.hand = HandRecord(
+            game_id=engine.id,
+            hand_no=engine.hand_no,
+            timestamp=time.time(),
+            dealer=engine.dealer_pos,
+            small_blind=engine.small_blind,
+            big_blind=engine.big_blind,
+            big_blind_seat=engine.bb_pos,
+            seats=[SeatRecord(p.id, p.name, p.chips, [c.to_int() for c in p.hand]) for p in engine.players],
+        )
+
+    def on_action(self, engine: GameEngine, player: Player, action: str, added: int) -> None:
+        code = ActionCode.__members__.get(action.upper())
+        if self.hand is None or code is None or engine.stage not in STREETS:
+            return
+        self.hand.actions.append(ActionRecord(
+            seat=player.id,
+            street=STREETS.index(engine.stage),
+            action=code,
+            amount=max(added, 0),
+            total_bet=player.current_bet,
+            pot=engine.pot,
+        ))
+
+    def on_hand_end(self, engine: GameEngine) -> None:
+        if self.hand is None:
+            return
+        hand, self.hand = self.hand, None
+        hand.board = [c.to_int() for c in engine.community_cards]
+        hand.pot = engine.pot
+        hand.payouts = dict(engine.payouts)
+        hand.refunds = dict(engine.refunds)
+        hand.showdown = len([p for p in engine.players if not p.is_folded]) > 1
+        self.writer.write(hand)
+
+def _card_text(code: int) -> str:
+    s = Card.from_int(code).to_str()
+    return s[0] + s[1].lower()
+
+def _cards_text(codes: List[int]) -> str:
+    return "[" + " ".join(_card_text(c) for c in codes) + "]"
+
+def to_text(hand: HandRecord) -> str:
+    """Renders a hand in the common PokerStars-style text format."""
+    names = {s.seat: s.name for s in hand.seats}
+    stacks = {s.seat: s.chips for s in hand.seats}
+    when = datetime.fromtimestamp(hand.timestamp, timezone.utc).strftime("%Y/%m/%d %H:%M:%S UTC")
+    lines = [
+        f"Hand #{hand.hand_no}: Hold'em No Limit (${hand.small_blind}/${hand.big_blind}) - {when}",
+        f"Table '{hand.game_id}' {len(hand.seats)}-max Seat #{hand.dealer + 1} is the button",
+    ]
+    for s in hand.seats:
+        lines.append(f"Seat {s.seat + 1}: {s.name} (${s.chips} in chips)")
+
+    folded = set()
+    blinds_posted = 0
+    headers = {1: ("FLOP", 3), 2: ("TURN", 4), 3: ("RIVER", 5)}
+
+    for street in range(4):
+        if street == 0:
+            lines.append("*** HOLE CARDS ***")
+            for s in hand.seats:
+                if s.cards:
+                    lines.append(f"Dealt to {s.name} {_cards_text(s.cards)}")
+        else:
+            title, shown = headers[street]
+            if len(hand.board) < shown:
+                break
+            if street == 1:
+                lines.append(f"*** {title} *** {_cards_text(hand.board[:3])}")
+            else:
+                lines.append(f"*** {title} *** {_cards_text(hand.board[:shown - 1])} [{_card_text(hand.board[shown - 1])}]")
+
+        street_bet = 0
+        for a in hand.actions:
+            if a.street != street:
+                continue
+            name = names.get(a.seat, f"Seat {a.seat + 1}")
+            stacks[a.seat] = stacks.get(a.seat, 0) - a.amount
+            all_in = " and is all-in" if stacks[a.seat] == 0 and a.amount > 0 else ""
+
+            if a.action == ActionCode.BLIND:
+                if hand.big_blind_seat is None:
+                    kind = "small" if blinds_posted == 0 else "big"
+                else:
+                    # The small blind seat may be busted, leaving the big blind as the only post
+                    kind = "big" if a.seat == hand.big_blind_seat else "small"
+                blinds_posted += 1
+                lines.append(f"{name}: posts {kind} blind ${a.amount}{all_in}")
+            elif a.action == ActionCode.FOLD:
+                folded.add(a.seat)
+                lines.append(f"{name}: folds")
+            elif a.action == ActionCode.CHECK:
+                lines.append(f"{name}: checks")
+            elif a.action == ActionCode.CALL or (a.action == ActionCode.ALL_IN and a.total_bet <= street_bet):
+                lines.append(f"{name}: calls ${a.amount}{all_in}")
+            elif street_bet == 0:
+                lines.append(f"{name}: bets ${a.amount}{all_in}")
+            else:
+                lines.append(f"{name}: raises ${a.total_bet - street_bet} to ${a.total_bet}{all_in}")
+            street_bet = max(street_bet, a.total_bet)
+
+    for seat, amount in hand.refunds.items():
+        lines.append(f"Uncalled bet (${amount}) returned to {names.get(seat, seat)}")
+    if hand.showdown:
+        lines.append("*** SHOW DOWN ***")
+        for s in hand.seats:
+            if s.cards and s.seat not in folded:
+                lines.append(f"{s.name}: shows {_cards_text(s.cards)}")
+    for seat, amount in hand.payouts.items():
+        lines.append(f"{names.get(seat, seat)} collected ${amount} from pot")
+
+    lines.append("*** SUMMARY ***")
+    lines.append(f"Total pot ${hand.pot - sum(hand.refunds.values())} | Rake $0")
+    if hand.board:
+        lines.append(f"Board {_cards_text(hand.board)}")
+    return "\n".join(lines) + "\n"
@@ -0,0 +1,137 @@
+"""
+Independent Chip Model: tournament payout equity from chip stacks.
+
+Finishing orders follow the Malmuth-Harville model, in which each remaining
+player takes the next-best place with probability proportional to their stack.
+For small fields the expectation is computed exactly by walking the sets of
+players who already hold the paid places, so the cost is
+sum(C(n, k) for k < paid) * n rather than n!. The walk runs over a whole batch
+of stack vectors at once. Larger fields are estimated by sampling whole
+finishing orders with the Gumbel-max trick, where sorting log(stack) + Gumbel
+noise draws a Harville order.
+"""
+from functools import lru_cache
+from math import comb
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+
+EXACT_LIMIT = 50_000
+# Placed-player sets are int64 bitmasks
+MAX_EXACT_PLAYERS = 62
+DEFAULT_SAMPLES = 20_000
+# Keys of busted players: below any live stack, while noise still orders them at random
+_BUSTED_KEY = -1e6
+_CHUNK_CELLS = 1_000_000
+
+def _paid(payouts: Sequence[float], players: int) -> np.ndarray:
+    paid = np.asarray(payouts, dtype=np.float64)[:players]
+    # Trailing unpaid places need no work
+    nonzero = np.flatnonzero(paid)
+    return paid[:nonzero[-1] + 1] if len(nonzero) else paid[:0]
+
+def exact_cost(players: int, paid_places: int) -> int:
+    """Operations the exact walk needs for `players` with `paid_places` paid."""
+    return players * sum(comb(players, k) for k in range(min(paid_places, players)))
+
+def _exact(stacks: np.ndarray, paid: np.ndarray) -> np.ndarray:
+    rows, n = stacks.shape
+    equity = np.zeros((rows, n))
+    bits = np.left_shift(1, np.arange(n, dtype=np.int64))
+    # One level per place: every set of already-placed players (as a bitmask),
+    # its probability and the chips still in play once it is gone
+    masks = np.zeros(1, dtype=np.int64)
+    probs = np.ones((rows, 1))
+    lefts = stacks.sum(axis=1, keepdims=True)
+    for place, prize in enumerate(paid):
+        placed = (masks[:, None] & bits) != 0
+        live = lefts > 0
+        # Busted players take the remaining places in uniformly random order
+        weights = np.where(live[:, :, None], stacks[:, None, :] / np.where(live, lefts, 1.0)[:, :, None],
+                           1.0 / (n - place))
+        taken = probs[:, :, None] * weights * ~placed
+        equity += taken.sum(axis=1) * prize
+        if place + 1 == len(paid):
+            break
+
+        parent, player = np.nonzero(~placed)
+        children, first, index = np.unique(masks[parent] | bits[player], return_index=True, return_inverse=True)
+        moved = taken[:, parent, player]
+        probs = np.stack([np.bincount(index, weights=row, minlength=len(children)) for row in moved])
+        lefts = (lefts[:, parent] - stacks[:, player])[:, first]
+        masks = children
+    return equity
+
+def _sampled(stacks: np.ndarray, paid: np.ndarray, samples: int,
+             rng: np.random.Generator) -> np.ndarray:
+    rows, n = stacks.shape
+    places = len(paid)
+    equity = np.zeros((rows, n))
+    with np.errstate(divide="ignore"):
+        keys = np.where(stacks > 0, np.log(stacks), _BUSTED_KEY)
+    chunk = max(1, _CHUNK_CELLS // n)
+
+    for row in range(rows):
+        done = 0
+        while done < samples:
+            size = min(chunk, samples - done)
+            noisy = keys[row] + rng.gumbel(size=(size, n))
+            if places < n:
+                top = np.argpartition(-noisy, places - 1, axis=1)[:, :places]
+            else:
+                top = np.broadcast_to(np.arange(n), (size, n))
+            ranked = np.take_along_axis(top, np.argsort(-np.take_along_axis(noisy, top, axis=1), axis=1), axis=1)
+            equity[row] += np.bincount(ranked.ravel(), weights=np.tile(paid, size), minlength=n)
+            done += size
+    return equity / samples
+
+def icm_batch(stacks: Sequence[Sequence[float]], payouts: Sequence[float],
+              samples: int = DEFAULT_SAMPLES, exact_limit: int = EXACT_LIMIT,
+              seed: Optional[int] = None) -> np.ndarray:
+    """
+    Payout equity for every row of a (candidates, players) stack matrix, e.g.
+    the fold, call-and-win and call-and-lose outcomes of one decision. Exact
+    when exact_cost() <= `exact_limit`, otherwise sampled with `samples`
+    finishing orders per row.
+    """
+    matrix = np.atleast_2d(np.asarray(stacks, dtype=np.float64))
+    if matrix.size == 0:
+        raise ValueError("No stacks given")
+    if (matrix < 0).any():
+        raise ValueError("Stacks cannot be negative")
+    paid = _paid(payouts, matrix.shape[1])
+    if not len(paid):
+        return np.zeros_like(matrix)
+    if matrix.shape[1] <= MAX_EXACT_PLAYERS and exact_cost(matrix.shape[1], len(paid)) <= exact_limit:
+        return _exact(matrix, paid)
+    return _sampled(matrix, paid, samples, np.random.default_rng(seed))
+
+@lru_cache(maxsize=4096)
+def _cached_icm(stacks: tuple, payouts: tuple, samples: int, exact_limit: int,
+                seed: Optional[int]) -> tuple:
+    return tuple(icm_batch([stacks], payouts, samples, exact_limit, seed)[0].tolist())
+
+def icm_equity(stacks: Sequence[float], payouts: Sequence[float], samples: int = DEFAULT_SAMPLES,
+               exact_limit: int = EXACT_LIMIT, seed: Optional[int] = None) -> List[float]:
+    """Payout equity of each stack; memoized by stacks and payouts."""
+    return list(_cached_icm(tuple(stacks), tuple(payouts), samples, exact_limit, seed))
+
+def call_equity(stacks: Sequence[int], payouts: Sequence[float], hero: int, villain: int,
+                win_probability: float, **kwargs) -> Dict[str, float]:
+    """
+    Hero's payout equity for folding versus calling an all-in from `villain`.
+    `stacks` are the stacks if hero folds. Hero's call risks min(hero, villain
+    stacks) and wins with `win_probability`. All three outcomes are evaluated
+    in one batch.
+    """
+    risk = min(stacks[hero], stacks[villain])
+    win, lose = list(stacks), list(stacks)
+    win[hero] += risk
+    win[villain] -= risk
+    lose[hero] -= risk
+    lose[villain] += risk
+    fold_eq, win_eq, lose_eq = icm_batch([stacks, win, lose], payouts, **kwargs)[:, hero]
+    return {
+        "fold": float(fold_eq),
+        "call": float(win_probability * win_eq + (1 - win_probability) * lose_eq),
+    }
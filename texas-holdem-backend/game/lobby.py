@@ -0,0 +1,124 @@
+"""
+Matchmaking lobby: waiting players queue per (stakes, table size) and are
+seated as soon as a table can be filled, or with bots in the empty seats once
+the longest wait passes `fill_after` seconds.
+
+Each queue is a heap ordered by arrival, so joining and being matched cost
+O(log n). Leaving only flags the ticket, and flagged tickets are skipped
+when they reach the top of the heap.
+"""
+import heapq
+import itertools
+import time
+import uuid
+from dataclasses import dataclass, field
+from typing import Callable, Dict, List, Optional, Tuple
+
+STAKES: Dict[str, Tuple[int, int]] = {"low": (10, 20), "mid": (50, 100), "high": (250, 500)}
+TABLE_SIZES = (2, 4, 6, 9)
+BUY_IN_BLINDS = 50
+
+QueueKey = Tuple[str, int]
+
+@dataclass
+class Ticket:
+    name: str
+    stakes: str
+    seats: int
+    joined_at: float
+    sid: Optional[str] = None
+    id: str = field(default_factory=lambda: str(uuid.uuid4()))
+    cancelled: bool = False
+
+    @property
+    def key(self) -> QueueKey:
+        return (self.stakes, self.seats)
+
+@dataclass
+class Match:
+    stakes: str
+    seats: int
+    tickets: List[Ticket]
+
+    @property
+    def bots(self) -> int:
+        return self.seats - len(self.tickets)
+
+    @property
+    def blinds(self) -> Tuple[int, int]:
+        return STAKES[self.stakes]
+
+    @property
+    def buy_in(self) -> int:
+        return STAKES[self.stakes][1] * BUY_IN_BLINDS
+
+class Lobby:
+    def __init__(self, fill_after: float = 5.0, clock: Callable[[], float] = time.monotonic):
+        self.fill_after = fill_after
+        self.clock = clock
+        self.tables_created = 0
+        self._queues: Dict[QueueKey, List[Tuple[float, int, Ticket]]] = {}
+        self._waiting: Dict[QueueKey, int] = {}
+        self._tickets: Dict[str, Ticket] = {}
+        self._seq = itertools.count()
+
+    def __len__(self) -> int:
+        return len(self._tickets)
+
+    def enqueue(self, name: str, stakes: str = "low", seats: int = 4, sid: Optional[str] = None) -> Ticket:
+        if stakes not in STAKES:
+            raise ValueError(f"Unknown stakes: {stakes}")
+        if seats not in TABLE_SIZES:
+            raise ValueError(f"Table size must be one of {TABLE_SIZES}")
+        ticket = Ticket(name=name, stakes=stakes, seats=seats, joined_at=self.clock(), sid=sid)
+        heapq.heappush(self._queues.setdefault(ticket.key, []), (ticket.joined_at, next(self._seq), ticket))
+        self._waiting[ticket.key] = self._waiting.get(ticket.key, 0) + 1
+        self._tickets[ticket.id] = ticket
+        return ticket
+
+    def cancel(self, ticket_id: str) -> bool:
+        ticket = self._tickets.pop(ticket_id, None)
+        if ticket is None:
+            return False
+        ticket.cancelled = True
+        self._waiting[ticket.key] -= 1
+        return True
+
+    def _head(self, key: QueueKey) -> Optional[Ticket]:
+        queue = self._queues[key]
+        while queue and queue[0][2].cancelled:
+            heapq.heappop(queue)
+        return queue[0][2] if queue else None
+
+    def _pop(self, key: QueueKey, count: int) -> List[Ticket]:
+        tickets = []
+        while len(tickets) < count and self._head(key) is not None:
+            ticket = heapq.heappop(self._queues[key])[2]
+            del self._tickets[ticket.id]
+            tickets.append(ticket)
+        self._waiting[key] -= len(tickets)
+        return tickets
+
+    def match(self) -> List[Match]:
+        """Pops every table that can be seated now: full ones first, then bot-filled ones for stale queues."""
+        now = self.clock()
+        matches = []
+        for key, waiting in self._waiting.items():
+            stakes, seats = key
+            for _ in range(waiting // seats):
+                matches.append(Match(stakes, seats, self._pop(key, seats)))
+            head = self._head(key)
+            if head is not None and now - head.joined_at >= self.fill_after:
+                matches.append(Match(stakes, seats, self._pop(key, seats)))
+        self.tables_created += len(matches)
+        return matches
+
+    def state(self) -> Dict[str, object]:
+        now = self.clock()
+        queues = []
+        for (stakes, seats), waiting in sorted(self._waiting.items()):
+            if waiting:
+                head = self._head((stakes, seats))
+                queues.append({"stakes": stakes, "seats": seats, "waiting": waiting,
+                               "longestWait": round(now - head.joined_at, 1)})
+        return {"waiting": len(self._tickets), "tablesCreated": self.tables_created, "queues": queues}
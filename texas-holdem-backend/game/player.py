@@ -13,6 +13,9 @@ class Player:
     is_folded: bool = False
     is_all_in: bool = False
     last_action: Optional[str] = None
+    ai_backend: str = "gemini"
+    # Chips put into the pot this hand, across all streets (sets the side pots this seat can win)
+    committed: int = 0
 
     def bet(self, amount: int) -> int:
         """
@@ -22,6 +25,7 @@ class Player:
         actual_bet = min(self.chips, amount)
         self.chips -= actual_bet
         self.current_bet += actual_bet
+        self.committed += actual_bet
 
         if self.chips == 0:
             self.is_all_in = True
@@ -39,6 +43,7 @@ class Player:
     def reset_hand_state(self) -> None:
         self.hand = []
         self.current_bet = 0
+        self.committed = 0
         self.is_folded = False
         self.is_all_in = False
         self.last_action = None
@@ -0,0 +1,240 @@
+"""
+Range-vs-range equity.
+
+Ranges use standard notation ("QQ+,AKs,KQo,A5s-A2s,AhKh") with optional
+weights ("AKo:0.5"). Equity is enumerated exactly when the number of run-outs
+times combo assignments is small, and sampled otherwise, optionally across a
+spawn process pool. Results are memoized by canonical range and board.
+"""
+import itertools
+import math
+import multiprocessing
+import os
+import random
+from concurrent.futures import ProcessPoolExecutor
+from contextvars import ContextVar
+from functools import lru_cache
+from typing import Dict, List, Optional, Sequence, Tuple, Union
+
+from .card import Card
+from .deck import FULL_DECK
+from .hand_evaluator import BoardEvaluator
+
+Combo = Tuple[int, int]
+Range = Dict[Combo, float]
+CanonicalRange = Tuple[Tuple[Combo, float], ...]
+
+RANK_CHARS = "23456789TJQKA"
+EXACT_LIMIT = 200_000
+DEFAULT_SAMPLES = 20_000
+# Sampling is split into chunks of this size whatever the worker count, so a seed gives the same answer
+# on any number of processes and the memo does not need to know how many ran
+SAMPLES_PER_CHUNK = 5_000
+
+_pool: Optional[ProcessPoolExecutor] = None
+_pool_size = 0
+# Worker count for the computation running in this context; set by range_equity() around the memoized call
+_processes: ContextVar[int] = ContextVar("processes", default=1)
+
+def _rank(char: str) -> int:
+    index = RANK_CHARS.find(char.upper())
+    if index < 0:
+        raise ValueError(f"Invalid rank: {char}")
+    return index + 2
+
+def _code(rank: int, suit: int) -> int:
+    return (suit - 1) * 13 + (rank - 2)
+
+def _combo(a: int, b: int) -> Combo:
+    return (a, b) if a < b else (b, a)
+
+def _hand_combos(hi: int, lo: int, kind: str) -> List[Combo]:
+    """All combos of a hand class; kind is 's', 'o' or '' (both)."""
+    combos = []
+    for s1 in range(1, 5):
+        for s2 in range(1, 5):
+            if hi == lo and s2 <= s1:
+                continue
+            if hi != lo and ((kind == "s" and s1 != s2) or (kind == "o" and s1 == s2)):
+                continue
+            combos.append(_combo(_code(hi, s1), _code(lo, s2)))
+    return combos
+
+def _parse_class(token: str) -> Tuple[int, int, str]:
+    if len(token) not in (2, 3) or (len(token) == 3 and token[2].lower() not in "so"):
+        raise ValueError(f"Invalid hand class: {token}")
+    a, b = _rank(token[0]), _rank(token[1])
+    kind = token[2].lower() if len(token) == 3 else ""
+    if a == b and kind:
+        raise ValueError(f"Pairs cannot be suited or offsuit: {token}")
+    return max(a, b), min(a, b), kind
+
+def _expand(token: str) -> List[Combo]:
+    if len(token) == 4 and token[1].lower() in "shdc" and token[3].lower() in "shdc":
+        a, b = Card.from_str(token[:2]).to_int(), Card.from_str(token[2:]).to_int()
+        if a == b:
+            raise ValueError(f"Duplicate card in combo: {token}")
+        return [_combo(a, b)]
+
+    if "-" in token:
+        start, end = token.split("-", 1)
+        hi1, lo1, kind1 = _parse_class(start)
+        hi2, lo2, kind2 = _parse_class(end)
+        if kind1 != kind2 or (hi1 == lo1) != (hi2 == lo2) or (hi1 != lo1 and hi1 != hi2):
+            raise ValueError(f"Invalid range: {token}")
+        if hi1 == lo1:
+            return [c for r in range(min(hi1, hi2), max(hi1, hi2) + 1) for c in _hand_combos(r, r, "")]
+        return [c for lo in range(min(lo1, lo2), max(lo1, lo2) + 1) for c in _hand_combos(hi1, lo, kind1)]
+
+    if token.endswith("+"):
+        hi, lo, kind = _parse_class(token[:-1])
+        if hi == lo:
+            return [c for r in range(hi, 15) for c in _hand_combos(r, r, "")]
+        return [c for k in range(lo, hi) for c in _hand_combos(hi, k, kind)]
+
+    hi, lo, kind = _parse_class(token)
+    return _hand_combos(hi, lo, kind)
+
+def parse_range(text: str) -> Range:
+    """Parses comma-separated range notation; a later token overrides an earlier weight."""
+    combos: Range = {}
+    for raw in text.split(","):
+        token = raw.strip()
+        if not token:
+            continue
+        weight = 1.0
+        if ":" in token:
+            token, weight_text = token.split(":", 1)
+            weight = float(weight_text)
+            if not 0.0 <= weight <= 1.0:
+                raise ValueError(f"Weight out of range: {raw}")
+        for combo in _expand(token.strip()):
+            combos[combo] = weight
+    return {c: w for c, w in combos.items() if w > 0}
+
+def canonical(hand_range: Union[str, Range]) -> CanonicalRange:
+    if isinstance(hand_range, str):
+        hand_range = parse_range(hand_range)
+    return tuple(sorted(hand_range.items()))
+
+def _showdown(board: BoardEvaluator, hands: Sequence[Combo]) -> List[float]:
+    scores = [board.evaluate((FULL_DECK[a], FULL_DECK[b])) for a, b in hands]
+    best = max(scores)
+    winners = [i for i, s in enumerate(scores) if s == best]
+    shares = [0.0] * len(hands)
+    for i in winners:
+        shares[i] = 1.0 / len(winners)
+    return shares
+
+def _enumerate(ranges: Tuple[CanonicalRange, ...], board: Tuple[int, ...]) -> List[float]:
+    dead = set(board)
+    live = [c for c in range(52) if c not in dead]
+    totals = [0.0] * len(ranges)
+    weight_sum = 0.0
+
+    for runout in itertools.combinations(live, 5 - len(board)):
+        used = dead.union(runout)
+        evaluator = BoardEvaluator([FULL_DECK[c] for c in board + runout])
+        # Score every live combo once per run-out, then walk the assignments
+        scored = []
+        for hand_range in ranges:
+            options = [(combo, w, evaluator.evaluate((FULL_DECK[combo[0]], FULL_DECK[combo[1]])))
+                       for combo, w in hand_range if combo[0] not in used and combo[1] not in used]
+            scored.append(options)
+
+        for assignment in itertools.product(*scored):
+            cards = [c for combo, _, _ in assignment for c in combo]
+            if len(set(cards)) != len(cards):
+                continue
+            weight = math.prod(w for _, w, _ in assignment)
+            best = max(score for _, _, score in assignment)
+            winners = [i for i, (_, _, score) in enumerate(assignment) if score == best]
+            for i in winners:
+                totals[i] += weight / len(winners)
+            weight_sum += weight
+
+    return [t / weight_sum for t in totals] if weight_sum else [0.0] * len(ranges)
+
+def sample_equity(ranges: Tuple[CanonicalRange, ...], board: Tuple[int, ...], samples: int,
+                  seed: Optional[int] = None) -> Tuple[List[float], int]:
+    """Summed pot shares over `samples` run-outs; returns (sums, accepted samples)."""
+    rng = random.Random(seed)
+    combos = [[c for c, _ in r] for r in ranges]
+    weights = [list(itertools.accumulate(w for _, w in r)) for r in ranges]
+    dead = set(board)
+    totals = [0.0] * len(ranges)
+    accepted = 0
+
+    for _ in range(samples):
+        # Card removal: redraw the assignment until no two players (or the board) share a card
+        for _attempt in range(100):
+            hands = [rng.choices(c, cum_weights=w)[0] for c, w in zip(combos, weights)]
+            cards = [x for h in hands for x in h]
+            if len(set(cards)) == len(cards) and dead.isdisjoint(cards):
+                break
+        else:
+            continue
+        used = dead.union(cards)
+        live = [c for c in range(52) if c not in used]
+        runout = rng.sample(live, 5 - len(board))
+        evaluator = BoardEvaluator([FULL_DECK[c] for c in board + tuple(runout)])
+        for i, share in enumerate(_showdown(evaluator, hands)):
+            totals[i] += share
+        accepted += 1
+    return totals, accepted
+
+def _enumeration_cost(ranges: Tuple[CanonicalRange, ...], board: Tuple[int, ...]) -> int:
+    runouts = math.comb(52 - len(board) - 2 * len(ranges), 5 - len(board))
+    return runouts * math.prod(len(r) for r in ranges)
+
+def _get_pool(workers: int) -> ProcessPoolExecutor:
+    global _pool, _pool_size
+    if _pool is None or _pool_size != workers:
+        if _pool is not None:
+            _pool.shutdown(wait=False, cancel_futures=True)
+        _pool = ProcessPoolExecutor(workers, mp_context=multiprocessing.get_context("spawn"))
+        _pool_size = workers
+    return _pool
+
+@lru_cache(maxsize=1024)
+def _cached_equity(ranges: Tuple[CanonicalRange, ...], board: Tuple[int, ...], samples: int,
+                   exact_limit: int, seed: Optional[int]) -> Tuple[float, ...]:
+    if _enumeration_cost(ranges, board) <= exact_limit:
+        return tuple(_enumerate(ranges, board))
+
+    rng = random.Random(seed)
+    chunks = max(1, samples // SAMPLES_PER_CHUNK)
+    sizes = [samples // chunks + (1 if i < samples % chunks else 0) for i in range(chunks)]
+    seeds = [rng.getrandbits(32) for _ in sizes]
+    processes = min(_processes.get(), chunks)
+    if processes > 1:
+        pool = _get_pool(processes)
+        results = list(pool.map(sample_equity, [ranges] * chunks, [board] * chunks, sizes, seeds))
+    else:
+        results = [sample_equity(ranges, board, size, chunk_seed) for size, chunk_seed in zip(sizes, seeds)]
+
+    totals = [sum(r[0][i] for r in results) for i in range(len(ranges))]
+    accepted = sum(r[1] for r in results)
+    return tuple(t / accepted for t in totals) if accepted else tuple(0.0 for _ in ranges)
+
+def range_equity(ranges: Sequence[Union[str, Range]], board: Sequence[Card] = (),
+                 samples: int = DEFAULT_SAMPLES, exact_limit: int = EXACT_LIMIT,
+                 processes: Optional[int] = None, seed: Optional[int] = None) -> List[float]:
+    """
+    Pot share of each range (summing to 1) on `board`. Enumerates exactly when
+    run-outs x combo assignments <= `exact_limit`, otherwise samples `samples`
+    run-outs over `processes` workers. Memoized by canonical ranges and board.
+    """
+    if len(ranges) < 2:
+        raise ValueError("Need at least two ranges")
+    canon = tuple(canonical(r) for r in ranges)
+    if any(not r for r in canon):
+        raise ValueError("Empty range")
+    board_codes = tuple(sorted(c.to_int() for c in board))
+    if len(board_codes) > 5:
+        raise ValueError("Board has more than five cards")
+    token = _processes.set(processes or os.cpu_count() or 1)
+    try:
+        return list(_cached_equity(canon, board_codes, samples, exact_limit, seed))
+    finally:
+        _processes.reset(token)
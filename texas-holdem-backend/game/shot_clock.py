@@ -0,0 +1,129 @@
+"""
+Decision clocks for every table, all driven by one TimerWheel.
+
+Whoever is to act gets `action_time` seconds. When that runs out, the seat's
+time bank starts. Each seat's bank lasts the whole session and shrinks by
+whatever part of it the seat uses. When the bank is also gone, the seat
+checks if it can and folds otherwise.
+
+The server calls sync() after every change to a table. That cancels the
+previous turn's timer and arms one for the current turn, both O(1).
+Countdown events go to `on_event`, and the server pushes them to the
+table's clients. The phase is "action" when a turn starts, "timeBank"
+when the bank takes over, and "expired" after the automatic move. An
+"expired" event means the table changed, so the server broadcasts it.
+"""
+import os
+from typing import Callable, Dict, List, Optional
+
+from .engine import GameEngine
+from .timer_wheel import Timer, TimerWheel
+
+ACTION_TIME = float(os.getenv("ACTION_TIME", "20"))
+TIME_BANK = float(os.getenv("TIME_BANK", "30"))
+
+ClockEvent = Dict[str, object]
+
+def turn_key(game: GameEngine) -> tuple:
+    """Changes whenever the table moves to a new decision."""
+    return (game.hand_no, game.stage, game.active_player_id, game.pot)
+
+class Turn:
+    __slots__ = ("game", "seat", "key", "deadline", "in_bank", "bank_started", "timer")
+
+    def __init__(self, game: GameEngine, seat: int, key: tuple, deadline: float):
+        self.game = game
+        self.seat = seat
+        self.key = key
+        self.deadline = deadline
+        self.in_bank = False
+        self.bank_started = 0.0
+        self.timer: Optional[Timer] = None
+
+class ShotClock:
+    def __init__(self, wheel: TimerWheel, on_event: Callable[[GameEngine, ClockEvent], None],
+                 action_time: float = ACTION_TIME, time_bank: float = TIME_BANK):
+        self.wheel = wheel
+        self.on_event = on_event
+        self.action_time = action_time
+        self.time_bank = time_bank
+        self._turns: Dict[str, Turn] = {}
+        self._banks: Dict[str, List[float]] = {}
+
+    def __len__(self) -> int:
+        return len(self._turns)
+
+    def bank(self, game: GameEngine, seat: int) -> float:
+        banks = self._banks.get(game.id)
+        return banks[seat] if banks else self.time_bank
+
+    def sync(self, game: GameEngine) -> Optional[ClockEvent]:
+        """Arms the clock for the seat to act in `game` and reports the new countdown; None if the turn is unchanged."""
+        key = turn_key(game)
+        turn = self._turns.get(game.id)
+        if turn is not None:
+            if turn.key == key:
+                return None
+            self._stop(turn)
+        if game.stage in ("SHOWDOWN", "HAND_OVER") or game.active_player_id == -1:
+            return None
+
+        turn = Turn(game, game.active_player_id, key, self.wheel.clock() + self.action_time)
+        turn.timer = self.wheel.schedule(self.action_time, self._expire, turn)
+        self._turns[game.id] = turn
+        event = self._event(turn, "action")
+        self.on_event(game, event)
+        return event
+
+    def state(self, game: GameEngine) -> Optional[ClockEvent]:
+        """The running countdown of `game`, for clients that join mid-turn."""
+        turn = self._turns.get(game.id)
+        if turn is None:
+            return None
+        return self._event(turn, "timeBank" if turn.in_bank else "action")
+
+    def _stop(self, turn: Turn) -> None:
+        turn.timer.cancel()
+        if turn.in_bank:
+            banks = self._seat_banks(turn.game)
+            banks[turn.seat] = max(0.0, banks[turn.seat] - (self.wheel.clock() - turn.bank_started))
+        del self._turns[turn.game.id]
+
+    def _seat_banks(self, game: GameEngine) -> List[float]:
+        banks = self._banks.get(game.id)
+        if banks is None:
+            banks = self._banks[game.id] = [self.time_bank] * len(game.players)
+        return banks
+
+    def _event(self, turn: Turn, phase: str, action: Optional[str] = None) -> ClockEvent:
+        event: ClockEvent = {
+            "gameId": turn.game.id,
+            "playerId": turn.seat,
+            "phase": phase,
+            "seconds": round(max(0.0, turn.deadline - self.wheel.clock()), 1),
+            "timeBank": round(self.bank(turn.game, turn.seat), 1),
+        }
+        if action:
+            event["action"] = action
+        return event
+
+    def _expire(self, turn: Turn) -> None:
+        game = turn.game
+        with game.lock:
+            if self._turns.get(game.id) is not turn or turn_key(game) != turn.key:
+                return  # the seat acted; the next sync() retires this turn
+            bank = self.bank(game, turn.seat)
+            if not turn.in_bank and bank > 0:
+                turn.in_bank = True
+                turn.bank_started = self.wheel.clock()
+                turn.deadline = turn.bank_started + bank
+                turn.timer = self.wheel.schedule(bank, self._expire, turn)
+                self.on_event(game, self._event(turn, "timeBank"))
+                return
+
+            self._seat_banks(game)[turn.seat] = 0.0
+            del self._turns[game.id]
+            player = game.players[turn.seat]
+            action = "check" if player.current_bet >= game.bet_to_call else "fold"
+            game.process_player_action(turn.seat, action)
+            self.on_event(game, self._event(turn, "expired", action))
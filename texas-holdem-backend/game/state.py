@@ -0,0 +1,64 @@
+"""
+Immutable table state for search. Snapshots share Card objects and never
+hold locks, so branching is a handful of tuple allocations.
+"""
+from typing import List, NamedTuple, Optional, Tuple
+from .card import Card
+
+class SeatState(NamedTuple):
+    id: int
+    name: str
+    chips: int
+    is_human: bool
+    hand: Tuple[Card, ...]
+    current_bet: int
+    is_folded: bool
+    is_all_in: bool
+    last_action: Optional[str]
+    committed: int = 0
+
+class TableState(NamedTuple):
+    seats: Tuple[SeatState, ...]
+    deck: Tuple[Card, ...]
+    community_cards: Tuple[Card, ...]
+    pot: int
+    small_blind: int
+    big_blind: int
+    hand_no: int
+    dealer_pos: int
+    active_player_id: int
+    bet_to_call: int
+    stage: str
+    winners: Tuple[int, ...]
+    payouts: Tuple[Tuple[int, int], ...]
+    refunds: Tuple[Tuple[int, int], ...] = ()
+
+def is_terminal(state: TableState) -> bool:
+    return state.stage in ("HAND_OVER", "SHOWDOWN") or state.active_player_id == -1
+
+def legal_actions(state: TableState) -> List[Tuple[str, int]]:
+    """
+    Actions for the seat to act as (action, amount) pairs in engine terms;
+    raise amounts are the new total bet: a min-raise, a pot-sized raise and all-in.
+    """
+    if is_terminal(state):
+        return []
+    seat = state.seats[state.active_player_id]
+    to_call = state.bet_to_call - seat.current_bet
+    actions: List[Tuple[str, int]] = []
+
+    if to_call > 0:
+        actions.append(("fold", 0))
+        actions.append(("call", 0))
+    else:
+        actions.append(("check", 0))
+
+    max_total = seat.current_bet + seat.chips
+    if max_total > state.bet_to_call:
+        targets = {
+            min(state.bet_to_call + state.big_blind, max_total),
+            min(state.bet_to_call + state.pot + to_call, max_total),
+            max_total,
+        }
+        actions.extend(("raise", t) for t in sorted(targets))
+    return actions
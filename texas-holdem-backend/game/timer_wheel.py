@@ -0,0 +1,118 @@
+"""
+Hierarchical hashed timer wheel.
+
+Every timer in the process shares one wheel instead of owning a sleeping
+green thread or task. Time is cut into ticks of `tick` seconds. Level 0
+holds one slot per tick for the next `slots` ticks. Each higher level
+covers `slots` times the span of the level below, one slot per revolution
+of that lower level. Timers far in the future wait in a coarse slot and are
+cascaded down one level each time the lower wheel wraps. Arming and
+cancelling are O(1) because a slot is a dict the timer removes itself from.
+A tick fires only the timers due on it, plus the amortised cascades.
+
+The owner calls advance() at least once per tick, e.g. from a loop that
+sleeps `tick` seconds between calls.
+"""
+import logging
+import math
+import time
+from typing import Any, Callable, Dict, List, Optional
+
+logger = logging.getLogger('poker.timers')
+
+class Timer:
+    __slots__ = ("due", "callback", "args", "_wheel", "_slot")
+
+    def __init__(self, wheel: "TimerWheel", due: int, callback: Callable[..., Any], args: tuple):
+        self.due = due  # absolute tick
+        self.callback = callback
+        self.args = args
+        self._wheel = wheel
+        self._slot: Optional[Dict["Timer", None]] = None
+
+    @property
+    def active(self) -> bool:
+        return self._slot is not None
+
+    def cancel(self) -> bool:
+        """Removes the timer; False if it already fired or was cancelled."""
+        if self._slot is None:
+            return False
+        del self._slot[self]
+        self._slot = None
+        self._wheel._count -= 1
+        return True
+
+class TimerWheel:
+    def __init__(self, tick: float = 0.1, slots: int = 256, levels: int = 3,
+                 clock: Callable[[], float] = time.monotonic):
+        if slots & (slots - 1):
+            raise ValueError("slots must be a power of two")
+        self.tick = tick
+        self.clock = clock
+        self._bits = slots.bit_length() - 1
+        self._mask = slots - 1
+        self._levels = levels
+        self._wheels: List[List[Dict[Timer, None]]] = [[{} for _ in range(slots)] for _ in range(levels)]
+        self._start = clock()
+        self._now = 0  # last tick processed
+        self._count = 0
+
+    def __len__(self) -> int:
+        return self._count
+
+    def _tick_at(self, t: float) -> int:
+        return int((t - self._start) / self.tick)
+
+    def schedule(self, delay: float, callback: Callable[..., Any], *args: Any) -> Timer:
+        """Calls callback(*args) from advance() once `delay` seconds have passed (rounded up to a tick)."""
+        due = math.ceil((self.clock() + delay - self._start) / self.tick)
+        timer = Timer(self, max(due, self._now + 1), callback, args)
+        self._place(timer)
+        self._count += 1
+        return timer
+
+    def _place(self, timer: Timer) -> None:
+        # The level is the highest tick digit in which `due` differs from now; digits below it pick the slot
+        diff = timer.due ^ self._now
+        level = 0
+        while level < self._levels - 1 and diff >> (self._bits * (level + 1)):
+            level += 1
+        slot = self._wheels[level][(timer.due >> (self._bits * level)) & self._mask]
+        slot[timer] = None
+        timer._slot = slot
+
+    def _cascade(self, level: int) -> None:
+        wheel = self._wheels[level]
+        index = (self._now >> (self._bits * level)) & self._mask
+        if not wheel[index]:
+            return
+        timers, wheel[index] = wheel[index], {}
+        for timer in timers:
+            self._place(timer)
+
+    def advance(self, now: Optional[float] = None) -> int:
+        """Fires every timer due by `now` (default: the clock) in due order; returns how many fired."""
+        target = self._tick_at(self.clock() if now is None else now)
+        fired = 0
+        while self._now < target:
+            self._now += 1
+            # Lower wheel wrapped: pull the next coarse slot down, highest level first
+            for level in range(self._levels - 1, 0, -1):
+                if not self._now & ((1 << (self._bits * level)) - 1):
+                    self._cascade(level)
+            slot = self._wheels[0][self._now & self._mask]
+            if not slot:
+                continue
+            self._wheels[0][self._now & self._mask] = {}
+            for timer in list(slot):
+                if timer._slot is not slot:
+                    continue  # cancelled by an earlier callback on this tick
+                timer._slot = None
+                self._count -= 1
+                fired += 1
+                try:
+                    timer.callback(*timer.args)
+                except Exception as e:
+                    logger.error(f"Timer callback {getattr(timer.callback, '__name__', timer.callback)} failed: {e}")
+        return fired
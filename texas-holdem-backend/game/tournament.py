@@ -0,0 +1,284 @@
+"""
+Multi-table tournaments over GameEngine tables.
+
+Every table is a row of one BatchTables, so a vectorised policy decides for
+all tables in a single call per step. Seats are balanced as players bust:
+table sizes live in a lazy-deletion min-heap, so finding the table to move
+a player to (or to break) is O(log tables) instead of a scan. Players only
+change tables between hands; a moved player waits as "incoming" until the
+destination deals its next hand.
+"""
+import heapq
+import math
+import random
+from dataclasses import dataclass, field
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from .batch import BatchTables
+from .engine import GameEngine
+from .icm import icm_batch
+from .player import Player
+
+BlindLevel = Tuple[int, int]
+# Finishing orders sampled for standings ICM once the field is too big to solve exactly
+STANDINGS_ICM_SAMPLES = 1000
+Policy = Callable[[BatchTables, np.random.Generator], Tuple[np.ndarray, np.ndarray]]
+
+DEFAULT_SCHEDULE: List[BlindLevel] = [
+    (10, 20), (15, 30), (25, 50), (50, 100), (75, 150), (100, 200), (150, 300),
+    (200, 400), (300, 600), (400, 800), (500, 1000), (750, 1500), (1000, 2000),
+    (1500, 3000), (2000, 4000), (3000, 6000), (5000, 10000),
+]
+
+@dataclass
+class Entrant:
+    id: int
+    name: str
+    chips: int
+    table_id: Optional[int] = None
+    finish: Optional[int] = None
+
+@dataclass
+class TournamentTable:
+    id: int
+    seated: List[Entrant] = field(default_factory=list)
+    incoming: List[Entrant] = field(default_factory=list)
+    engine: Optional[GameEngine] = None
+    in_hand: bool = False
+    breaking: bool = False
+    closed: bool = False
+
+    @property
+    def size(self) -> int:
+        return len(self.seated) + len(self.incoming)
+
+class Tournament:
+    def __init__(self, names: Sequence[str], seats: int = 9, stack: int = 1500,
+                 schedule: Optional[List[BlindLevel]] = None, hands_per_level: int = 10,
+                 payouts: Optional[Sequence[float]] = None, seed: Optional[int] = None):
+        if len(names) < 2:
+            raise ValueError("A tournament needs at least two entrants")
+        if seats < 3:
+            raise ValueError("Tables need at least three seats")
+        self.seats = seats
+        self.schedule = schedule or DEFAULT_SCHEDULE
+        self.hands_per_level = hands_per_level
+        self.payouts = list(payouts or [])
+        self.rng = np.random.default_rng(seed)
+        self.entrants = [Entrant(id=i, name=name, chips=stack) for i, name in enumerate(names)]
+        self.alive = len(self.entrants)
+        self._closed = 0
+        self._breaking_count = 0
+        self.hands_played = 0
+        self.level = 0
+        self._level_clock = 0.0
+
+        n_tables = math.ceil(len(self.entrants) / seats)
+        self.tables = [TournamentTable(id=t) for t in range(n_tables)]
+        order = list(self.entrants)
+        random.Random(seed).shuffle(order)
+        for i, entrant in enumerate(order):
+            self._seat(self.tables[i % n_tables], entrant)
+
+        self._small: List[Tuple[int, int]] = []
+        for table in self.tables:
+            self._push(table)
+
+        for table in self.tables:
+            self._deal(table)
+        self.batch = BatchTables([t.engine for t in self.tables], seats)
+        self._in_hand = np.array([t.in_hand for t in self.tables], dtype=bool)
+        # Tables between hands; only these are looked at when dealing
+        self._idle = {t.id for t in self.tables if not t.in_hand}
+
+    # --- table-size heap (entries go stale when a table changes; skipped on pop) ---
+
+    def _push(self, table: TournamentTable) -> None:
+        heapq.heappush(self._small, (table.size, table.id))
+
+    def _valid(self, size: int, table_id: int) -> bool:
+        table = self.tables[table_id]
+        return not table.closed and not table.breaking and table.size == size
+
+    def _smallest(self, exclude: int = -1) -> Optional[TournamentTable]:
+        skipped = []
+        found = None
+        while self._small:
+            size, table_id = self._small[0]
+            if not self._valid(size, table_id):
+                heapq.heappop(self._small)
+            elif table_id == exclude:
+                skipped.append(heapq.heappop(self._small))
+            else:
+                found = self.tables[table_id]
+                break
+        for entry in skipped:
+            heapq.heappush(self._small, entry)
+        return found
+
+    @property
+    def open_tables(self) -> int:
+        return len(self.tables) - self._closed
+
+    # --- seating ---
+
+    def _seat(self, table: TournamentTable, entrant: Entrant) -> None:
+        entrant.table_id = table.id
+        table.incoming.append(entrant)
+
+    def _move(self, source: TournamentTable, dest: TournamentTable) -> None:
+        entrant = source.incoming.pop() if source.incoming else source.seated.pop()
+        self._seat(dest, entrant)
+        self._push(source)
+        self._push(dest)
+
+    def blinds(self) -> BlindLevel:
+        """Blinds for the current level; past the end of the schedule they keep doubling."""
+        last = len(self.schedule) - 1
+        small, big = self.schedule[min(self.level, last)]
+        factor = 2 ** max(0, self.level - last)
+        return small * factor, big * factor
+
+    def _deal(self, table: TournamentTable) -> None:
+        table.seated.extend(table.incoming)
+        table.incoming.clear()
+        if len(table.seated) < 2 or table.closed:
+            table.in_hand = False
+            return
+
+        players = [Player(id=i, name=e.name, chips=e.chips) for i, e in enumerate(table.seated)]
+        small, big = self.blinds()
+        if table.engine is None:
+            table.engine = GameEngine(players, small_blind=small, big_blind=big,
+                                      seed=int(self.rng.integers(2**32)))
+        else:
+            table.engine.players = players
+            table.engine.small_blind, table.engine.big_blind = small, big
+            table.engine.start_new_hand()
+        table.in_hand = True
+
+    def _finish_hand(self, table: TournamentTable) -> List[Entrant]:
+        """Syncs chips back, records bust-outs and rebalances; returns the busted entrants."""
+        table.in_hand = False
+        self.hands_played += 1
+        # Blinds rise once every table has played hands_per_level hands on average
+        self._level_clock += 1.0 / self.open_tables
+        self.level = int(self._level_clock // self.hands_per_level)
+
+        busted = []
+        # Players busting on the same hand place by the stack they started it with, bigger stack higher
+        started = {e.id: e.chips for e in table.seated}
+        for entrant, player in zip(table.seated, table.engine.players):
+            entrant.chips = player.chips
+        for entrant in sorted((e for e in table.seated if e.chips == 0), key=lambda e: (started[e.id], e.id)):
+            entrant.finish = self.alive
+            self.alive -= 1
+            busted.append(entrant)
+        if busted:
+            table.seated = [e for e in table.seated if e.chips > 0]
+            self._push(table)
+        self._rebalance(table)
+        return busted
+
+    def _rebalance(self, table: TournamentTable) -> None:
+        # Break a table once the others can absorb its players
+        open_tables = self.open_tables - self._breaking_count
+        if open_tables > 1 and self.alive <= (open_tables - 1) * self.seats:
+            victim = self._smallest()
+            if victim is not None:
+                victim.breaking = True
+                self._breaking_count += 1
+
+        if table.breaking:
+            while table.size:
+                dest = self._smallest(exclude=table.id)
+                if dest is None:
+                    break
+                entrant = table.incoming.pop() if table.incoming else table.seated.pop()
+                self._seat(dest, entrant)
+                self._push(dest)
+            if not table.size:
+                table.breaking = False
+                table.closed = True
+                self._breaking_count -= 1
+                self._closed += 1
+                self._idle.discard(table.id)
+            return
+
+        while True:
+            smallest = self._smallest(exclude=table.id)
+            if smallest is None or table.size <= smallest.size + 1:
+                break
+            self._move(table, smallest)
+
+    # --- driving ---
+
+    @property
+    def finished(self) -> bool:
+        return self.alive <= 1
+
+    def step(self, policy: Policy) -> int:
+        """One decision on every table waiting on a bot; returns the number of bust-outs."""
+        actions, amounts = policy(self.batch, self.rng)
+        self.batch.apply(actions, amounts)
+
+        done = np.flatnonzero(self._in_hand & ~self.batch.waiting()).tolist()
+        busts = 0
+        for row in done:
+            busts += len(self._finish_hand(self.tables[row]))
+            self._idle.add(row)
+
+        dealt = []
+        for table_id in list(self._idle):
+            table = self.tables[table_id]
+            if table.breaking:
+                self._rebalance(table)
+            elif table.size >= 2:
+                self._deal(table)
+                dealt.append(table_id)
+                self._idle.discard(table_id)
+        for table_id in done + dealt:
+            self._in_hand[table_id] = self.tables[table_id].in_hand
+        self.batch.refresh(dealt)
+        return busts
+
+    def run(self, policy: Policy, max_steps: int = 10_000_000,
+            on_step: Optional[Callable[["Tournament", int], None]] = None) -> Optional[Entrant]:
+        for _ in range(max_steps):
+            if self.finished:
+                break
+            busts = self.step(policy)
+            if on_step:
+                on_step(self, busts)
+        return self.winner()
+
+    def winner(self) -> Optional[Entrant]:
+        if not self.finished:
+            return None
+        return next((e for e in self.entrants if e.finish is None), None)
+
+    def standings(self, limit: int = 10) -> Dict[str, object]:
+        alive = [e for e in self.entrants if e.finish is None]
+        leaders = heapq.nlargest(limit, alive, key=lambda e: e.chips)
+        small, big = self.blinds()
+        winner = self.winner()
+        equity: Dict[int, float] = {}
+        if self.payouts and alive:
+            # Only the top len(alive) places are still to be awarded
+            values = icm_batch([[e.chips for e in alive]], self.payouts[:len(alive)],
+                               samples=STANDINGS_ICM_SAMPLES)[0]
+            equity = {e.id: round(float(v), 2) for e, v in zip(alive, values)}
+        return {
+            "remaining": self.alive,
+            "entrants": len(self.entrants),
+            "tables": self.open_tables,
+            "handsPlayed": self.hands_played,
+            "level": self.level + 1,
+            "blinds": [small, big],
+            "averageStack": sum(e.chips for e in alive) // max(len(alive), 1),
+            "winner": winner.name if winner else None,
+            "leaders": [{"id": e.id, "name": e.name, "chips": e.chips, "table": e.table_id,
+                         "equity": equity.get(e.id)} for e in leaders],
+        }
@@ -0,0 +1,125 @@
+"""
+Server state and request handling that does not depend on the transport.
+
+The eventlet server (app.py) and the asyncio server (asgi_app.py) share the
+table registry, table construction and request validation defined here, and
+differ only in how they emit events and wait.
+"""
+import atexit
+import os
+import uuid
+from typing import TYPE_CHECKING, Optional
+
+from game.engine import GameEngine
+from game.player import Player
+from game.hand_history import HandHistoryWriter, HandRecorder
+from game.lobby import BUY_IN_BLINDS, STAKES, TABLE_SIZES
+from ai import registry
+from ai.opponent_model import OpponentModel
+
+if TYPE_CHECKING:
+    from game.tournament import Tournament
+
+BOT_NAMES = ("Viper", "Mountain", "Shark", "Falcon", "Cobra", "Raven", "Glacier", "Tiger")
+MAX_ENTRANTS = int(os.getenv("MAX_ENTRANTS", "10000"))
+MAX_BULK_TABLES = int(os.getenv("MAX_BULK_TABLES", "1000"))
+LOBBY_BOT_BACKEND = os.getenv("LOBBY_BOT_BACKEND", "gemini")
+
+games: dict[str, GameEngine] = {}
+opponent_models: dict[str, OpponentModel] = {}
+tournaments: dict[str, "Tournament"] = {}
+
+HAND_HISTORY_DIR = os.getenv("HAND_HISTORY_DIR")
+history_writer = HandHistoryWriter(HAND_HISTORY_DIR) if HAND_HISTORY_DIR else None
+if history_writer:
+    atexit.register(history_writer.close)
+
+def seat_room(game_id: str, player_id: int) -> str:
+    return f"{game_id}:{player_id}"
+
+def bot_to_act(game: GameEngine) -> bool:
+    return game.active_player_id != -1 and not game.players[game.active_player_id].is_human
+
+def new_table(humans: list[str], seats: int = 4, chips: int = 1000, blinds: tuple[int, int] = (10, 20),
+              backend: str = "gemini", backends: Optional[dict[int, str]] = None) -> GameEngine:
+    """Seats `humans` first and bots after them and registers the table; the caller starts the bots."""
+    players = [Player(id=i, name=name, chips=chips, is_human=True) for i, name in enumerate(humans)]
+    for seat in range(len(humans), seats):
+        players.append(Player(id=seat, name=BOT_NAMES[(seat - len(humans)) % len(BOT_NAMES)], chips=chips,
+                              ai_backend=(backends or {}).get(seat, backend)))
+
+    opponent_model = OpponentModel()
+    observers = [opponent_model]
+    if history_writer:
+        observers.append(HandRecorder(history_writer))
+    engine = GameEngine(players, small_blind=blinds[0], big_blind=blinds[1], observers=observers)
+    games[engine.id] = engine
+    opponent_models[engine.id] = opponent_model
+    return engine
+
+def equity_request(game: GameEngine, seat: int) -> tuple:
+    """(key, hole, board, opponents) for the equity stream of `seat`; an empty key means nothing to stream."""
+    human = game.players[seat]
+    if game.stage in ("SHOWDOWN", "HAND_OVER") or not human.hand or human.is_folded:
+        return (), [], [], 0
+    hole = list(human.hand)
+    board = list(game.community_cards)
+    opponents = sum(1 for p in game.players if p.id != seat and not p.is_folded)
+    key = (game.hand_no, tuple(c.to_int() for c in hole), tuple(c.to_int() for c in board), opponents)
+    return key, hole, board, opponents
+
+def human_seat(game: Optional[GameEngine], data: dict) -> Optional[int]:
+    """The human seat a socket message refers to (`playerId`, default 0), or None."""
+    seat = data.get('playerId', 0)
+    if game is None or not isinstance(seat, int) or not 0 <= seat < len(game.players):
+        return None
+    return seat if game.players[seat].is_human else None
+
+# --- request parsing; each raises ValueError with the message to return as a 400 ---
+
+def parse_game_request(data: dict) -> tuple[str, dict[int, str]]:
+    """(player name, {seat: backend}) for POST /api/game."""
+    # e.g. {"aiBackends": {"2": "mcts"}} swaps Mountain's Gemini brain for local search
+    backends = {}
+    for seat, backend in (data.get('aiBackends') or {}).items():
+        if backend not in registry.names() or not str(seat).isdigit() or not 1 <= int(seat) <= 3:
+            raise ValueError(f"Invalid AI backend for seat {seat}: {backend}")
+        backends[int(seat)] = backend
+    return data.get('playerName', 'Human'), backends
+
+def parse_tables_request(data: dict) -> dict:
+    """new_table() arguments (plus `count`) for POST /api/tables."""
+    stakes = data.get('stakes', 'low')
+    backend = data.get('aiBackend', LOBBY_BOT_BACKEND)
+    try:
+        count = int(data.get('count', 1))
+        seats = int(data.get('seats', 4))
+    except (TypeError, ValueError):
+        raise ValueError("count and seats must be integers") from None
+    if not 1 <= count <= MAX_BULK_TABLES or seats not in TABLE_SIZES or stakes not in STAKES or backend not in registry.names():
+        raise ValueError("Invalid table settings")
+    blinds = STAKES[stakes]
+    return {"count": count, "seats": seats, "chips": blinds[1] * BUY_IN_BLINDS, "blinds": blinds, "backend": backend}
+
+def new_tournament(data: dict) -> tuple[str, "Tournament"]:
+    """Validates a POST /api/tournament body and registers the tournament."""
+    # Tournaments pull in numpy; servers that never run one skip the import
+    from game.tournament import Tournament
+    try:
+        entrants = int(data.get('entrants', 100))
+        seats = int(data.get('seats', 9))
+        stack = int(data.get('stack', 1500))
+        hands_per_level = int(data.get('handsPerLevel', 10))
+        seed = None if data.get('seed') is None else int(data['seed'])
+        payouts = [float(p) for p in data.get('payouts') or []]
+    except (TypeError, ValueError):
+        raise ValueError("Tournament settings must be numbers") from None
+    if (not 2 <= entrants <= MAX_ENTRANTS or not 3 <= seats <= 10 or stack <= 0 or hands_per_level <= 0
+            or any(p < 0 for p in payouts)):
+        raise ValueError("Invalid tournament settings")
+
+    tournament = Tournament([f"Bot{i}" for i in range(entrants)], seats=seats, stack=stack,
+                            hands_per_level=hands_per_level, payouts=payouts, seed=seed)
+    tournament_id = str(uuid.uuid4())
+    tournaments[tournament_id] = tournament
+    return tournament_id, tournament
@@ -1,3 +1,4 @@
+import time
 import pytest
 from app import app
 from unittest.mock import patch
@@ -24,3 +25,201 @@ def test_create_game_api(mock_get_ai, client):
 def test_get_game_state_not_found(client):
     response = client.post('/api/game/nonexistent/next')
     assert response.status_code == 404
+
+def test_create_game_with_ai_backends(client):
+    response = client.post('/api/game', json={"playerName": "T", "aiBackends": {"2": "mcts", "3": "blueprint"}})
+    assert response.status_code == 200
+
+    from app import games
+    game = games[response.get_json()['gameId']]
+    assert [p.ai_backend for p in game.players[1:]] == ["gemini", "mcts", "blueprint"]
+
+def test_create_game_rejects_unknown_backend(client):
+    response = client.post('/api/game', json={"aiBackends": {"1": "oracle"}})
+    assert response.status_code == 400
+
+def _equity_events(sio_client, wait=1.0):
+    import eventlet
+    deadline = time.time() + wait
+    events = []
+    while time.time() < deadline:
+        eventlet.sleep(0.01)
+        events += [e['args'][0] for e in sio_client.get_received() if e['name'] == 'equity']
+        if events and events[-1]['done']:
+            break
+    return events
+
+def test_equity_streams_to_joined_client(client, monkeypatch):
+    import app as app_module
+    monkeypatch.setattr(app_module, "EQUITY_INTERVAL", 0)
+    monkeypatch.setattr(app_module, "EQUITY_BATCH", 500)
+    game_id = client.post('/api/game', json={"playerName": "T"}).get_json()['gameId']
+
+    sio_client = app_module.socketio.test_client(app_module.app)
+    sio_client.emit('join', {'gameId': game_id})
+    events = _equity_events(sio_client, wait=5.0)
+
+    assert events and events[-1]['done']
+    assert [e['samples'] for e in events] == sorted(e['samples'] for e in events)
+    assert 0.0 <= events[-1]['equity'] <= 1.0
+    assert 1 <= events[-1]['opponents'] <= 3
+    sio_client.disconnect()
+
+def test_equity_stream_is_cancelled_when_state_changes(client, monkeypatch):
+    import app as app_module
+    monkeypatch.setattr(app_module, "EQUITY_INTERVAL", 0.05)
+    game_id = client.post('/api/game', json={"playerName": "T"}).get_json()['gameId']
+    game = app_module.games[game_id]
+
+    sio_client = app_module.socketio.test_client(app_module.app)
+    sio_client.emit('join', {'gameId': game_id})
+    first_hand = game.hand_no
+    game.start_new_hand()
+    app_module.schedule_equity(game)
+    events = _equity_events(sio_client, wait=5.0)
+
+    stale = [e for e in events if e['handNo'] == first_hand]
+    assert len(stale) <= 1
+    assert events[-1]['handNo'] == game.hand_no and events[-1]['done']
+    sio_client.disconnect()
+
+def test_tournament_endpoints(client):
+    response = client.post('/api/tournament', json={"entrants": 12, "seats": 6, "seed": 1})
+    assert response.status_code == 200
+    data = response.get_json()
+    assert data["entrants"] == 12
+    assert data["tables"] == 2
+
+    assert client.get(f'/api/tournament/{data["id"]}').get_json()["entrants"] == 12
+    assert client.get('/api/tournament/missing').status_code == 404
+    assert client.post('/api/tournament', json={"entrants": 1}).status_code == 400
+    assert client.post('/api/tournament', json={"seats": "nine"}).status_code == 400
+
+def test_tournament_streams_standings(client):
+    import eventlet
+    import app as app_module
+    tournament_id = client.post('/api/tournament', json={"entrants": 6, "seats": 3, "seed": 2}).get_json()["id"]
+
+    sio_client = app_module.socketio.test_client(app_module.app)
+    sio_client.emit('join_tournament', {'tournamentId': tournament_id})
+    standings = []
+    deadline = time.time() + 10
+    while time.time() < deadline and not (standings and standings[-1]["winner"]):
+        eventlet.sleep(0.01)
+        standings += [e['args'][0] for e in sio_client.get_received() if e['name'] == 'standings']
+
+    assert standings[0]["entrants"] == 6
+    assert standings[-1]["remaining"] == 1
+    assert standings[-1]["winner"] is not None
+
+def _events(received, name):
+    return [e['args'][0] for e in received if e['name'] == name]
+
+def test_bulk_table_creation(client):
+    from app import games
+    response = client.post('/api/tables', json={"count": 5, "seats": 6, "stakes": "mid", "aiBackend": "blueprint"})
+    assert response.status_code == 200
+    ids = response.get_json()["gameIds"]
+    assert len(set(ids)) == 5
+    table = games[ids[0]]
+    assert len(table.players) == 6 and not any(p.is_human for p in table.players)
+    assert table.big_blind == 100
+
+    assert client.post('/api/tables', json={"count": 0}).status_code == 400
+    assert client.post('/api/tables', json={"seats": 5}).status_code == 400
+
+def test_lobby_seats_players_at_one_table(client):
+    import eventlet
+    import app as app_module
+    watcher = app_module.socketio.test_client(app_module.app)
+    watcher.emit('lobby_subscribe')
+    players = [app_module.socketio.test_client(app_module.app) for _ in range(2)]
+    for i, player in enumerate(players):
+        player.emit('lobby_join', {"playerName": f"P{i}", "stakes": "low", "seats": 2})
+    eventlet.sleep(0.05)
+
+    received = [player.get_received() for player in players]
+    seated = [_events(r, 'seated') for r in received]
+    assert all(len(events) == 1 for events in seated)
+    game_id = seated[0][0]["gameId"]
+    assert seated[1][0]["gameId"] == game_id
+    assert sorted(events[0]["playerId"] for events in seated) == [0, 1]
+
+    # Each player only sees their own hole cards
+    for r, events in zip(received, seated):
+        seat = events[0]["playerId"]
+        update = _events(r, 'update')[-1]
+        assert update["players"][seat]["hand"]
+        assert update["players"][1 - seat]["hand"] == ["BACK", "BACK"]
+        assert "BACK" not in update["players"][seat]["hand"]
+    assert any(state["waiting"] == 0 for state in _events(watcher.get_received(), 'lobby'))
+
+    for c in players + [watcher]:
+        c.disconnect()
+
+def test_lobby_fills_with_bots_and_cancels(client, monkeypatch):
+    import eventlet
+    import app as app_module
+    monkeypatch.setattr(app_module.lobby, "fill_after", 0.1)
+    monkeypatch.setattr(app_module, "LOBBY_INTERVAL", 0.05)
+    monkeypatch.setattr(app_module, "LOBBY_BOT_BACKEND", "blueprint")
+
+    leaver = app_module.socketio.test_client(app_module.app)
+    leaver.emit('lobby_join', {"stakes": "high", "seats": 6})
+    leaver.emit('lobby_leave')
+    assert _events(leaver.get_received(), 'left')[0]["cancelled"]
+
+    player = app_module.socketio.test_client(app_module.app)
+    player.emit('lobby_join', {"playerName": "Solo", "stakes": "high", "seats": 6})
+    deadline = time.time() + 5
+    seated = []
+    while time.time() < deadline and not seated:
+        eventlet.sleep(0.05)
+        seated = _events(player.get_received(), 'seated')
+
+    game = app_module.games[seated[0]["gameId"]]
+    assert [p.is_human for p in game.players] == [True] + [False] * 5
+    assert game.players[0].name == "Solo"
+    for c in (leaver, player):
+        c.disconnect()
+
+def test_health_reports_startup_times(client):
+    response = client.get('/api/health')
+    assert response.status_code == 200
+    data = response.get_json()
+    assert data['importMs'] > 0 and data['startupMs'] >= data['importMs']
+    assert set(data['aiBackends']) >= {"gemini", "mcts", "blueprint"}
+
+def test_create_app_builds_independent_apps():
+    import app as app_module
+    other = app_module.create_app({"TESTING": True})
+    assert other is not app
+    assert other.extensions['socketio'] is not app.extensions['socketio']
+    assert other.test_client().get('/api/health').status_code == 200
+
+    # Each app's clients keep getting their events from their own server
+    for flask_app in (app, other):
+        game_id = flask_app.test_client().post('/api/game', json={}).get_json()['gameId']
+        sio_client = flask_app.extensions['socketio'].test_client(flask_app)
+        sio_client.emit('join', {'gameId': game_id})
+        assert _events(sio_client.get_received(), 'update')
+        sio_client.disconnect()
+
+def test_shot_clock_acts_for_an_idle_human(client, monkeypatch):
+    import eventlet
+    import app as app_module
+    monkeypatch.setattr(app_module.shot_clock, "action_time", 0.2)
+    monkeypatch.setattr(app_module.shot_clock, "time_bank", 0.2)
+    game_id = client.post('/api/game', json={"aiBackends": {"1": "blueprint", "2": "blueprint", "3": "blueprint"}}).get_json()['gameId']
+
+    sio_client = app_module.socketio.test_client(app_module.app)
+    sio_client.emit('join', {'gameId': game_id})
+    clocks = []
+    deadline = time.time() + 5
+    while time.time() < deadline and not any(c["phase"] == "expired" for c in clocks):
+        eventlet.sleep(0.05)
+        clocks += _events(sio_client.get_received(), 'clock')
+
+    assert clocks[0]["playerId"] == 0 and clocks[0]["phase"] == "action"
+    assert [c["phase"] for c in clocks if c["playerId"] == 0][-2:] == ["timeBank", "expired"]
+    assert app_module.games[game_id].players[0].is_folded
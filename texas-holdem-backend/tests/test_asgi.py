@@ -0,0 +1,118 @@
+import asyncio
+import json
+import pytest
+import asgi_app
+from services import games, tournaments
+
+def _run(coro):
+    return asyncio.run(coro)
+
+async def _request(method, path, body=None):
+    messages = [{"type": "http.request", "body": json.dumps(body).encode() if body is not None else b""}]
+    sent = []
+
+    async def receive():
+        return messages.pop(0)
+
+    async def send(message):
+        sent.append(message)
+
+    await asgi_app.app({"type": "http", "method": method, "path": path, "headers": []}, receive, send)
+    start, body_message = sent
+    payload = body_message["body"]
+    return start["status"], json.loads(payload) if payload else None
+
+@pytest.fixture
+def emitted(monkeypatch):
+    events = []
+
+    async def emit(event, data=None, to=None, **kwargs):
+        events.append((event, data, to))
+
+    async def enter_room(sid, room, namespace=None):
+        pass
+
+    monkeypatch.setattr(asgi_app.sio, "emit", emit)
+    monkeypatch.setattr(asgi_app.sio, "enter_room", enter_room)
+    monkeypatch.setattr(asgi_app, "AI_MOVE_DELAY", 0)
+    monkeypatch.setattr(asgi_app, "EQUITY_INTERVAL", 0)
+    return events
+
+def test_rest_routes(emitted):
+    async def scenario():
+        status, game = await _request("POST", "/api/game", {"playerName": "Async", "aiBackends": {"2": "blueprint"}})
+        assert status == 200 and game["players"][0]["name"] == "Async"
+        assert games[game["gameId"]].players[2].ai_backend == "blueprint"
+
+        assert (await _request("POST", "/api/game", {"aiBackends": {"1": "oracle"}}))[0] == 400
+        assert (await _request("POST", "/api/game/missing/next"))[0] == 404
+        assert (await _request("GET", "/api/game"))[0] == 405
+        assert (await _request("GET", "/nowhere"))[0] == 404
+
+        status, health = await _request("GET", "/api/health")
+        assert status == 200 and health["startupMs"] >= health["importMs"] > 0
+        assert health["aiBackends"]["blueprint"] is not None  # loaded by the table above
+
+        status, tables = await _request("POST", "/api/tables", {"count": 3, "seats": 2, "aiBackend": "blueprint"})
+        assert status == 200 and len(tables["gameIds"]) == 3
+
+        status, created = await _request("POST", "/api/tournament", {"entrants": 6, "seats": 3, "seed": 1})
+        assert status == 200
+        status, standings = await _request("GET", f"/api/tournament/{created['id']}")
+        assert status == 200 and standings["entrants"] == 6
+        await asyncio.gather(*asgi_app.background_tasks)
+        assert tournaments[created["id"]].finished
+
+    _run(scenario())
+
+def test_socket_game_flow(emitted):
+    async def scenario():
+        _, game = await _request("POST", "/api/game", {"playerName": "A", "aiBackends": {"1": "blueprint", "2": "blueprint", "3": "blueprint"}})
+        engine = games[game["gameId"]]
+        await asyncio.gather(*asgi_app.background_tasks)
+        assert engine.active_player_id in (0, -1) or engine.stage == "HAND_OVER"
+
+        await asgi_app.on_join("sid-a", {"gameId": engine.id})
+        assert [event for event, _, to in emitted if to == "sid-a"][0] == "update"
+        if engine.active_player_id == 0:
+            assert emitted[-1][0] == "clock" and emitted[-1][1]["playerId"] == 0  # the running countdown
+        if engine.active_player_id == 0:
+            await asgi_app.on_action("sid-a", {"gameId": engine.id, "action": "fold"})
+            await asyncio.gather(*asgi_app.background_tasks)
+            assert engine.players[0].is_folded
+        assert any(event == "update" and to == f"{engine.id}:0" for event, _, to in emitted)
+        await asgi_app.on_disconnect("sid-a")
+        assert "sid-a" not in asgi_app.game_clients[engine.id]
+
+    _run(scenario())
+
+def test_socket_lobby(emitted, monkeypatch):
+    monkeypatch.setattr(asgi_app, "LOBBY_BOT_BACKEND", "blueprint")
+
+    async def scenario():
+        for sid in ("s1", "s2"):
+            await asgi_app.on_lobby_join(sid, {"playerName": sid, "stakes": "mid", "seats": 2})
+        seated = [data for event, data, _ in emitted if event == "seated"]
+        assert len(seated) == 2 and seated[0]["gameId"] == seated[1]["gameId"]
+        assert sorted(s["playerId"] for s in seated) == [0, 1]
+        await asyncio.gather(*asgi_app.background_tasks)
+
+    _run(scenario())
+
+def test_shot_clock_folds_an_idle_human(emitted, monkeypatch):
+    monkeypatch.setattr(asgi_app.shot_clock, "action_time", 0.1)
+    monkeypatch.setattr(asgi_app.shot_clock, "time_bank", 0.1)
+
+    async def scenario():
+        _, game = await _request("POST", "/api/game", {"aiBackends": {"1": "blueprint", "2": "blueprint", "3": "blueprint"}})
+        engine = games[game["gameId"]]
+        for _ in range(100):
+            if engine.players[0].is_folded:
+                break
+            await asyncio.sleep(0.05)
+        await asyncio.gather(*asgi_app.background_tasks)
+        phases = [data["phase"] for event, data, to in emitted if event == "clock" and data["playerId"] == 0]
+        assert phases[:3] == ["action", "timeBank", "expired"]
+        assert engine.players[0].is_folded
+
+    _run(scenario())
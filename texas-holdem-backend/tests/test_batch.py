@@ -0,0 +1,62 @@
+import numpy as np
+import pytest
+from game.batch import NO_ACTION, BatchTables, deal_orders
+from game.engine import GameEngine
+from game.hand_history import ActionCode
+from game.player import Player
+from ai.batch_policy import fallback_policy
+from ai.gemini_player import _fallback_logic
+from tools.simulate import simulate
+
+class NoRaise:
+    """Stands in for a Generator whose rolls never trigger the 10% raise."""
+
+    def random(self, n):
+        return np.ones(n)
+
+def _table(stacks):
+    return GameEngine([Player(id=i, name=f"p{i}", chips=c) for i, c in enumerate(stacks)])
+
+def test_layout_mirrors_engines():
+    engines = [_table([1000] * 4), _table([500, 700, 900])]
+    batch = BatchTables(engines)
+
+    assert batch.chips.shape == (2, 4)
+    assert batch.folded[1, 3]
+    assert list(batch.active) == [e.active_player_id for e in engines]
+    assert batch.acting_column(batch.chips)[1] == engines[1].players[engines[1].active_player_id].chips
+
+def test_policy_matches_scalar_fallback(monkeypatch):
+    monkeypatch.setattr("ai.gemini_player.random.random", lambda: 1.0)
+    engines = [_table(stacks) for stacks in ([1000] * 4, [30, 1000, 1000, 1000], [1000, 60, 1000, 1000], [100] * 4)]
+    engines[1].process_player_action(engines[1].active_player_id, "raise", 200)
+    batch = BatchTables(engines)
+
+    actions, _ = fallback_policy(batch, NoRaise())
+    for row, engine in enumerate(engines):
+        pid = engine.active_player_id
+        expected = _fallback_logic(engine.to_dict(for_player_id=pid), pid)["action"]
+        assert ActionCode(int(actions[row])).name.lower() == expected
+
+def test_policy_skips_finished_tables():
+    engine = _table([1000, 1000])
+    engine.process_player_action(engine.active_player_id, "fold")
+    batch = BatchTables([engine])
+
+    actions, _ = fallback_policy(batch, np.random.default_rng(0))
+    assert actions[0] == NO_ACTION
+    assert batch.apply(actions, np.zeros(1, dtype=np.int64)) == 0
+
+def test_simulate_plays_every_hand():
+    summary = simulate(20, 3, seats=4, seed=5)
+    assert summary["hands"] == 60
+    assert summary["decisions"] > 60
+
+def test_deal_orders_are_partial_permutations():
+    orders = deal_orders(100, 13, np.random.default_rng(3))
+    assert orders.shape == (100, 13)
+    assert all(len(set(row.tolist())) == 13 for row in orders)
+    assert orders.min() >= 0 and orders.max() < 52
+
+def test_simulate_is_reproducible():
+    assert simulate(10, 3, seed=9)["decisions"] == simulate(10, 3, seed=9)["decisions"]
@@ -0,0 +1,101 @@
+import random
+import time
+import pytest
+from game.card import Card, Rank, Suit
+from game.engine import GameEngine
+from game.player import Player
+from ai import blueprint
+from ai.blueprint import (N_ACTIONS, N_INFOSETS, BlueprintTable, get_blueprint_decision, hand_bucket,
+                          infoset_index, live_infoset, write_table)
+from tools.train_blueprint import Trainer, average_strategy, train
+
+@pytest.fixture
+def engine():
+    return GameEngine([Player(id=i, name=f"p{i}", chips=1000) for i in range(4)])
+
+def test_preflop_buckets_order_hands():
+    aces = hand_bucket([Card(Rank.ACE, Suit.SPADES), Card(Rank.ACE, Suit.HEARTS)], [])
+    seven_deuce = hand_bucket([Card(Rank.SEVEN, Suit.CLUBS), Card(Rank.TWO, Suit.DIAMONDS)], [])
+    assert aces == 7
+    assert seven_deuce < aces
+
+def test_postflop_buckets():
+    hole = [Card(Rank.ACE, Suit.SPADES), Card(Rank.KING, Suit.SPADES)]
+    top_pair = [Card(Rank.ACE, Suit.CLUBS), Card(Rank.NINE, Suit.HEARTS), Card(Rank.FOUR, Suit.DIAMONDS)]
+    flush_draw = [Card(Rank.TWO, Suit.SPADES), Card(Rank.NINE, Suit.SPADES), Card(Rank.FOUR, Suit.DIAMONDS)]
+    assert hand_bucket(hole, top_pair) == 3
+    assert hand_bucket(hole, flush_draw) == 1
+
+def test_table_round_trip(tmp_path):
+    probs = [0.0, 1.0, 0.0] * N_INFOSETS
+    probs[5 * N_ACTIONS:6 * N_ACTIONS] = [0.25, 0.25, 0.5]
+    path = str(tmp_path / "bp.bin")
+    write_table(path, probs)
+
+    table = BlueprintTable(path)
+    try:
+        assert table.probabilities(5) == (0.25, 0.25, 0.5)
+        assert table.probabilities(6) == (0.0, 1.0, 0.0)
+    finally:
+        table.close()
+
+def test_rejects_foreign_file(tmp_path):
+    path = tmp_path / "junk.bin"
+    path.write_bytes(b"\0" * 64)
+    with pytest.raises(ValueError):
+        BlueprintTable(str(path))
+
+def test_trainer_strategy_is_a_distribution():
+    trainer = Trainer([0.0] * (N_INFOSETS * N_ACTIONS), seed=3)
+    for i in range(50):
+        trainer.iterate(i % 2)
+    probs = average_strategy(trainer.strategy_sum)
+    for index in range(N_INFOSETS):
+        assert sum(probs[index * N_ACTIONS:(index + 1) * N_ACTIONS]) == pytest.approx(1.0)
+
+def test_trained_blueprint_plays_aces_and_folds_trash(tmp_path, engine):
+    path = str(tmp_path / "bp.bin")
+    write_table(path, train(3000, processes=1, rounds=3, seed=11))
+    table = BlueprintTable(path)
+    try:
+        # Small blind facing the big blind preflop
+        aces = table.probabilities(infoset_index(0, 7, 1))
+        trash = table.probabilities(infoset_index(0, 0, 1))
+        assert aces[0] < 0.2
+        assert trash[0] > aces[0]
+
+        state = engine.snapshot()
+        decision = get_blueprint_decision(state, state.active_player_id, table, random.Random(1))
+        assert decision["action"] in ("fold", "call", "raise")
+    finally:
+        table.close()
+
+def test_decision_without_table_checks_or_calls(engine, monkeypatch, tmp_path):
+    monkeypatch.setattr(blueprint, "_table", None)
+    monkeypatch.setattr(blueprint, "_table_missing", False)
+    monkeypatch.setenv("BLUEPRINT_PATH", str(tmp_path / "missing.bin"))
+    state = engine.snapshot()
+    for seed in range(5):
+        decision = get_blueprint_decision(state, state.active_player_id, rng=random.Random(seed))
+        assert decision == {"action": "call", "amount": 0}
+
+def test_live_infoset_counts_raises(engine):
+    engine.process_player_action(engine.active_player_id, "raise", 60)
+    state = engine.snapshot()
+    index = live_infoset(state, state.active_player_id)
+    # Preflop, one raise, facing a bet
+    assert index % 6 == 3
+    assert index < 8 * 6
+
+def test_lookup_is_fast(tmp_path, engine):
+    path = str(tmp_path / "bp.bin")
+    write_table(path, [1 / 3] * (N_INFOSETS * N_ACTIONS))
+    table = BlueprintTable(path)
+    try:
+        state = engine.snapshot()
+        start = time.perf_counter()
+        for _ in range(200):
+            get_blueprint_decision(state, state.active_player_id, table)
+        assert (time.perf_counter() - start) / 200 < 0.005
+    finally:
+        table.close()
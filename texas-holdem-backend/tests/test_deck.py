@@ -1,4 +1,5 @@
 import unittest
+import random
 from game.deck import Deck
 from game.card import Card
 
@@ -43,3 +44,41 @@ class TestDeck(unittest.TestCase):
         
         with self.assertRaises(ValueError):
             self.deck.deal(1)
+
+    def test_seeded_decks_deal_the_same_cards(self):
+        """Test that the same seed reproduces the same deal."""
+        first = [c.to_str() for c in Deck(seed=42).deal(9)]
+        second = [c.to_str() for c in Deck(rng=random.Random(42)).deal(9)]
+        self.assertEqual(first, second)
+
+    def test_lazy_deal_matches_materialised_order(self):
+        """Test that dealing after peeking returns the peeked order."""
+        deck = Deck(seed=7)
+        deck.deal(5)
+        upcoming = [c.to_str() for c in deck._cards]
+        self.assertEqual([c.to_str() for c in deck.deal(47)], upcoming)
+
+    def test_peeking_does_not_consume_the_rng(self):
+        """Test that looking at the remaining cards leaves later deals unchanged."""
+        rng = random.Random(3)
+        peeked = Deck(rng=rng)
+        peeked.deal(4)
+        peeked.remaining()
+        peeked.reset()
+        untouched = Deck(seed=3)
+        untouched.deal(4)
+        untouched.reset()
+        self.assertEqual([c.to_str() for c in peeked.deal(9)], [c.to_str() for c in untouched.deal(9)])
+
+    def test_reset_returns_all_cards(self):
+        """Test that reset puts dealt cards back, including for fixed-order decks."""
+        deck = Deck.from_codes([0, 1, 2])
+        deck.deal(3)
+        deck.reset()
+        self.assertEqual(len(deck), 52)
+        self.assertEqual(len({c.to_str() for c in deck.deal(52)}), 52)
+
+    def test_from_codes(self):
+        """Test that integer codes deal in order."""
+        deck = Deck.from_codes([51, 0])
+        self.assertEqual([c.to_str() for c in deck.deal(2)], ["AC", "2S"])
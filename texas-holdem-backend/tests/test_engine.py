@@ -1,7 +1,10 @@
+import random
 import pytest
-from game.engine import GameEngine
+from game.engine import GameEngine, GameObserver
 from game.player import Player
 from game.card import Card, Rank, Suit
+from game.deck import Deck
+from game.hand_evaluator import BoardEvaluator
 
 @pytest.fixture
 def players():
@@ -169,4 +172,199 @@ def test_all_in_skips_turns(players):
     assert engine.stage != "PRE_FLOP" 
     # P0 should not be asked for actions anymore
     if engine.stage != "HAND_OVER":
-        assert engine.active_player_id != 0
\ No newline at end of file
+        assert engine.active_player_id != 0
+
+def test_under_raise_is_a_call(players):
+    """A raise below the current bet matches the bet instead of refunding chips."""
+    engine = GameEngine(players)
+    engine.process_player_action(0, "raise", 100)
+    engine.process_player_action(1, "raise", 60)
+
+    assert players[1].current_bet == 100
+    assert players[1].chips == 900
+    assert players[1].last_action == "Call"
+    assert engine.bet_to_call == 100
+
+def test_observer_errors_do_not_break_gameplay(players):
+    class Broken(GameObserver):
+        def on_action(self, engine, player, action, added):
+            raise RuntimeError("boom")
+
+    engine = GameEngine(players, observers=[Broken()])
+    engine.process_player_action(0, "call")
+    assert engine.active_player_id == 1
+
+def test_seed_replays_deals():
+    def deals(seed):
+        engine = GameEngine([Player(id=i, name=f"p{i}", chips=1000) for i in range(3)], seed=seed)
+        hands = []
+        for _ in range(3):
+            hands.append([c.to_str() for p in engine.players for c in p.hand])
+            engine.start_new_hand()
+        return hands
+
+    assert deals(5) == deals(5)
+    assert deals(5) != deals(6)
+
+def test_all_in_big_blind_gets_no_option(players):
+    """A big blind that is all-in from posting cannot act, so calls close the round."""
+    players[3].chips = 20
+    engine = GameEngine(players)
+    assert players[3].is_all_in
+
+    for pid in (0, 1, 2):
+        engine.process_player_action(pid, "call")
+
+    assert engine.stage == "FLOP"
+    assert engine.active_player_id != 3
+
+def test_split_pot_keeps_the_odd_chip(players):
+    engine = GameEngine(players)
+    engine.stage = "RIVER"
+    engine.community_cards = [
+        Card(Rank.ACE, Suit.SPADES), Card(Rank.ACE, Suit.HEARTS), Card(Rank.ACE, Suit.CLUBS),
+        Card(Rank.KING, Suit.SPADES), Card(Rank.KING, Suit.HEARTS),
+    ]
+    # Both play the board
+    players[0].hand = [Card(Rank.TWO, Suit.DIAMONDS), Card(Rank.THREE, Suit.CLUBS)]
+    players[1].hand = [Card(Rank.TWO, Suit.CLUBS), Card(Rank.THREE, Suit.DIAMONDS)]
+    players[2].is_folded = True
+    players[3].is_folded = True
+    engine.pot = 31
+    engine.active_player_id = 0
+    engine.bet_to_call = 0
+    for p in players:
+        p.current_bet = 0
+    chips = [p.chips for p in players]
+
+    engine.process_player_action(0, "check")
+    engine.process_player_action(1, "check")
+
+    assert sorted(engine.winners) == [0, 1]
+    assert sum(engine.payouts.values()) == 31
+    # Seat 1 has the button, so seat 0 is the first winner to its left
+    assert players[0].chips - chips[0] == 16
+    assert players[1].chips - chips[1] == 15
+
+def _deal(engine, holes, board):
+    """Starts the next hand with these hole cards (in seat order) and board."""
+    cards = [c for hole in holes for c in hole] + board
+    engine.start_new_hand(Deck.from_cards(cards))
+
+BOARD = [Card(Rank.TWO, Suit.CLUBS), Card(Rank.SEVEN, Suit.DIAMONDS), Card(Rank.NINE, Suit.CLUBS),
+         Card(Rank.JACK, Suit.DIAMONDS), Card(Rank.THREE, Suit.SPADES)]
+ACES = [Card(Rank.ACE, Suit.SPADES), Card(Rank.ACE, Suit.HEARTS)]
+KINGS = [Card(Rank.KING, Suit.SPADES), Card(Rank.KING, Suit.HEARTS)]
+QUEENS = [Card(Rank.QUEEN, Suit.SPADES), Card(Rank.QUEEN, Suit.HEARTS)]
+
+@pytest.fixture
+def short_stack_table():
+    players = [Player(id=0, name="short", chips=100), Player(id=1, name="p1", chips=1000),
+               Player(id=2, name="p2", chips=1000)]
+    engine = GameEngine(players)
+    for p, chips in zip(players, (100, 1000, 1000)):
+        p.chips = chips
+    return engine, players
+
+def test_short_all_in_only_wins_the_main_pot(short_stack_table):
+    engine, players = short_stack_table
+    _deal(engine, [ACES, KINGS, QUEENS], BOARD)
+    assert engine.dealer_pos == 2 and engine.active_player_id == 2
+
+    engine.process_player_action(2, "raise", 1000)
+    engine.process_player_action(0, "call")
+    engine.process_player_action(1, "call")
+
+    assert engine.stage == "HAND_OVER"
+    assert engine.payouts == {0: 300, 1: 1800}
+    assert engine.winners == [0, 1]
+    assert [p.chips for p in players] == [300, 1800, 0]
+
+def test_uncalled_chips_go_back(short_stack_table):
+    engine, players = short_stack_table
+    _deal(engine, [ACES, KINGS, QUEENS], BOARD)
+    engine.process_player_action(2, "raise", 500)
+    engine.process_player_action(0, "call")
+    engine.process_player_action(1, "fold")
+    while engine.stage != "HAND_OVER":
+        engine.process_player_action(engine.active_player_id, "check")
+
+    # Seat 1's big blind is dead money in the main pot; seat 2's last 400 had no caller
+    assert engine.payouts == {0: 220}
+    assert engine.refunds == {2: 400}
+    assert engine.winners == [0]
+    assert [p.chips for p in players] == [220, 980, 900]
+
+def test_first_actor_skips_busted_seats(players):
+    engine = GameEngine(players)
+    players[0].chips = 0
+    engine.start_new_hand()
+    # Dealer 2, blinds on 3 and 0; seat 0 is busted so posts nothing and seat 1 acts first
+    assert engine.players[0].is_folded and engine.active_player_id == 1
+
+def test_snapshots_do_not_change_seeded_deals():
+    def boards(snapshot):
+        engine = GameEngine([Player(id=i, name=f"p{i}", chips=1000) for i in range(4)], seed=11)
+        dealt = []
+        for _ in range(5):
+            while engine.stage != "HAND_OVER":
+                if snapshot:
+                    engine.snapshot()
+                engine.process_player_action(engine.active_player_id, "call")
+            dealt.append([c.to_str() for c in engine.community_cards])
+            engine.start_new_hand()
+        return dealt
+
+    assert boards(snapshot=True) == boards(snapshot=False)
+
+def _reference_payouts(engine):
+    """Side pots the slow way: peel off the smallest live contribution until nothing is left."""
+    board = BoardEvaluator(engine.community_cards)
+    scores = {p.id: board.evaluate(p.hand) for p in engine.players if not p.is_folded}
+    left = {p.id: p.committed for p in engine.players}
+    pots = []
+    while any(left[seat] for seat in scores):
+        live = [seat for seat in scores if left[seat] > 0]
+        level = min(left[seat] for seat in live)
+        pots.append([sum(min(chips, level) for chips in left.values()), live])
+        for seat in left:
+            left[seat] -= min(left[seat], level)
+    pots[-1][0] += sum(left.values())  # folded chips above every live seat
+
+    n = len(engine.players)
+    payouts = {}
+    for pot, live in pots:
+        best = max(scores[seat] for seat in live)
+        winners = sorted((s for s in live if scores[s] == best), key=lambda s: (s - engine.dealer_pos - 1) % n)
+        share, odd = divmod(pot, len(winners))
+        for k, seat in enumerate(winners):
+            payouts[seat] = payouts.get(seat, 0) + share + (1 if k < odd else 0)
+    return payouts
+
+@pytest.mark.parametrize("seats", [3, 9, 10])
+def test_side_pots_and_bookkeeping_match_a_rescan(seats):
+    rng = random.Random(seats)
+    engine = GameEngine([Player(id=i, name=f"p{i}", chips=rng.randint(30, 3000)) for i in range(seats)], seed=seats)
+    showdowns = 0
+    for _ in range(300):
+        total = sum(p.chips for p in engine.players) + engine.pot
+        while engine.stage not in ("HAND_OVER", "SHOWDOWN"):
+            rebuilt = GameEngine.from_snapshot(engine.snapshot())
+            for field in ("_live", "_can_act", "_acted", "_levels", "_layers"):
+                assert getattr(rebuilt, field) == getattr(engine, field), field
+            roll = rng.random()
+            action = "fold" if roll < 0.15 else "call" if roll < 0.75 else "raise"
+            engine.process_player_action(engine.active_player_id, action,
+                                         engine.bet_to_call + engine.big_blind * rng.randint(1, 20))
+        assert sum(p.chips for p in engine.players) == total
+        if sum(1 for p in engine.players if not p.is_folded) > 1:
+            showdowns += 1
+            returned = dict(engine.payouts)
+            for seat, amount in engine.refunds.items():
+                returned[seat] = returned.get(seat, 0) + amount
+            assert returned == _reference_payouts(engine)
+        if sum(1 for p in engine.players if p.chips > 0) < 2:
+            for p in engine.players:
+                p.chips = rng.randint(30, 3000)
+        engine.start_new_hand()
+    assert showdowns > 50
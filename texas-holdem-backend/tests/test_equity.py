@@ -0,0 +1,32 @@
+import random
+import time
+import pytest
+from game.card import Card, Rank, Suit
+from game.equity import equity_stream, sample_equity
+
+ACES = [Card(Rank.ACE, Suit.SPADES), Card(Rank.ACE, Suit.HEARTS)]
+
+def test_aces_heads_up():
+    *_, final = equity_stream(ACES, [], 1, rng=random.Random(1))
+    assert final.done
+    assert final.equity == pytest.approx(0.85, abs=0.03)
+
+def test_equity_drops_with_more_opponents():
+    *_, one = equity_stream(ACES, [], 1, rng=random.Random(2))
+    *_, four = equity_stream(ACES, [], 4, rng=random.Random(2))
+    assert four.equity < one.equity
+
+def test_board_plays_splits():
+    board = [Card(Rank.ACE, Suit.CLUBS), Card(Rank.KING, Suit.CLUBS), Card(Rank.QUEEN, Suit.CLUBS),
+             Card(Rank.JACK, Suit.CLUBS), Card(Rank.TEN, Suit.CLUBS)]
+    hole = [Card(Rank.TWO, Suit.HEARTS), Card(Rank.THREE, Suit.DIAMONDS)]
+    assert sample_equity(hole, board, 2, 50, random.Random(3)) == pytest.approx(50 / 3)
+
+def test_stream_refines_progressively():
+    estimates = list(equity_stream(ACES, [], 2, batch=100, max_samples=1000, tolerance=0.0, rng=random.Random(4)))
+    assert [e.samples for e in estimates] == list(range(100, 1001, 100))
+    assert not any(e.done for e in estimates[:-1]) and estimates[-1].done
+    assert estimates[-1].std_error < estimates[0].std_error
+
+def test_no_opponents():
+    assert list(equity_stream(ACES, [], 0))[0].equity == 1.0
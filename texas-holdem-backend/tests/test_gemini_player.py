@@ -0,0 +1,70 @@
+import asyncio
+import time
+from types import SimpleNamespace
+
+import pytest
+from tenacity import wait_none
+
+from ai import gemini_player
+from game.engine import GameEngine
+from game.player import Player
+
+class BlockingRestModel:
+    """Stands in for the REST transport: generate_content blocks, and there is no real async call."""
+
+    def __init__(self, replies):
+        self.replies = list(replies)
+        self.calls = 0
+
+    def generate_content(self, prompt):
+        self.calls += 1
+        time.sleep(0.2)
+        reply = self.replies.pop(0)
+        if isinstance(reply, Exception):
+            raise reply
+        return SimpleNamespace(text=reply)
+
+    async def generate_content_async(self, prompt):
+        raise AssertionError("the REST transport must not be awaited directly")
+
+@pytest.fixture
+def rest_model(monkeypatch):
+    def install(*replies):
+        model = BlockingRestModel(replies)
+        monkeypatch.setattr(gemini_player, "_model", model)
+        monkeypatch.setattr(gemini_player, "_model_ready", True)
+        monkeypatch.setattr(gemini_player, "API_ENDPOINT", "http://127.0.0.1:9")
+        monkeypatch.setattr(gemini_player._ask_async.retry, "wait", wait_none())
+        return model
+    return install
+
+def _state():
+    engine = GameEngine([Player(id=i, name=f"p{i}", chips=1000) for i in range(4)])
+    return engine.to_dict(0)
+
+def test_rest_calls_do_not_block_the_event_loop(rest_model):
+    rest_model('{"action": "call", "amount": 0}')
+
+    async def main():
+        ticks = 0
+
+        async def ticker():
+            nonlocal ticks
+            while True:
+                await asyncio.sleep(0.01)
+                ticks += 1
+
+        task = asyncio.create_task(ticker())
+        decision = await gemini_player.get_ai_decision_async(_state(), 0)
+        task.cancel()
+        return decision, ticks
+
+    decision, ticks = asyncio.run(main())
+    assert decision == {"action": "call", "amount": 0}
+    assert ticks >= 5
+
+def test_failed_calls_are_retried(rest_model):
+    model = rest_model(ConnectionError("boom"), "not json", '{"action": "raise", "amount": 80}')
+    decision = asyncio.run(gemini_player.get_ai_decision_async(_state(), 0))
+    assert decision == {"action": "raise", "amount": 80}
+    assert model.calls == 3
@@ -1,6 +1,7 @@
+import random
 import unittest
 from typing import List
-from game.hand_evaluator import evaluate_hand
+from game.hand_evaluator import BoardEvaluator, evaluate_hand
 from game.card import Card, Rank, Suit
 
 class TestHandEvaluator(unittest.TestCase):
@@ -64,3 +65,45 @@ class TestHandEvaluator(unittest.TestCase):
         cards = self._create_cards_from_strings(['AD', 'KS', 'JH', '7D', '5C', '3S', '2H'])
         rank, _ = evaluate_hand(cards)
         self.assertEqual(rank, 1) # 1 = High Card
+
+class TestBoardEvaluator(unittest.TestCase):
+
+    def test_matches_evaluate_hand(self):
+        """Incremental scores must equal evaluate_hand, including kickers."""
+        rng = random.Random(5)
+        for _ in range(5000):
+            # Few ranks and suits make quads, full houses and straight flushes common
+            ranks = rng.sample(range(13), rng.choice([4, 6, 13]))
+            suits = rng.sample(range(4), rng.choice([1, 2, 4]))
+            pool = [Card.from_int(s * 13 + r) for s in suits for r in ranks]
+            if len(pool) < 7:
+                continue
+            cards = rng.sample(pool, rng.choice([5, 6, 7]))
+            self.assertEqual(BoardEvaluator(cards[2:]).evaluate(cards[:2]), evaluate_hand(cards), cards)
+
+    def test_streets_are_added_incrementally(self):
+        board = BoardEvaluator([Card.from_str(c) for c in ['AS', 'KS', '2D']])
+        board.add([Card.from_str('QS')])
+        board.add([Card.from_str('JS')])
+        self.assertEqual(board.evaluate([Card.from_str('TS'), Card.from_str('3C')]), (9, [14, 13, 12, 11, 10]))
+
+    def test_short_hand(self):
+        self.assertEqual(BoardEvaluator().evaluate([Card.from_str('AS'), Card.from_str('AD')]), (0, []))
+
+    def test_hand_info(self):
+        board = BoardEvaluator([Card.from_str(c) for c in ['2S', '9S', 'KD']])
+        info = board.hand_info([Card.from_str('AS'), Card.from_str('KS')])
+        self.assertEqual(info.made, "Top Pair")
+        self.assertEqual(info.draws, ["flush draw"])
+        # 9 spades plus three aces and two kings
+        self.assertEqual(info.outs, 14)
+
+        info = BoardEvaluator([Card.from_str(c) for c in ['TD', 'JS', '2C', '3H']]).hand_info(
+            [Card.from_str('8H'), Card.from_str('9C')])
+        self.assertEqual(info.draws, ["open-ended straight draw"])
+
+    def test_card_from_str(self):
+        self.assertEqual(Card.from_str('TH'), Card(Rank.TEN, Suit.HEARTS))
+        self.assertEqual(Card.from_str('10h'), Card(Rank.TEN, Suit.HEARTS))
+        with self.assertRaises(ValueError):
+            Card.from_str('1X')
@@ -0,0 +1,204 @@
+import os
+import subprocess
+import sys
+
+import pytest
+from game.card import Card, Rank, Suit
+from game.deck import Deck
+from game.engine import GameEngine
+from game.player import Player
+from game.hand_history import (
+    ActionCode, HandHistoryWriter, HandRecorder, RECORD_SIZE,
+    iter_hands, segment_paths, to_text,
+)
+from analytics.player_stats import StatsAggregate
+
+@pytest.fixture
+def players():
+    return [Player(id=i, name=f"p{i}", chips=1000, is_human=(i == 0)) for i in range(4)]
+
+def test_card_int_round_trip():
+    codes = set()
+    for suit in Suit:
+        for rank in Rank:
+            card = Card(rank, suit)
+            assert Card.from_int(card.to_int()) == card
+            codes.add(card.to_int())
+    assert codes == set(range(52))
+
+def test_records_fold_out_hand(tmp_path, players):
+    writer = HandHistoryWriter(str(tmp_path))
+    engine = GameEngine(players, observers=[HandRecorder(writer)])
+    hole = [[c.to_int() for c in p.hand] for p in players]
+
+    engine.process_player_action(0, "raise", 60)
+    engine.process_player_action(1, "fold")
+    engine.process_player_action(2, "fold")
+    engine.process_player_action(3, "fold")
+    writer.close()
+
+    hands = list(iter_hands(str(tmp_path)))
+    assert len(hands) == 1
+    hand = hands[0]
+    assert hand.game_id == engine.id
+    assert [s.cards for s in hand.seats] == hole
+    assert [s.chips for s in hand.seats] == [1000] * 4
+    assert [a.action for a in hand.actions] == [
+        ActionCode.BLIND, ActionCode.BLIND, ActionCode.RAISE,
+        ActionCode.FOLD, ActionCode.FOLD, ActionCode.FOLD,
+    ]
+    assert hand.actions[2].total_bet == 60
+    assert hand.pot == 90
+    assert hand.payouts == {0: 50}
+    assert hand.refunds == {0: 40}
+    assert not hand.showdown
+
+    text = to_text(hand)
+    assert "p2: posts small blind $10" in text
+    assert "p0: raises $40 to $60" in text
+    assert "Uncalled bet ($40) returned to p0" in text
+    assert "p0 collected $50 from pot" in text
+
+def test_showdown_board_and_rotation(tmp_path, players):
+    writer = HandHistoryWriter(str(tmp_path), segment_bytes=RECORD_SIZE * 10, buffer_bytes=0)
+    engine = GameEngine(players, observers=[HandRecorder(writer)])
+
+    for _ in range(3):
+        while engine.stage != "HAND_OVER":
+            engine.process_player_action(engine.active_player_id, "call")
+        engine.start_new_hand()
+    writer.close()
+
+    assert len(segment_paths(str(tmp_path))) == 3
+    hands = list(iter_hands(str(tmp_path)))
+    assert [h.hand_no for h in hands] == [1, 2, 3]
+    for hand in hands:
+        assert hand.showdown
+        assert len(hand.board) == 5
+        assert sum(hand.payouts.values()) <= hand.pot == 80
+        assert "*** RIVER ***" in to_text(hand)
+
+CRASHING_WRITER = """
+import os, sys
+from game.engine import GameEngine
+from game.player import Player
+from game.hand_history import HandHistoryWriter, HandRecorder
+writer = HandHistoryWriter(sys.argv[1], buffer_bytes=0)
+engine = GameEngine([Player(id=i, name=f"p{i}", chips=1000) for i in range(4)], observers=[HandRecorder(writer)])
+for pid in (0, 1, 2):
+    engine.process_player_action(pid, "fold")
+os._exit(0)  # dies without sealing its segment
+"""
+
+def test_open_segment_is_sealed_on_restart(tmp_path):
+    subprocess.run([sys.executable, "-c", CRASHING_WRITER, str(tmp_path)], check=True,
+                   cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+    assert segment_paths(str(tmp_path)) == []
+    assert len(segment_paths(str(tmp_path), include_open=True)) == 1
+
+    HandHistoryWriter(str(tmp_path))
+    assert len(segment_paths(str(tmp_path))) == 1
+    assert sum(1 for _ in iter_hands(str(tmp_path))) == 1
+
+def test_writers_sharing_a_directory_keep_their_segments(tmp_path, players):
+    first = HandHistoryWriter(str(tmp_path), buffer_bytes=0)
+    engine = GameEngine(players, observers=[HandRecorder(first)])
+    for pid in (0, 1, 2):
+        engine.process_player_action(pid, "fold")
+    # Another process's open segment, named by a live pid (our parent)
+    other = tmp_path / f"00000001-{os.getppid()}-abc123.hh.part"
+    other.write_bytes(b"")
+
+    second = HandHistoryWriter(str(tmp_path), buffer_bytes=0)
+    engine = GameEngine(players, observers=[HandRecorder(second)])
+    for pid in (0, 1, 2):
+        engine.process_player_action(pid, "fold")
+    assert segment_paths(str(tmp_path)) == []
+    assert other.exists()
+
+    first.close()
+    second.close()
+    sealed = segment_paths(str(tmp_path))
+    assert len(sealed) == 2 and len(set(sealed)) == 2
+    assert sum(1 for _ in iter_hands(str(tmp_path))) == 2
+
+def test_busted_small_blind_seat(tmp_path, players):
+    writer = HandHistoryWriter(str(tmp_path))
+    engine = GameEngine(players, observers=[HandRecorder(writer)])
+    players[3].chips = 0
+    engine.start_new_hand()
+    # Dealer 2: seat 3 would post the small blind but is busted, so seat 0's post is the only one
+    for pid in (1, 2):
+        engine.process_player_action(pid, "fold")
+    writer.close()
+
+    hand = next(iter_hands(str(tmp_path)))
+    assert hand.big_blind_seat == 0
+    text = to_text(hand)
+    assert "p0: posts big blind $20" in text
+    assert "small blind" not in text
+
+def test_torn_record_is_ignored(tmp_path, players):
+    writer = HandHistoryWriter(str(tmp_path), buffer_bytes=0)
+    engine = GameEngine(players, observers=[HandRecorder(writer)])
+    for pid in (0, 1, 2):
+        engine.process_player_action(pid, "fold")
+    writer.close()
+
+    path = segment_paths(str(tmp_path))[0]
+    with open(path, "ab") as f:
+        f.write(b"H" + b"\0" * 10)
+
+    assert sum(1 for _ in iter_hands(path)) == 1
+
+def test_under_raise_recorded_as_call(tmp_path, players):
+    writer = HandHistoryWriter(str(tmp_path))
+    engine = GameEngine(players, observers=[HandRecorder(writer)])
+
+    engine.process_player_action(0, "raise", 100)
+    engine.process_player_action(1, "raise", 60)
+    for pid in (2, 3, 0):
+        engine.process_player_action(pid, "fold")
+    writer.close()
+
+    hand = next(iter_hands(str(tmp_path)))
+    under = hand.actions[3]
+    assert under.seat == 1
+    assert under.action == ActionCode.CALL
+    assert under.amount == 100 and under.total_bet == 100
+    assert hand.payouts == {1: 230}
+
+def test_returned_overbet_is_not_a_win(tmp_path):
+    writer = HandHistoryWriter(str(tmp_path))
+    players = [Player(id=0, name="short", chips=100), Player(id=1, name="p1", chips=1000),
+               Player(id=2, name="p2", chips=1000)]
+    engine = GameEngine(players, observers=[HandRecorder(writer)])
+    for p, chips in zip(players, (100, 1000, 1000)):
+        p.chips = chips
+    aces = [Card(Rank.ACE, Suit.SPADES), Card(Rank.ACE, Suit.HEARTS)]
+    kings = [Card(Rank.KING, Suit.SPADES), Card(Rank.KING, Suit.HEARTS)]
+    queens = [Card(Rank.QUEEN, Suit.SPADES), Card(Rank.QUEEN, Suit.HEARTS)]
+    board = [Card(Rank.TWO, Suit.CLUBS), Card(Rank.SEVEN, Suit.DIAMONDS), Card(Rank.NINE, Suit.CLUBS),
+             Card(Rank.JACK, Suit.DIAMONDS), Card(Rank.THREE, Suit.SPADES)]
+    engine.start_new_hand(Deck.from_cards(aces + kings + queens + board))
+
+    # The short stack calls all-in for 100 and wins; 900 of p2's shove was never matched
+    engine.process_player_action(2, "raise", 1000)
+    engine.process_player_action(0, "call")
+    engine.process_player_action(1, "fold")
+    writer.close()
+
+    hand = next(iter_hands(str(tmp_path)))
+    assert hand.payouts == {0: 220}
+    assert hand.refunds == {2: 900}
+    assert hand.winners == [0]
+    text = to_text(hand)
+    assert "Uncalled bet ($900) returned to p2" in text
+    assert "p2 collected" not in text
+    assert "Total pot $220" in text
+
+    stats = StatsAggregate().add_hands([hand]).players
+    assert stats["p2"].showdowns == 1 and stats["p2"].showdowns_won == 0
+    assert stats["short"].showdowns_won == 1
+    assert stats["p2"].net_chips == -100
@@ -0,0 +1,71 @@
+import numpy as np
+import pytest
+from game.icm import call_equity, exact_cost, icm_batch, icm_equity
+
+def _harville(stacks, payouts):
+    """The factorial recursion, for checking small cases."""
+    equity = [0.0] * len(stacks)
+
+    def place(remaining, k, prob):
+        if k == len(payouts) or not remaining:
+            return
+        total = sum(stacks[i] for i in remaining)
+        for i in remaining:
+            p = prob * (stacks[i] / total if total else 1 / len(remaining))
+            equity[i] += p * payouts[k]
+            place([j for j in remaining if j != i], k + 1, p)
+
+    place(list(range(len(stacks))), 0, 1.0)
+    return equity
+
+@pytest.mark.parametrize("stacks,payouts", [
+    ([1000, 2500, 400, 3100, 1800, 700], [50, 30, 20]),
+    ([3000, 1500, 1500], [65, 35]),
+    ([100, 200, 300, 400, 500, 600, 700], [40, 25, 15, 10, 6, 4]),
+    ([0, 1000, 500], [50, 30, 20]),
+])
+def test_exact_matches_factorial_recursion(stacks, payouts):
+    assert icm_equity(stacks, payouts) == pytest.approx(_harville(stacks, payouts))
+
+def test_basic_properties():
+    equity = icm_equity([5000, 3000, 2000], [50, 30, 20])
+    assert sum(equity) == pytest.approx(100)
+    assert equity[0] > equity[1] > equity[2]
+    # ICM compresses: the chip leader's share of prizes is below their share of chips
+    assert equity[0] / 100 < 5000 / 10000
+    assert icm_equity([1000, 1000, 1000], [50, 30, 20]) == pytest.approx([100 / 3] * 3)
+    assert icm_equity([500, 0], [70, 30]) == [70, 30]
+
+def test_batch_rows_are_independent():
+    rows = [[1000, 2000, 3000], [3000, 2000, 1000], [2000, 2000, 2000]]
+    batch = icm_batch(rows, [50, 30, 20])
+    for row, stacks in zip(batch, rows):
+        assert row == pytest.approx(_harville(stacks, [50, 30, 20]))
+
+def test_sampling_is_close_to_exact():
+    rng = np.random.default_rng(0)
+    stacks = rng.integers(100, 5000, 8).tolist()
+    payouts = [40, 25, 15, 10, 5, 5]
+    sampled = icm_batch([stacks], payouts, samples=40_000, exact_limit=0, seed=1)[0]
+    assert sampled.sum() == pytest.approx(100)
+    assert sampled == pytest.approx(_harville(stacks, payouts), abs=0.5)
+
+def test_large_field_uses_sampling():
+    stacks = np.random.default_rng(2).integers(100, 50_000, 1000)
+    payouts = np.linspace(100, 1, 100)
+    assert exact_cost(1000, 100) > 10**100
+    equity = icm_batch([stacks], payouts, samples=500, seed=0)[0]
+    assert equity.sum() == pytest.approx(payouts.sum())
+    assert equity[np.argmax(stacks)] > equity[np.argmin(stacks)]
+
+def test_call_equity():
+    # An even coin flip for half of the chips: calling is worse than folding under ICM
+    decision = call_equity([1500, 1500, 3000], [50, 30, 20], hero=0, villain=2, win_probability=0.5)
+    assert decision["call"] < decision["fold"]
+    # A near lock is worth calling
+    decision = call_equity([1500, 1500, 3000], [50, 30, 20], hero=0, villain=2, win_probability=0.95)
+    assert decision["call"] > decision["fold"]
+
+def test_rejects_negative_stacks():
+    with pytest.raises(ValueError):
+        icm_batch([[100, -1]], [70, 30])
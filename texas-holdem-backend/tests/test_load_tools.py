@@ -0,0 +1,53 @@
+import json
+import random
+import pytest
+from tools.distributions import parse_distribution, percentile
+from tools.fake_gemini import FakeGeminiConfig, choose_action, handle_generate
+
+def test_parse_distribution_kinds():
+    rng = random.Random(1)
+    assert parse_distribution("0.25")() == 0.25
+    assert parse_distribution("const:0")() == 0.0
+
+    uniform = parse_distribution("uniform:0.1:0.2", rng)
+    assert all(0.1 <= uniform() <= 0.2 for _ in range(100))
+
+    exp = parse_distribution("exp:0.5", rng)
+    samples = [exp() for _ in range(5000)]
+    assert min(samples) >= 0
+    assert 0.4 < sum(samples) / len(samples) < 0.6
+
+def test_parse_distribution_invalid():
+    with pytest.raises(ValueError):
+        parse_distribution("gauss:1:2")
+
+def test_percentile_nearest_rank():
+    values = [1, 2, 3, 4, 5]
+    assert percentile(values, 50) == 3
+    assert percentile(values, 95) == 5
+    assert percentile(values, 1) == 1
+    assert percentile(list(range(1, 101)), 99) == 99
+    assert percentile([], 50) == 0.0
+
+def test_fake_gemini_policy():
+    assert choose_action("- To Call: $0", 0.9, 0.1)["action"] == "check"
+    assert choose_action("- To Call: $20", 0.9, 0.1)["action"] == "call"
+    assert choose_action("- To Call: $20", 0.05, 0.1) == {"action": "raise", "amount": 60}
+
+def test_fake_gemini_raise_is_total_bet():
+    prompt = "- Current Bet: $100\n- To Call: $50"
+    assert choose_action(prompt, 0.05, 0.1) == {"action": "raise", "amount": 190}
+
+def test_fake_gemini_response_and_errors():
+    body = json.dumps({"contents": [{"parts": [{"text": "- To Call: $0"}]}]}).encode()
+
+    ok = FakeGeminiConfig(latency=lambda: 0.0, raise_rate=0.0, seed=3)
+    status, payload = handle_generate(ok, body)
+    assert status == 200
+    text = payload["candidates"][0]["content"]["parts"][0]["text"]
+    assert '"check"' in text
+
+    failing = FakeGeminiConfig(latency=lambda: 0.0, error_rate=1.0, error_status=429)
+    status, _ = handle_generate(failing, body)
+    assert status == 429
+    assert failing.stats["errors"] == 1
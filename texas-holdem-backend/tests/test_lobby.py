@@ -0,0 +1,76 @@
+import pytest
+from game.lobby import STAKES, Lobby
+
+class Clock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+@pytest.fixture
+def clock():
+    return Clock()
+
+def test_full_tables_match_in_arrival_order(clock):
+    lobby = Lobby(fill_after=60, clock=clock)
+    tickets = [lobby.enqueue(f"p{i}", "low", 2) for i in range(5)]
+
+    matches = lobby.match()
+    assert [[t.name for t in m.tickets] for m in matches] == [["p0", "p1"], ["p2", "p3"]]
+    assert all(m.bots == 0 for m in matches)
+    assert len(lobby) == 1
+    assert lobby.state()["queues"] == [{"stakes": "low", "seats": 2, "waiting": 1, "longestWait": 0.0}]
+    assert tickets[4].id in lobby._tickets
+
+def test_queues_are_split_by_stakes_and_size(clock):
+    lobby = Lobby(fill_after=60, clock=clock)
+    lobby.enqueue("a", "low", 2)
+    lobby.enqueue("b", "high", 2)
+    lobby.enqueue("c", "low", 4)
+    assert lobby.match() == []
+
+    lobby.enqueue("d", "high", 2)
+    (match,) = lobby.match()
+    assert (match.stakes, match.seats) == ("high", 2)
+    assert match.blinds == STAKES["high"]
+    assert match.buy_in == STAKES["high"][1] * 50
+
+def test_stale_queues_are_filled_with_bots(clock):
+    lobby = Lobby(fill_after=5, clock=clock)
+    lobby.enqueue("a", "mid", 6)
+    lobby.enqueue("b", "mid", 6)
+    clock.now = 4.9
+    assert lobby.match() == []
+
+    clock.now = 5.0
+    (match,) = lobby.match()
+    assert [t.name for t in match.tickets] == ["a", "b"]
+    assert match.bots == 4
+    assert len(lobby) == 0
+    assert lobby.tables_created == 1
+
+def test_cancelled_tickets_are_skipped(clock):
+    lobby = Lobby(fill_after=60, clock=clock)
+    first = lobby.enqueue("a", "low", 2)
+    lobby.enqueue("b", "low", 2)
+    assert lobby.cancel(first.id)
+    assert not lobby.cancel(first.id)
+    assert lobby.match() == []
+
+    lobby.enqueue("c", "low", 2)
+    (match,) = lobby.match()
+    assert [t.name for t in match.tickets] == ["b", "c"]
+
+def test_many_arrivals():
+    lobby = Lobby(fill_after=60)
+    for i in range(20_000):
+        lobby.enqueue(f"p{i}", ("low", "mid", "high")[i % 3], (2, 4, 6, 9)[i % 4])
+    matches = lobby.match()
+    assert sum(len(m.tickets) for m in matches) + len(lobby) == 20_000
+    assert all(len(m.tickets) == m.seats for m in matches)
+
+@pytest.mark.parametrize("stakes,seats", [("nosebleed", 4), ("low", 5)])
+def test_rejects_unknown_queues(stakes, seats):
+    with pytest.raises(ValueError):
+        Lobby().enqueue("a", stakes, seats)
@@ -0,0 +1,69 @@
+import random
+import time
+import pytest
+from game.card import Card, Rank, Suit
+from game.engine import GameEngine
+from game.player import Player
+from ai import mcts_player
+from ai.mcts_player import determinize, get_mcts_decision, merge_stats, search
+
+@pytest.fixture
+def engine():
+    return GameEngine([Player(id=i, name=f"p{i}", chips=1000) for i in range(4)])
+
+def test_determinize_keeps_visible_cards(engine):
+    state = engine.snapshot()
+    world = determinize(state, 0, random.Random(7))
+
+    assert world.seats[0].hand == state.seats[0].hand
+    dealt = [c.to_int() for s in world.seats for c in s.hand] + [c.to_int() for c in world.deck]
+    assert sorted(dealt) == list(range(52))
+
+def test_search_respects_budget(engine):
+    state = engine.snapshot()
+    start = time.perf_counter()
+    stats = search(state, 0, 0.03, seed=1)
+    assert time.perf_counter() - start < 0.1
+    assert all(visits > 0 for visits, _ in stats.values())
+
+def test_decision_is_legal(engine):
+    decision = get_mcts_decision(engine.snapshot(), 0, budget_ms=30, workers=1)
+    assert decision["action"] in ("fold", "call", "raise")
+
+def test_folds_hopeless_spot(engine):
+    # Facing an all-in with seven-deuce offsuit on a board that gives nothing
+    engine.players[0].hand = [Card(Rank.SEVEN, Suit.CLUBS), Card(Rank.TWO, Suit.DIAMONDS)]
+    engine.process_player_action(0, "call")
+    engine.process_player_action(1, "raise", 1000)
+    for pid in (2, 3):
+        engine.process_player_action(pid, "fold")
+    state = engine.snapshot()
+
+    decision = get_mcts_decision(state, 0, budget_ms=150, workers=1)
+    assert decision == {"action": "fold", "amount": 0}
+
+def test_late_search_stops_at_the_callers_deadline(engine):
+    stats = search(engine.snapshot(), 0, 1.0, seed=1, deadline=time.monotonic() - 0.01)
+    assert all(visits == 0 for visits, _ in stats.values())
+
+def test_out_of_time_never_calls(engine):
+    engine.process_player_action(0, "raise", 500)
+    assert get_mcts_decision(engine.snapshot(), 1, budget_ms=0, workers=1) == {"action": "fold", "amount": 0}
+
+def test_cold_pool_does_not_queue_decisions(engine):
+    engine.process_player_action(0, "raise", 500)
+    state = engine.snapshot()
+    try:
+        # The first call pays for spawning; later ones must not wait behind its leftovers
+        for _ in range(3):
+            started = time.perf_counter()
+            decision = get_mcts_decision(state, 1, budget_ms=20, workers=2)
+            assert decision["action"] in ("fold", "call", "raise")
+        assert time.perf_counter() - started < 1.0
+    finally:
+        mcts_player._pool.shutdown(cancel_futures=True)
+        mcts_player._pool = None
+
+def test_merge_stats():
+    merged = merge_stats([{("call", 0): [2, 1.0]}, {("call", 0): [3, -0.5], ("fold", 0): [1, 0.0]}])
+    assert merged == {("call", 0): [5, 0.5], ("fold", 0): [1, 0.0]}
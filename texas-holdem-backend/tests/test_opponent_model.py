@@ -0,0 +1,79 @@
+import pytest
+from unittest.mock import patch
+from game.engine import GameEngine
+from game.player import Player
+from ai.opponent_model import OpponentModel
+from ai.gemini_player import _fallback_logic, _summarize_opponents
+
+@pytest.fixture
+def players():
+    return [Player(id=i, name=f"p{i}", chips=100000) for i in range(4)]
+
+def _play_hands(engine, hands, policy):
+    for i in range(hands):
+        if i:
+            engine.start_new_hand()
+        while engine.stage != "HAND_OVER":
+            pid = engine.active_player_id
+            engine.process_player_action(pid, *policy(engine, pid))
+
+def _maniac_p1(engine, pid):
+    if pid == 1:
+        return "raise", engine.bet_to_call + 40
+    return "call", 0
+
+def test_counts_preflop_and_postflop_tendencies(players):
+    model = OpponentModel(decay=1.0, min_hands=1)
+    engine = GameEngine(players, observers=[model])
+    _play_hands(engine, 3, _maniac_p1)
+
+    maniac, caller = model.get(1), model.get(0)
+    assert maniac.vpip_rate == maniac.pfr_rate == 1.0
+    assert maniac.aggressive > 0 and maniac.passive == 0
+    assert caller.pfr_rate == 0.0
+    assert caller.aggression_factor == 0.0
+    assert maniac.style() == "loose-aggressive"
+    assert caller.style() == "loose-passive"
+
+def test_decay_and_min_hands(players):
+    model = OpponentModel(decay=0.5, min_hands=3)
+    engine = GameEngine(players, observers=[model])
+    assert model.get(1) is None
+
+    _play_hands(engine, 4, _maniac_p1)
+    t = model.get(1)
+    # hands converges to 1 / (1 - decay) = 2 and never reaches min_hands
+    assert t is None
+    assert model.seats[1].hands < 2.0
+
+def test_raises_count_as_facing_a_bet(players):
+    model = OpponentModel(decay=1.0, min_hands=1)
+    engine = GameEngine(players, observers=[model])
+    # Seat 0 opens, 1 re-raises, 2 folds, 3 re-raises again and the first two fold to it
+    for pid, action, amount in [(0, "raise", 60), (1, "raise", 120), (2, "fold", 0),
+                                (3, "raise", 240), (0, "fold", 0), (1, "fold", 0)]:
+        engine.process_player_action(pid, action, amount)
+
+    assert [model.seats[pid].faced_bet for pid in range(4)] == [2, 2, 1, 1]
+    assert model.get(1).fold_to_bet_rate == 0.5
+    assert model.get(2).fold_to_bet_rate == 1.0
+    assert model.get(3).fold_to_bet_rate == 0.0
+
+def test_model_feeds_prompt_and_fallback(players):
+    model = OpponentModel(decay=1.0, min_hands=1)
+    engine = GameEngine(players, observers=[model])
+    _play_hands(engine, 3, _maniac_p1)
+
+    state = engine.to_dict(for_player_id=0)
+    summary = _summarize_opponents(state['players'], 0, model)
+    assert "p1: " in summary and "loose-aggressive" in summary
+
+    # p0 faces a raise from the maniac worth more than a quarter of its stack
+    state = engine.to_dict(for_player_id=0)
+    state['betToCall'] = 30000
+    state['players'][1].update(currentBet=30000, lastAction="Raise $30000", isFolded=False)
+    state['players'][0].update(currentBet=0, chips=100000, isFolded=False)
+
+    with patch('ai.gemini_player.random.random', return_value=0.5):
+        assert _fallback_logic(state, 0)['action'] == "fold"
+        assert _fallback_logic(state, 0, model)['action'] == "call"
@@ -0,0 +1,88 @@
+import pytest
+from game.engine import GameEngine
+from game.player import Player
+from game.hand_history import ActionCode, HandHistoryWriter, HandRecorder, iter_hands, segment_paths
+from analytics.player_stats import StatsAggregate, aggregate_segments, update_stats
+
+def _play(directory, hands, script):
+    writer = HandHistoryWriter(directory, segment_bytes=1, buffer_bytes=0)
+    players = [Player(id=i, name=n, chips=1000) for i, n in enumerate(["Hero", "Viper", "Mountain", "Shark"])]
+    engine = GameEngine(players, observers=[HandRecorder(writer)])
+    for _ in range(hands):
+        while engine.stage != "HAND_OVER":
+            pid = engine.active_player_id
+            action, amount = script(engine, pid)
+            engine.process_player_action(pid, action, amount)
+        for p in players:
+            p.chips = 1000
+        engine.start_new_hand()
+    writer.close()
+
+def _raise_or_fold(engine, pid):
+    # Viper raises pre-flop, everyone else folds to it
+    if engine.players[pid].name == "Viper" and engine.stage == "PRE_FLOP":
+        return "raise", engine.bet_to_call + 40
+    return "fold", 0
+
+def _hands_viper_acted(directory):
+    # Viper never acts when it is the big blind and everyone folds first
+    return sum(
+        any(a.seat == 1 and a.street == 0 and a.action != ActionCode.BLIND for a in hand.actions)
+        for hand in iter_hands(directory)
+    )
+
+def test_preflop_stats(tmp_path):
+    _play(str(tmp_path), 4, _raise_or_fold)
+    stats = aggregate_segments(segment_paths(str(tmp_path)), processes=1)
+
+    assert stats.hands == 4
+    viper = stats.players["Viper"]
+    assert viper.hands == 4
+    acted = _hands_viper_acted(str(tmp_path))
+    assert acted > 0
+    assert viper.vpip_hands == viper.pfr_hands == acted
+    hero = stats.players["Hero"]
+    assert hero.vpip_hands == 0
+    # Chips only move between seats
+    assert sum(p.net_chips for p in stats.players.values()) == 0
+
+def test_showdown_and_aggression(tmp_path):
+    _play(str(tmp_path), 2, lambda engine, pid: ("call", 0))
+    stats = aggregate_segments(segment_paths(str(tmp_path)), processes=1)
+
+    for p in stats.players.values():
+        assert p.showdowns == 2
+        assert p.aggressive_actions == 0
+    assert sum(p.showdowns_won for p in stats.players.values()) >= 2
+
+def test_parallel_matches_serial(tmp_path):
+    _play(str(tmp_path), 6, _raise_or_fold)
+    paths = segment_paths(str(tmp_path))
+    serial = aggregate_segments(paths, processes=1)
+    parallel = aggregate_segments(paths, processes=2)
+    assert serial.rows() == parallel.rows()
+
+def test_incremental_update(tmp_path):
+    hh_dir, state = str(tmp_path / "hh"), str(tmp_path / "state.json")
+    _play(hh_dir, 2, _raise_or_fold)
+    first = update_stats(hh_dir, state, processes=1)
+    assert first.hands == 2
+
+    again = update_stats(hh_dir, state, processes=1)
+    assert again.hands == 2
+
+    _play(hh_dir, 3, _raise_or_fold)
+    final = update_stats(hh_dir, state, processes=1)
+    assert final.hands == 5
+    assert final.players["Viper"].pfr_hands == _hands_viper_acted(hh_dir)
+
+def test_exports(tmp_path):
+    _play(str(tmp_path / "hh"), 1, _raise_or_fold)
+    stats = aggregate_segments(segment_paths(str(tmp_path / "hh")), processes=1)
+    stats.write_csv(str(tmp_path / "out.csv"))
+    stats.write_json(str(tmp_path / "out.json"))
+
+    header = (tmp_path / "out.csv").read_text().splitlines()[0]
+    assert header.startswith("name,hands,vpip,pfr,aggression_factor")
+    restored = StatsAggregate.from_state(stats.to_state())
+    assert restored.rows() == stats.rows()
@@ -0,0 +1,78 @@
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+from game import ranges
+from game.card import Card
+from game.ranges import _cached_equity, canonical, parse_range, range_equity
+
+def _cards(*texts):
+    return [Card.from_str(t) for t in texts]
+
+def test_parse_counts():
+    assert len(parse_range("AA")) == 6
+    assert len(parse_range("AKs")) == 4
+    assert len(parse_range("AKo")) == 12
+    assert len(parse_range("AK")) == 16
+    assert len(parse_range("QQ+,AKs,KQo")) == 18 + 4 + 12
+    assert len(parse_range("22-44")) == 18
+    assert len(parse_range("A5s-A2s")) == 16
+    assert len(parse_range("KTs+")) == 12
+    assert len(parse_range("AhKh")) == 1
+
+def test_weights_and_overrides():
+    weighted = parse_range("AKo:0.5,AhKd:1")
+    assert sorted(set(weighted.values())) == [0.5, 1.0]
+    assert parse_range("AA,AA:0") == {}
+
+@pytest.mark.parametrize("text", ["AKx", "AAs", "Z2", "AK:2", "A2s-K5s"])
+def test_invalid_notation(text):
+    with pytest.raises(ValueError):
+        parse_range(text)
+
+def test_canonical_ignores_order():
+    assert canonical("AKs,QQ") == canonical("QQ, AKs")
+
+def test_exact_river():
+    board = _cards("2S", "7H", "KD", "3C", "4C")
+    assert range_equity(["AA", "KK"], board) == [0.0, 1.0]
+
+def test_exact_flop_with_card_removal():
+    # The only ace-high combos left after the board and the other range's aces
+    board = _cards("AS", "7H", "2D")
+    aces, kings = range_equity(["AhAd", "KK"], board)
+    assert aces + kings == pytest.approx(1.0)
+    assert aces > 0.95
+
+def test_split_pot():
+    board = _cards("AS", "KS", "QS", "JS", "TS")
+    assert range_equity(["22", "33", "44"], board) == pytest.approx([1 / 3] * 3)
+
+def test_sampled_preflop_matches_known_equity():
+    aces, kings = range_equity(["AA", "KK"], samples=4000, processes=1, seed=3)
+    assert aces == pytest.approx(0.82, abs=0.03)
+
+def test_results_are_memoized():
+    first = range_equity(["QQ+", "AK"], samples=500, processes=1, seed=8)
+    hits = _cached_equity.cache_info().hits
+    # Same ranges in different notation hit the same cache entry
+    assert range_equity(["AA,KK,QQ", "AKs,AKo"], samples=500, processes=1, seed=8) == first
+    assert _cached_equity.cache_info().hits == hits + 1
+
+def test_worker_count_does_not_split_the_cache(monkeypatch):
+    first = range_equity(["JJ+", "AQ+"], samples=10_000, exact_limit=0, processes=1, seed=4)
+    hits = _cached_equity.cache_info().hits
+    assert range_equity(["JJ+", "AQ+"], samples=10_000, exact_limit=0, processes=2, seed=4) == first
+    assert _cached_equity.cache_info().hits == hits + 1
+
+    # Sharing the entry is safe: the chunks and their seeds do not depend on the worker count.
+    # Threads stand in for the spawn pool, which the eventlet-patched test process cannot start.
+    pools = []
+    monkeypatch.setattr(ranges, "_get_pool", lambda workers: pools.append(ThreadPoolExecutor(workers)) or pools[-1])
+    _cached_equity.cache_clear()
+    assert range_equity(["JJ+", "AQ+"], samples=10_000, exact_limit=0, processes=2, seed=4) == pytest.approx(first)
+    assert len(pools) == 1
+    pools[0].shutdown()
+
+def test_needs_two_ranges():
+    with pytest.raises(ValueError):
+        range_equity(["AA"])
@@ -0,0 +1,50 @@
+import subprocess
+import sys
+
+import pytest
+
+from ai import registry
+
+def test_builtin_backends_registered():
+    assert set(registry.names()) >= {"gemini", "mcts", "blueprint"}
+
+def test_unknown_backend_raises():
+    with pytest.raises(ValueError):
+        registry.get("oracle")
+
+def test_backends_load_on_first_use():
+    code = ("import sys, services; from ai import registry; "
+            "assert 'ai.mcts_player' not in sys.modules and 'google.generativeai' not in sys.modules; "
+            "assert registry.load_times()['mcts'] is None; "
+            "registry.get('mcts').load(); "
+            "assert 'ai.mcts_player' in sys.modules and registry.load_times()['mcts'] is not None")
+    subprocess.run([sys.executable, "-c", code], check=True)
+
+def test_register_custom_backend(monkeypatch):
+    monkeypatch.setitem(registry._backends, "always_fold", None)
+    backend = registry.register("always_fold", "tests.test_registry:_always_fold")
+    assert not backend.loaded
+    assert backend.decide({}, None, 3) == {"action": "fold", "amount": 0}
+    assert backend.loaded and registry.load_times()["always_fold"] is not None
+
+def test_warm_hook_runs_on_load(monkeypatch):
+    monkeypatch.setitem(registry._backends, "always_fold", None)
+    _warmed.clear()
+    backend = registry.register("always_fold", "tests.test_registry:_always_fold", warm="tests.test_registry:_warm")
+    backend.load()
+    backend.load()
+    assert _warmed == [True]
+
+def test_decide_async_runs_sync_backends_in_a_thread(monkeypatch):
+    import asyncio
+    monkeypatch.setitem(registry._backends, "always_fold", None)
+    backend = registry.register("always_fold", "tests.test_registry:_always_fold")
+    assert asyncio.run(backend.decide_async({}, None, 1)) == {"action": "fold", "amount": 0}
+
+_warmed = []
+
+def _warm():
+    _warmed.append(True)
+
+def _always_fold(state, snapshot, player_id, opponent_model=None):
+    return {"action": "fold", "amount": 0}
@@ -0,0 +1,77 @@
+import pytest
+from game.engine import GameEngine
+from game.player import Player
+from game.shot_clock import ShotClock
+from game.timer_wheel import TimerWheel
+
+class Clock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+@pytest.fixture
+def table():
+    clock = Clock()
+    events = []
+
+    def on_event(game, event):
+        events.append(event)
+        if event["phase"] == "expired":
+            shot_clock.sync(game)  # what the server's broadcast does
+
+    shot_clock = ShotClock(TimerWheel(tick=0.1, clock=clock), on_event, action_time=10, time_bank=5)
+    game = GameEngine([Player(id=i, name=f"p{i}", chips=1000, is_human=(i == 0)) for i in range(4)])
+    return game, shot_clock, clock, events
+
+def _run_until(shot_clock, clock, t):
+    while clock.now < t:
+        clock.now = round(clock.now + 0.1, 1)
+        shot_clock.wheel.advance()
+
+def test_turn_clock_then_time_bank_then_fold(table):
+    game, shot_clock, clock, events = table
+    assert game.active_player_id == 0
+    assert shot_clock.sync(game)["phase"] == "action"
+    assert shot_clock.sync(game) is None  # same turn, nothing rearmed
+    assert events == [{"gameId": game.id, "playerId": 0, "phase": "action", "seconds": 10.0, "timeBank": 5.0}]
+
+    _run_until(shot_clock, clock, 10)
+    assert events[-1]["phase"] == "timeBank" and events[-1]["seconds"] == 5.0
+    assert shot_clock.state(game)["phase"] == "timeBank"
+
+    _run_until(shot_clock, clock, 15)
+    assert [e["phase"] for e in events] == ["action", "timeBank", "expired", "action"]
+    assert events[2]["action"] == "fold" and game.players[0].is_folded
+    assert shot_clock.bank(game, 0) == 0
+    assert events[3]["playerId"] == 1
+
+def test_acting_in_the_bank_keeps_the_rest(table):
+    game, shot_clock, clock, events = table
+    shot_clock.sync(game)
+    _run_until(shot_clock, clock, 12)
+    game.process_player_action(0, "call")
+    shot_clock.sync(game)
+    assert shot_clock.bank(game, 0) == pytest.approx(3.0)
+    assert events[-1]["playerId"] == 1 and events[-1]["seconds"] == 10.0
+
+    _run_until(shot_clock, clock, 30)  # seat 1 never answers; its stale timers must not act again
+    assert game.players[1].is_folded and not game.players[0].is_folded
+
+def test_expiry_checks_when_nothing_to_call(table):
+    game, shot_clock, clock, events = table
+    for seat in (0, 1, 2):
+        game.process_player_action(seat, "call")
+    assert game.active_player_id == 3 and game.stage == "PRE_FLOP"  # the big blind's option
+    shot_clock.sync(game)
+    _run_until(shot_clock, clock, 15)
+    assert events[-2]["action"] == "check"
+    assert game.stage == "FLOP"
+
+def test_no_clock_once_the_hand_is_over(table):
+    game, shot_clock, clock, events = table
+    for seat in (0, 1, 2):
+        game.process_player_action(seat, "fold")
+    assert game.stage == "HAND_OVER"
+    assert shot_clock.sync(game) is None and len(shot_clock) == 0 and len(shot_clock.wheel) == 0
@@ -0,0 +1,73 @@
+import pytest
+from game.engine import GameEngine, apply
+from game.player import Player
+from game.state import is_terminal, legal_actions
+
+@pytest.fixture
+def engine():
+    return GameEngine([Player(id=i, name=f"p{i}", chips=1000) for i in range(4)])
+
+def test_snapshot_restore_round_trip(engine):
+    before = engine.snapshot()
+    engine.process_player_action(0, "raise", 60)
+    engine.process_player_action(1, "fold")
+    assert engine.snapshot() != before
+
+    engine.restore(before)
+    assert engine.snapshot() == before
+    assert engine.players[1].is_folded is False
+    assert engine.bet_to_call == 20
+
+def test_apply_is_pure_and_matches_engine(engine):
+    start = engine.snapshot()
+    after = apply(start, "raise", 60)
+
+    assert engine.snapshot() == start
+    assert after.seats[0].current_bet == 60
+    assert after.bet_to_call == 60
+    assert after.active_player_id == 1
+
+    engine.process_player_action(0, "raise", 60)
+    assert engine.snapshot() == after
+
+def test_branches_share_history(engine):
+    root = engine.snapshot()
+    folded = apply(root, "fold")
+    called = apply(root, "call")
+    assert folded.seats[0].is_folded and not called.seats[0].is_folded
+    # Untouched parts of the state are shared, not copied
+    assert folded.seats[0].hand[0] is root.seats[0].hand[0]
+    assert root.active_player_id == 0
+
+def test_play_to_showdown_through_apply(engine):
+    state = engine.snapshot()
+    steps = 0
+    while not is_terminal(state):
+        state = apply(state, "call")
+        steps += 1
+    assert state.stage == "HAND_OVER"
+    assert len(state.community_cards) == 5
+    assert sum(s.chips for s in state.seats) <= 4000
+    assert steps > 4
+
+def test_chained_apply_matches_fresh_restores(engine):
+    root = engine.snapshot()
+    chained = [root]
+    while not is_terminal(chained[-1]):
+        chained.append(apply(chained[-1], "call"))
+    # Replaying each step from a copy forces a full restore every time
+    for before, after in zip(chained, chained[1:]):
+        assert apply(before._replace(), "call") == after
+
+def test_legal_actions(engine):
+    state = engine.snapshot()
+    actions = legal_actions(state)
+    assert ("fold", 0) in actions and ("call", 0) in actions
+    raises = [amt for act, amt in actions if act == "raise"]
+    assert min(raises) == 40
+    assert max(raises) == 1000
+
+    checked = GameEngine.from_snapshot(state)
+    for pid in (0, 1, 2, 3):
+        checked.process_player_action(pid, "call")
+    assert ("check", 0) in legal_actions(checked.snapshot())
@@ -0,0 +1,90 @@
+import random
+import pytest
+from game.timer_wheel import TimerWheel
+
+class Clock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+@pytest.fixture
+def clock():
+    return Clock()
+
+def test_timers_fire_once_due_in_order(clock):
+    wheel = TimerWheel(tick=0.1, slots=8, levels=3, clock=clock)
+    fired = []
+    for delay in (5.0, 0.25, 1.0, 0.0):
+        wheel.schedule(delay, fired.append, delay)
+    assert len(wheel) == 4
+
+    clock.now = 0.2
+    assert wheel.advance() == 1 and fired == [0.0]
+    clock.now = 1.0
+    wheel.advance()
+    assert fired == [0.0, 0.25, 1.0]
+    clock.now = 4.9
+    assert wheel.advance() == 0
+    clock.now = 5.0
+    wheel.advance()
+    assert fired == [0.0, 0.25, 1.0, 5.0] and len(wheel) == 0
+
+def test_cancel(clock):
+    wheel = TimerWheel(tick=0.1, slots=8, clock=clock)
+    fired = []
+    timer = wheel.schedule(1.0, fired.append, "cancelled")
+    wheel.schedule(1.0, fired.append, "kept")
+    assert timer.cancel() and not timer.active
+    assert not timer.cancel()
+    clock.now = 2.0
+    wheel.advance()
+    assert fired == ["kept"] and len(wheel) == 0
+
+def test_callback_can_cancel_and_reschedule(clock):
+    wheel = TimerWheel(tick=0.1, slots=8, clock=clock)
+    fired = []
+    second = None
+
+    def first():
+        fired.append("first")
+        second.cancel()
+        wheel.schedule(0.5, fired.append, "again")
+
+    wheel.schedule(1.0, first)
+    second = wheel.schedule(1.0, fired.append, "second")
+    clock.now = 1.0
+    wheel.advance()
+    assert fired == ["first"] and len(wheel) == 1
+    clock.now = 1.5
+    wheel.advance()
+    assert fired == ["first", "again"]
+
+def test_many_timers_across_levels(clock):
+    # 16 slots x 3 levels: delays up to 600 s cascade through every level and past the top wheel's span
+    wheel = TimerWheel(tick=0.1, slots=16, levels=3, clock=clock)
+    rng = random.Random(3)
+    fired = []
+    timers = [(wheel.schedule(d, fired.append, d), d) for d in (rng.uniform(0, 600) for _ in range(3000))]
+    cancelled = {d for timer, d in timers[::5] if timer.cancel()}
+
+    while clock.now < 601:
+        clock.now += rng.uniform(0, 0.3)
+        start = len(fired)
+        wheel.advance()
+        assert all(clock.now - 0.45 < d <= clock.now for d in fired[start:])  # one step plus one tick late at most
+    assert len(fired) == 3000 - len(cancelled) and not cancelled & set(fired)
+    assert len(wheel) == 0
+
+def test_failing_callback_does_not_stop_the_wheel(clock):
+    wheel = TimerWheel(tick=0.1, clock=clock)
+    fired = []
+    wheel.schedule(0.1, lambda: 1 / 0)
+    wheel.schedule(0.1, fired.append, "after")
+    clock.now = 0.1
+    assert wheel.advance() == 2 and fired == ["after"]
+
+def test_slots_must_be_a_power_of_two():
+    with pytest.raises(ValueError):
+        TimerWheel(slots=100)
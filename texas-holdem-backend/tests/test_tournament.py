@@ -0,0 +1,102 @@
+import pytest
+from game.tournament import DEFAULT_SCHEDULE, Tournament
+from ai.batch_policy import fallback_policy
+
+def _names(n):
+    return [f"b{i}" for i in range(n)]
+
+def test_initial_seating_is_balanced():
+    tournament = Tournament(_names(50), seats=9, seed=1)
+    sizes = [t.size for t in tournament.tables]
+
+    assert len(sizes) == 6
+    assert sum(sizes) == 50
+    assert max(sizes) - min(sizes) <= 1
+    assert tournament.batch.chips.shape == (6, 9)
+
+def test_rejects_bad_settings():
+    with pytest.raises(ValueError):
+        Tournament(_names(1))
+    with pytest.raises(ValueError):
+        Tournament(_names(10), seats=2)
+
+def test_runs_to_a_single_winner():
+    tournament = Tournament(_names(40), seats=6, seed=3)
+    winner = tournament.run(fallback_policy, max_steps=200_000)
+
+    assert tournament.finished
+    assert winner is not None and winner.finish is None
+    assert winner.chips == 40 * 1500
+    # Every other entrant got a distinct finishing place from 40th to 2nd
+    assert sorted(e.finish for e in tournament.entrants if e is not winner) == list(range(2, 41))
+    assert tournament.open_tables == 1
+
+def test_tables_stay_balanced_and_break():
+    tournament = Tournament(_names(60), seats=6, seed=5)
+    open_counts = []
+
+    def check(t, busts):
+        open_tables = [x for x in t.tables if not x.closed and not x.breaking]
+        sizes = [x.size for x in open_tables]
+        # Balancing only moves players between hands, so allow one hand of slack
+        assert max(sizes) - min(sizes) <= 2
+        assert all(size <= t.seats for size in sizes)
+        assert sum(x.size for x in t.tables if not x.closed) == t.alive
+        open_counts.append(t.open_tables)
+
+    tournament.run(fallback_policy, max_steps=200_000, on_step=check)
+
+    assert open_counts[0] == 10
+    assert open_counts[-1] == 1
+    assert open_counts == sorted(open_counts, reverse=True)
+
+def test_same_hand_busts_place_by_starting_stack():
+    tournament = Tournament(_names(4), seats=4, seed=0)
+    table = tournament.tables[0]
+    # The lower id starts the hand with the bigger stack
+    starts = {0: 1500, 1: 900, 2: 300, 3: 3300}
+    for entrant in table.seated:
+        entrant.chips = starts[entrant.id]
+    for entrant, player in zip(table.seated, table.engine.players):
+        player.chips = 6000 if entrant.id == 3 else 1500 if entrant.id == 0 else 0
+
+    busted = tournament._finish_hand(table)
+    assert [(e.id, e.finish) for e in busted] == [(2, 4), (1, 3)]
+
+def test_blinds_rise_and_keep_doubling():
+    tournament = Tournament(_names(2), hands_per_level=1, schedule=[(10, 20), (20, 40)])
+    assert tournament.blinds() == (10, 20)
+
+    tournament.level = 1
+    assert tournament.blinds() == (20, 40)
+    tournament.level = 3
+    assert tournament.blinds() == (80, 160)
+
+def test_level_advances_with_hands():
+    tournament = Tournament(_names(18), seats=9, hands_per_level=2, seed=0)
+    while tournament.hands_played < 4:
+        tournament.step(fallback_policy)
+
+    assert tournament.level >= 1
+    assert tournament.tables[0].engine.big_blind >= DEFAULT_SCHEDULE[0][1]
+
+def test_standings():
+    tournament = Tournament(_names(30), seats=6, seed=2)
+    standings = tournament.standings(limit=5)
+
+    assert standings["remaining"] == 30
+    assert standings["tables"] == 5
+    assert standings["blinds"] == list(DEFAULT_SCHEDULE[0])
+    assert standings["winner"] is None
+    assert len(standings["leaders"]) == 5
+    chips = [leader["chips"] for leader in standings["leaders"]]
+    assert chips == sorted(chips, reverse=True)
+
+def test_standings_include_icm_equity():
+    tournament = Tournament(_names(12), seats=6, payouts=[50, 30, 20], seed=4)
+    leaders = tournament.standings(limit=12)["leaders"]
+
+    # Everyone starts level, so the prize pool splits evenly
+    assert sum(leader["equity"] for leader in leaders) == pytest.approx(100, abs=0.5)
+    assert all(leader["equity"] == pytest.approx(100 / 12, abs=2) for leader in leaders)
+    assert Tournament(_names(12), seed=4).standings()["leaders"][0]["equity"] is None
@@ -0,0 +1,38 @@
+import math
+import random
+from typing import Callable, List, Optional
+
+def parse_distribution(spec: str, rng: Optional[random.Random] = None) -> Callable[[], float]:
+    """
+    Builds a sampler of non-negative delays (seconds) from a short spec.
+    Supported: '0.5' or 'const:0.5', 'uniform:LO:HI', 'exp:MEAN', 'lognorm:MEDIAN:SIGMA'.
+    """
+    rng = rng or random.Random()
+    kind, _, rest = spec.partition(':')
+    if not rest:
+        kind, rest = 'const', kind
+    args = [float(x) for x in rest.split(':')]
+
+    if kind == 'const' and len(args) == 1:
+        value = max(0.0, args[0])
+        return lambda: value
+    if kind == 'uniform' and len(args) == 2:
+        lo, hi = args
+        return lambda: max(0.0, rng.uniform(lo, hi))
+    if kind == 'exp' and len(args) == 1:
+        mean = args[0]
+        if mean <= 0:
+            return lambda: 0.0
+        return lambda: rng.expovariate(1.0 / mean)
+    if kind == 'lognorm' and len(args) == 2:
+        mu, sigma = math.log(args[0]), args[1]
+        return lambda: rng.lognormvariate(mu, sigma)
+
+    raise ValueError(f"Invalid distribution spec: {spec!r}")
+
+def percentile(sorted_values: List[float], pct: float) -> float:
+    """Nearest-rank percentile of an already sorted list."""
+    if not sorted_values:
+        return 0.0
+    rank = math.ceil(pct / 100.0 * len(sorted_values)) - 1
+    return sorted_values[max(0, min(len(sorted_values) - 1, rank))]
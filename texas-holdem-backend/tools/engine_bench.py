@@ -0,0 +1,70 @@
+"""
+Micro-benchmark of GameEngine betting actions at full-ring table sizes.
+
+Plays hands with a cheap random policy (fold / call / raise) and times only
+process_player_action, plus the restore-act-snapshot cycle that search uses
+through game.engine.apply.
+
+    python -m tools.engine_bench --seats 6,9,10 --hands 20000
+"""
+import argparse
+import random
+import time
+from typing import Dict, List, Optional
+
+from game.engine import GameEngine, apply
+from game.player import Player
+
+def bench(seats: int, hands: int, stack: int = 2000, seed: int = 0) -> Dict[str, float]:
+    rng = random.Random(seed)
+    engine = GameEngine([Player(id=i, name=f"Bot{i}", chips=stack) for i in range(seats)], seed=seed)
+    total = seats * stack
+    actions = 0
+    action_s = 0.0
+    apply_s = 0.0
+    applies = 0
+    for hand in range(hands):
+        if hand:  # the constructor dealt the first hand
+            if sum(1 for p in engine.players if p.chips > 0) < 2:
+                for p in engine.players:
+                    p.chips = stack
+            engine.start_new_hand()
+        while engine.stage not in ("HAND_OVER", "SHOWDOWN"):
+            roll = rng.random()
+            if roll < 0.15:
+                action, amount = "fold", 0
+            elif roll < 0.85:
+                action, amount = "call", 0
+            else:
+                action, amount = "raise", engine.bet_to_call + engine.big_blind * rng.randint(1, 6)
+            if applies < hands:
+                started = time.perf_counter()
+                apply(engine.snapshot(), action, amount)
+                apply_s += time.perf_counter() - started
+                applies += 1
+            started = time.perf_counter()
+            engine.process_player_action(engine.active_player_id, action, amount)
+            action_s += time.perf_counter() - started
+            actions += 1
+        assert sum(p.chips for p in engine.players) == total, "chips not conserved"
+    return {
+        "seats": seats,
+        "actions": actions,
+        "us_per_action": round(action_s / actions * 1e6, 2),
+        "us_per_apply": round(apply_s / max(applies, 1) * 1e6, 2),
+    }
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Time GameEngine actions per table size")
+    parser.add_argument("--seats", default="2,6,9,10")
+    parser.add_argument("--hands", type=int, default=20000)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    print(f"{'seats':>6}{'actions':>10}{'us/action':>12}{'us/apply':>12}")
+    for seats in (int(s) for s in args.seats.split(",")):
+        result = bench(seats, args.hands, seed=args.seed)
+        print(f"{seats:>6}{result['actions']:>10}{result['us_per_action']:>12}{result['us_per_apply']:>12}")
+
+if __name__ == "__main__":
+    main()
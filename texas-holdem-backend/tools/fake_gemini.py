@@ -0,0 +1,155 @@
+"""
+Local stand-in for the Gemini REST API, for offline load testing.
+
+Point the backend at it with:
+    GOOGLE_API_KEY=fake GEMINI_API_ENDPOINT=http://127.0.0.1:8089 python app.py
+
+and start it with:
+    python -m tools.fake_gemini --latency exp:0.3 --error-rate 0.05
+"""
+import argparse
+import json
+import logging
+import random
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable, Dict, Tuple
+
+from tools.distributions import parse_distribution
+
+logger = logging.getLogger('poker.fake_gemini')
+
+TO_CALL_RE = re.compile(r"To Call: \$(\d+)")
+CURRENT_BET_RE = re.compile(r"Current Bet: \$(\d+)")
+
+class FakeGeminiConfig:
+    def __init__(self, latency: Callable[[], float], error_rate: float = 0.0,
+                 error_status: int = 503, malformed_rate: float = 0.0,
+                 raise_rate: float = 0.1, seed: int = None):
+        self.latency = latency
+        self.error_rate = error_rate
+        self.error_status = error_status
+        self.malformed_rate = malformed_rate
+        self.raise_rate = raise_rate
+        self.rng = random.Random(seed)
+        self.lock = threading.Lock()
+        self.stats = {"requests": 0, "errors": 0, "malformed": 0}
+
+    def roll(self) -> float:
+        with self.lock:
+            return self.rng.random()
+
+    def count(self, key: str) -> None:
+        with self.lock:
+            self.stats[key] += 1
+
+def choose_action(prompt: str, raise_roll: float, raise_rate: float) -> Dict[str, int]:
+    """Cheap stand-in policy: check when free, otherwise call, occasionally raise."""
+    match = TO_CALL_RE.search(prompt)
+    to_call = int(match.group(1)) if match else 0
+    match = CURRENT_BET_RE.search(prompt)
+    current_bet = int(match.group(1)) if match else 0
+
+    if raise_roll < raise_rate:
+        # The engine takes raise amounts as the new total bet, like _fallback_logic
+        return {"action": "raise", "amount": current_bet + to_call + 40}
+    if to_call == 0:
+        return {"action": "check", "amount": 0}
+    return {"action": "call", "amount": 0}
+
+def build_response(text: str) -> Dict:
+    return {
+        "candidates": [{
+            "content": {"parts": [{"text": text}], "role": "model"},
+            "finishReason": "STOP",
+            "index": 0,
+        }]
+    }
+
+def handle_generate(config: FakeGeminiConfig, body: bytes) -> Tuple[int, Dict]:
+    config.count("requests")
+    time.sleep(config.latency())
+
+    if config.roll() < config.error_rate:
+        config.count("errors")
+        return config.error_status, {"error": {"code": config.error_status, "message": "Injected failure", "status": "UNAVAILABLE"}}
+
+    if config.roll() < config.malformed_rate:
+        config.count("malformed")
+        return 200, build_response("I think I will go all in, no JSON for you.")
+
+    try:
+        payload = json.loads(body or b"{}")
+        prompt = payload["contents"][0]["parts"][0]["text"]
+    except (ValueError, KeyError, IndexError):
+        prompt = ""
+
+    decision = choose_action(prompt, config.roll(), config.raise_rate)
+    return 200, build_response(f"```json\n{json.dumps(decision)}\n```")
+
+def make_handler(config: FakeGeminiConfig):
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def do_POST(self):
+            length = int(self.headers.get("Content-Length", 0))
+            body = self.rfile.read(length)
+
+            if self.path.split('?')[0].endswith(":generateContent"):
+                status, payload = handle_generate(config, body)
+            else:
+                status, payload = 404, {"error": {"code": 404, "message": "Not found", "status": "NOT_FOUND"}}
+
+            data = json.dumps(payload).encode()
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+
+        def log_message(self, fmt, *args):
+            logger.debug(fmt, *args)
+
+    return Handler
+
+def serve(host: str, port: int, config: FakeGeminiConfig) -> ThreadingHTTPServer:
+    server = ThreadingHTTPServer((host, port), make_handler(config))
+    server.daemon_threads = True
+    return server
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Fake Gemini generateContent endpoint")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8089)
+    parser.add_argument("--latency", default="exp:0.3", help="Response delay distribution (see tools.distributions)")
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--error-status", type=int, default=503)
+    parser.add_argument("--malformed-rate", type=float, default=0.0)
+    parser.add_argument("--raise-rate", type=float, default=0.1)
+    parser.add_argument("--seed", type=int, default=None)
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s [%(levelname)s] %(name)s: %(message)s', datefmt='%H:%M:%S')
+
+    config = FakeGeminiConfig(
+        latency=parse_distribution(args.latency),
+        error_rate=args.error_rate,
+        error_status=args.error_status,
+        malformed_rate=args.malformed_rate,
+        raise_rate=args.raise_rate,
+        seed=args.seed,
+    )
+    server = serve(args.host, args.port, config)
+    logger.info(f"Fake Gemini listening on http://{args.host}:{args.port}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        logger.info(f"Served: {config.stats}")
+        server.server_close()
+
+if __name__ == "__main__":
+    main()
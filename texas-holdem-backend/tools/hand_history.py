@@ -0,0 +1,39 @@
+"""
+Hand history utilities.
+
+    python -m tools.hand_history convert hand_histories/ -o hands.txt
+    python -m tools.hand_history count hand_histories/
+"""
+import argparse
+import sys
+
+from game.hand_history import iter_hands, to_text
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Inspect binary hand histories")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    convert = sub.add_parser("convert", help="Write standard text hand histories")
+    convert.add_argument("path", help="Segment file or hand history directory")
+    convert.add_argument("-o", "--output", default=None, help="Output file (default: stdout)")
+
+    count = sub.add_parser("count", help="Count recorded hands")
+    count.add_argument("path")
+
+    args = parser.parse_args()
+
+    if args.command == "count":
+        print(sum(1 for _ in iter_hands(args.path)))
+        return
+
+    out = open(args.output, "w") if args.output else sys.stdout
+    try:
+        for hand in iter_hands(args.path):
+            out.write(to_text(hand))
+            out.write("\n")
+    finally:
+        if out is not sys.stdout:
+            out.close()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,206 @@
+"""
+Load generator for the poker backend.
+
+Creates games through ``POST /api/game``, joins each one over Socket.IO and
+plays the human seat with a configurable think time. Reports percentiles of
+the delay between emitting an ``action`` and receiving the resulting
+``update``, plus overall throughput.
+
+    python -m tools.load_test --games 2000 --concurrency 500 --think exp:0.5
+
+Needs the client packages from requirements.txt (python-socketio[client], requests).
+"""
+import eventlet
+eventlet.monkey_patch()
+
+import argparse
+import json
+import logging
+import random
+import time
+from typing import Callable, Dict, List, Optional
+
+import requests
+import socketio
+
+from tools.distributions import parse_distribution, percentile
+
+logger = logging.getLogger('poker.loadtest')
+
+class LoadStats:
+    def __init__(self) -> None:
+        self.latencies: List[float] = []
+        self.actions = 0
+        self.updates = 0
+        self.hands = 0
+        self.games_started = 0
+        self.games_finished = 0
+        self.stalled = 0
+        self.errors = 0
+
+    def summary(self, elapsed: float) -> Dict[str, float]:
+        lat = sorted(self.latencies)
+        elapsed = max(elapsed, 1e-9)
+        return {
+            "games_started": self.games_started,
+            "games_finished": self.games_finished,
+            "games_stalled": self.stalled,
+            "hands": self.hands,
+            "actions": self.actions,
+            "updates": self.updates,
+            "errors": self.errors,
+            "elapsed_s": round(elapsed, 3),
+            "actions_per_s": round(self.actions / elapsed, 2),
+            "updates_per_s": round(self.updates / elapsed, 2),
+            "hands_per_s": round(self.hands / elapsed, 2),
+            "latency_p50_ms": round(percentile(lat, 50) * 1000, 2),
+            "latency_p95_ms": round(percentile(lat, 95) * 1000, 2),
+            "latency_p99_ms": round(percentile(lat, 99) * 1000, 2),
+            "latency_max_ms": round(lat[-1] * 1000, 2) if lat else 0.0,
+        }
+
+class SimulatedPlayer:
+    """Plays the human seat of a single game until it has finished `hands` hands."""
+
+    def __init__(self, base_url: str, stats: LoadStats, think: Callable[[], float],
+                 hands: int, stall_timeout: float, player_id: int = 0):
+        self.base_url = base_url
+        self.stats = stats
+        self.think = think
+        self.hands_left = hands
+        self.stall_timeout = stall_timeout
+        self.player_id = player_id
+
+        self.http = requests.Session()
+        self.sio = socketio.Client(reconnection=False)
+        self.game_id: Optional[str] = None
+        self.pending_since: Optional[float] = None
+        self.acting = False
+        self.last_event = time.monotonic()
+        self.done = eventlet.event.Event()
+
+        self.sio.on('connect', self._on_connect)
+        self.sio.on('update', self._on_update)
+        self.sio.on('error', self._on_error)
+
+    def run(self) -> None:
+        try:
+            resp = self.http.post(f"{self.base_url}/api/game", json={"playerName": "LoadBot"}, timeout=30)
+            resp.raise_for_status()
+            self.game_id = resp.json()['gameId']
+            self.stats.games_started += 1
+
+            self.sio.connect(self.base_url, wait_timeout=30)
+            while not self.done.ready():
+                if time.monotonic() - self.last_event > self.stall_timeout:
+                    self.stats.stalled += 1
+                    logger.warning(f"[{self.game_id[:8]}] stalled, giving up")
+                    break
+                eventlet.sleep(0.5)
+            else:
+                self.stats.games_finished += 1
+        except Exception as e:
+            self.stats.errors += 1
+            logger.warning(f"Game session failed: {e}")
+        finally:
+            if self.sio.connected:
+                self.sio.disconnect()
+            self.http.close()
+
+    def _on_connect(self) -> None:
+        self.sio.emit('join', {'gameId': self.game_id})
+
+    def _on_error(self, data) -> None:
+        self.stats.errors += 1
+        self.pending_since = None
+        self.acting = False
+        logger.debug(f"[{self.game_id[:8]}] server error: {data}")
+
+    def _on_update(self, state: dict) -> None:
+        self.last_event = time.monotonic()
+        self.stats.updates += 1
+
+        if self.pending_since is not None:
+            self.stats.latencies.append(time.perf_counter() - self.pending_since)
+            self.pending_since = None
+            self.acting = False
+
+        self._handle_state(state)
+
+    def _handle_state(self, state: dict) -> None:
+        if state['stage'] == "HAND_OVER":
+            self.stats.hands += 1
+            self.hands_left -= 1
+            if self.hands_left <= 0:
+                self.done.send()
+                return
+            self.sio.start_background_task(self._next_hand)
+        elif state['activePlayerId'] == self.player_id and not self.acting:
+            self.acting = True
+            self.sio.start_background_task(self._act, state)
+
+    def _next_hand(self) -> None:
+        try:
+            resp = self.http.post(f"{self.base_url}/api/game/{self.game_id}/next", timeout=30)
+            resp.raise_for_status()
+        except Exception as e:
+            self.stats.errors += 1
+            logger.warning(f"[{self.game_id[:8]}] next hand failed: {e}")
+            self.done.send()
+            return
+        self.last_event = time.monotonic()
+        self._handle_state(resp.json())
+
+    def _act(self, state: dict) -> None:
+        eventlet.sleep(self.think())
+
+        me = next(p for p in state['players'] if p['id'] == self.player_id)
+        to_call = state['betToCall'] - me['currentBet']
+        action = 'call' if to_call > 0 else 'check'
+
+        self.pending_since = time.perf_counter()
+        self.stats.actions += 1
+        self.sio.emit('action', {'gameId': self.game_id, 'action': action})
+
+def run_load(base_url: str, games: int, concurrency: int, think: Callable[[], float],
+             hands: int = 1, ramp: float = 0.0, stall_timeout: float = 60.0) -> Dict[str, float]:
+    stats = LoadStats()
+    pool = eventlet.GreenPool(concurrency)
+    start = time.perf_counter()
+
+    for i in range(games):
+        player = SimulatedPlayer(base_url, stats, think, hands, stall_timeout)
+        pool.spawn_n(player.run)
+        if ramp and i < concurrency:
+            eventlet.sleep(ramp / concurrency)
+
+    pool.waitall()
+    return stats.summary(time.perf_counter() - start)
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Socket.IO client swarm for the poker backend")
+    parser.add_argument("--url", default="http://localhost:5001")
+    parser.add_argument("--games", type=int, default=100, help="Total games to create")
+    parser.add_argument("--concurrency", type=int, default=50, help="Games played at the same time")
+    parser.add_argument("--hands", type=int, default=1, help="Hands to play per game")
+    parser.add_argument("--think", default="exp:0.5", help="Human think-time distribution (see tools.distributions)")
+    parser.add_argument("--ramp", type=float, default=0.0, help="Seconds over which to start the first wave")
+    parser.add_argument("--stall-timeout", type=float, default=60.0)
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--json", dest="json_path", default=None, help="Also write the summary to this file")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s [%(levelname)s] %(name)s: %(message)s', datefmt='%H:%M:%S')
+
+    think = parse_distribution(args.think, random.Random(args.seed))
+    summary = run_load(args.url, args.games, args.concurrency, think,
+                       hands=args.hands, ramp=args.ramp, stall_timeout=args.stall_timeout)
+
+    for key, value in summary.items():
+        print(f"{key:>16}: {value}")
+    if args.json_path:
+        with open(args.json_path, 'w') as f:
+            json.dump(summary, f, indent=2)
+
+if __name__ == "__main__":
+    main()
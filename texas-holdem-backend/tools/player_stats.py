@@ -0,0 +1,33 @@
+"""
+Player statistics over recorded hand histories.
+
+    python -m tools.player_stats hand_histories/ --state stats_state.json --csv stats.csv -j 4
+"""
+import argparse
+
+from analytics.player_stats import update_stats
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="VPIP/PFR/AF/showdown stats per player")
+    parser.add_argument("directory", help="Hand history directory")
+    parser.add_argument("--state", default=None, help="State file for incremental runs")
+    parser.add_argument("--csv", default=None)
+    parser.add_argument("--json", dest="json_path", default=None)
+    parser.add_argument("-j", "--processes", type=int, default=None, help="Worker processes (default: all cores)")
+    args = parser.parse_args()
+
+    stats = update_stats(args.directory, args.state, args.processes)
+
+    if args.csv:
+        stats.write_csv(args.csv)
+    if args.json_path:
+        stats.write_json(args.json_path)
+
+    print(f"{stats.hands} hands from {len(stats.segments)} segments")
+    print(f"{'name':<12} {'hands':>7} {'vpip':>6} {'pfr':>6} {'af':>6} {'wsd':>6} {'bb/100':>8}")
+    for row in stats.rows():
+        print(f"{row['name']:<12} {row['hands']:>7} {row['vpip']:>6.1%} {row['pfr']:>6.1%} "
+              f"{row['aggression_factor']:>6.2f} {row['showdown_winrate']:>6.1%} {row['bb_per_100']:>8.1f}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+"""
+Compares server modes under the same tools.load_test swarm.
+
+Starts each server in a subprocess, drives it with load_test and reports the
+server's own CPU time and peak memory next to the client-side numbers, so
+modes can be compared per core even when the swarm shares the machine.
+
+    python -m tools.server_bench --games 600 --concurrency 300
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+import urllib.request
+from typing import Dict, List, Optional
+
+MODES = {
+    "eventlet": [sys.executable, "-c", "import app; app.socketio.run(app.app, host='127.0.0.1', port={port})"],
+    "asgi": [sys.executable, "-m", "uvicorn", "asgi_app:app", "--host", "127.0.0.1", "--port", "{port}",
+             "--log-level", "warning"],
+}
+
+def _cpu_seconds(pid: int) -> float:
+    with open(f"/proc/{pid}/stat") as f:
+        fields = f.read().rsplit(")", 1)[1].split()
+    return (int(fields[11]) + int(fields[12])) / os.sysconf("SC_CLK_TCK")
+
+def _peak_rss_mb(pid: int) -> float:
+    with open(f"/proc/{pid}/status") as f:
+        for line in f:
+            if line.startswith("VmHWM:"):
+                return int(line.split()[1]) / 1024
+    return 0.0
+
+def _wait_ready(url: str, timeout: float = 30.0) -> None:
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        try:
+            urllib.request.urlopen(f"{url}/socket.io/?EIO=4&transport=polling", timeout=1)
+            return
+        except OSError:
+            time.sleep(0.2)
+    raise RuntimeError(f"Server at {url} did not start")
+
+def bench(mode: str, port: int, load_args: List[str]) -> Dict[str, float]:
+    url = f"http://127.0.0.1:{port}"
+    command = [part.format(port=port) for part in MODES[mode]]
+    server = subprocess.Popen(command, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    try:
+        _wait_ready(url)
+        idle_cpu = _cpu_seconds(server.pid)
+        with tempfile.NamedTemporaryFile(suffix=".json") as out:
+            subprocess.run([sys.executable, "-m", "tools.load_test", "--url", url, "--json", out.name] + load_args,
+                           check=True, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+            summary = json.load(open(out.name))
+        cpu = _cpu_seconds(server.pid) - idle_cpu
+        summary.update({
+            "server_cpu_s": round(cpu, 2),
+            "server_cpu_ms_per_action": round(cpu * 1000 / max(summary["actions"], 1), 2),
+            "server_peak_rss_mb": round(_peak_rss_mb(server.pid), 1),
+        })
+        return summary
+    finally:
+        server.terminate()
+        server.wait(timeout=10)
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Benchmark the eventlet and asyncio server modes")
+    parser.add_argument("--modes", default="eventlet,asgi")
+    parser.add_argument("--port", type=int, default=5055)
+    parser.add_argument("--games", type=int, default=400)
+    parser.add_argument("--concurrency", type=int, default=200)
+    parser.add_argument("--think", default="exp:0.3")
+    args = parser.parse_args(argv)
+
+    load_args = ["--games", str(args.games), "--concurrency", str(args.concurrency), "--think", args.think]
+    results = {mode: bench(mode, args.port, load_args) for mode in args.modes.split(",")}
+    keys = ["games_finished", "games_stalled", "actions_per_s", "latency_p50_ms", "latency_p95_ms",
+            "latency_p99_ms", "server_cpu_s", "server_cpu_ms_per_action", "server_peak_rss_mb"]
+    print(f"{'':>26}" + "".join(f"{mode:>12}" for mode in results))
+    for key in keys:
+        print(f"{key:>26}" + "".join(f"{results[mode][key]:>12}" for mode in results))
+
+if __name__ == "__main__":
+    main()
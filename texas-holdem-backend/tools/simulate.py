@@ -0,0 +1,83 @@
+"""
+Headless bot-vs-bot simulator over many tables at once.
+
+Every step asks a vectorised policy for one decision per waiting table and
+applies them through the engines; finished hands are redealt until each table
+has played --hands hands. Deals come from pre-generated deck orders, so the
+same --seed replays the same run. Busted tables are restocked so they keep playing.
+
+    python -m tools.simulate --tables 2000 --hands 20 --seats 6
+"""
+import argparse
+import logging
+import time
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from ai.batch_policy import fallback_policy
+from game.batch import BatchTables, deal_orders
+from game.deck import Deck
+from game.engine import GameEngine
+from game.player import Player
+
+MAX_STEPS_PER_HAND = 500
+
+def _new_table(seats: int, stack: int, seed: int) -> GameEngine:
+    return GameEngine([Player(id=i, name=f"Bot{i}", chips=stack) for i in range(seats)], seed=seed)
+
+def simulate(tables: int, hands: int, seats: int = 4, stack: int = 1000,
+             seed: Optional[int] = None) -> Dict[str, float]:
+    rng = np.random.default_rng(seed)
+    batch = BatchTables([_new_table(seats, stack, int(rng.integers(2**32))) for _ in range(tables)])
+    cards_per_hand = 2 * seats + 5
+    hands_left = np.full(tables, hands, dtype=np.int64)
+    decisions = 0
+    started = time.perf_counter()
+
+    for _ in range(hands * MAX_STEPS_PER_HAND):
+        actions, amounts = fallback_policy(batch, rng)
+        decisions += batch.apply(actions, amounts)
+
+        finished = np.flatnonzero(~batch.waiting() & (hands_left > 0)).tolist()
+        orders = deal_orders(len(finished), cards_per_hand, rng)
+        for row, order in zip(finished, orders):
+            hands_left[row] -= 1
+            if hands_left[row] == 0:
+                continue
+            engine = batch.engines[row]
+            if sum(1 for p in engine.players if p.chips > 0) < 2:
+                for p in engine.players:
+                    p.chips = stack
+            engine.start_new_hand(Deck.from_codes(order))
+        batch.refresh(finished)
+        if not batch.waiting().any():
+            break
+
+    elapsed = max(time.perf_counter() - started, 1e-9)
+    played = int(tables * hands - hands_left.sum())
+    return {
+        "tables": tables,
+        "hands": played,
+        "decisions": decisions,
+        "elapsed_s": round(elapsed, 3),
+        "decisions_per_s": round(decisions / elapsed, 1),
+        "hands_per_s": round(played / elapsed, 1),
+    }
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Batched headless bot simulation")
+    parser.add_argument("--tables", type=int, default=1000)
+    parser.add_argument("--hands", type=int, default=10, help="Hands per table")
+    parser.add_argument("--seats", type=int, default=4)
+    parser.add_argument("--stack", type=int, default=1000)
+    parser.add_argument("--seed", type=int, default=None)
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.WARNING)
+    summary = simulate(args.tables, args.hands, args.seats, args.stack, args.seed)
+    for key, value in summary.items():
+        print(f"{key:>16}: {value}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,57 @@
+"""
+Cold-start timings: how long a fresh interpreter takes to import each entry point.
+
+Every target runs in its own subprocess, so nothing is cached from earlier
+imports; the reported figure is the median over --runs starts. "total" is
+the whole process, interpreter start-up included.
+
+    python -m tools.startup --runs 5
+"""
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+import time
+from typing import Dict, List, Optional
+
+TARGETS = {
+    # entry point -> code run after the timer starts
+    "app": "import app; app.create_app()",
+    "asgi_app": "import asgi_app; asgi_app.create_app()",
+    "services": "import services",
+    "tools.simulate": "import tools.simulate",
+    "mcts worker": "import ai.mcts_player",
+    "gemini backend": "from ai import registry; registry.get('gemini').load()",
+}
+
+PROBE = """
+import json, logging, time
+logging.disable(logging.CRITICAL)
+started = time.perf_counter()
+{code}
+print(json.dumps({{"import_ms": (time.perf_counter() - started) * 1000}}))
+"""
+
+def measure(code: str) -> Dict[str, float]:
+    started = time.perf_counter()
+    out = subprocess.run([sys.executable, "-c", PROBE.format(code=code)], check=True,
+                         capture_output=True, text=True).stdout
+    total_ms = (time.perf_counter() - started) * 1000
+    return {"import_ms": json.loads(out.strip().splitlines()[-1])["import_ms"], "total_ms": total_ms}
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Measure cold-start import times of the entry points")
+    parser.add_argument("--runs", type=int, default=3)
+    parser.add_argument("--targets", default=",".join(TARGETS))
+    args = parser.parse_args(argv)
+
+    print(f"{'':>16}{'import ms':>12}{'total ms':>12}")
+    for name in args.targets.split(","):
+        samples = [measure(TARGETS[name]) for _ in range(args.runs)]
+        import_ms = statistics.median(s["import_ms"] for s in samples)
+        total_ms = statistics.median(s["total_ms"] for s in samples)
+        print(f"{name:>16}{import_ms:>12.0f}{total_ms:>12.0f}")
+
+if __name__ == "__main__":
+    main()
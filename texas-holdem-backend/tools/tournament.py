@@ -0,0 +1,36 @@
+"""
+Plays a bot-only multi-table tournament to the end and prints the result.
+
+    python -m tools.tournament --entrants 3000 --seats 9 --seed 1
+"""
+import argparse
+import logging
+import time
+from typing import List, Optional
+
+from ai.batch_policy import fallback_policy
+from game.tournament import Tournament
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Headless multi-table tournament")
+    parser.add_argument("--entrants", type=int, default=1000)
+    parser.add_argument("--seats", type=int, default=9)
+    parser.add_argument("--stack", type=int, default=1500)
+    parser.add_argument("--hands-per-level", type=int, default=10)
+    parser.add_argument("--seed", type=int, default=None)
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.WARNING)
+    started = time.perf_counter()
+    tournament = Tournament([f"Bot{i}" for i in range(args.entrants)], seats=args.seats, stack=args.stack,
+                            hands_per_level=args.hands_per_level, seed=args.seed)
+    tournament.run(fallback_policy)
+    elapsed = time.perf_counter() - started
+
+    for key, value in tournament.standings(limit=1).items():
+        if key != "leaders":
+            print(f"{key:>14}: {value}")
+    print(f"{'elapsed_s':>14}: {elapsed:.2f}")
+
+if __name__ == "__main__":
+    main()
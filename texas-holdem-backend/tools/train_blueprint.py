@@ -0,0 +1,184 @@
+"""
+Offline blueprint training: external-sampling Monte Carlo CFR on a heads-up,
+fixed-limit abstraction of the game (see ai.blueprint for the abstraction).
+
+Each round hands the current regrets to every worker process; workers run
+their iterations independently and return regret deltas plus average-strategy
+sums, which are merged before the next round. The average strategy is written
+as a fixed-layout table that ai.blueprint mmaps at runtime.
+
+    python -m tools.train_blueprint --iterations 200000 -j 8 --out blueprint.bin
+"""
+import argparse
+import logging
+import multiprocessing
+import os
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import List, Optional, Tuple
+
+from ai.blueprint import (FOLD, N_ACTIONS, N_INFOSETS, N_HISTORIES, RAISE, hand_bucket,
+                          history_index, infoset_index, legal_mask, write_table)
+from game.card import Card
+from game.hand_evaluator import BoardEvaluator
+
+logger = logging.getLogger('poker.blueprint.train')
+
+ALL_CARDS = [Card.from_int(code) for code in range(52)]
+BOARD_SIZES = (0, 3, 4, 5)
+# Fixed-limit bet sizes in small blinds: small bets preflop/flop, big bets on turn/river
+BET_SIZES = (2, 2, 4, 4)
+
+class Trainer:
+    """External-sampling MCCFR over the heads-up abstraction. Seat 0 is the small blind."""
+
+    def __init__(self, regrets: List[float], seed: Optional[int] = None):
+        self.regrets = list(regrets)
+        self.strategy_sum = [0.0] * len(regrets)
+        self.rng = random.Random(seed)
+        self.buckets: Tuple[Tuple[int, ...], Tuple[int, ...]] = ((), ())
+        self.winner = 0
+
+    def deal(self) -> None:
+        cards = self.rng.sample(ALL_CARDS, 9)
+        holes = (cards[0:2], cards[2:4])
+        board = cards[4:]
+        self.buckets = tuple(tuple(hand_bucket(hole, board[:n]) for n in BOARD_SIZES) for hole in holes)
+        river = BoardEvaluator(board)
+        s0 = river.evaluate(holes[0])
+        s1 = river.evaluate(holes[1])
+        self.winner = 0 if s0 > s1 else 1 if s1 > s0 else -1
+
+    def current_strategy(self, index: int, history: int) -> List[float]:
+        legal = legal_mask(history)
+        base = index * N_ACTIONS
+        positive = [max(self.regrets[base + a], 0.0) if legal[a] else 0.0 for a in range(N_ACTIONS)]
+        total = sum(positive)
+        if total > 0:
+            return [p / total for p in positive]
+        n_legal = sum(legal)
+        return [1.0 / n_legal if legal[a] else 0.0 for a in range(N_ACTIONS)]
+
+    def iterate(self, traverser: int) -> float:
+        self.deal()
+        return self.traverse(traverser, 0, [1, 2], 0, 0, 0)
+
+    def traverse(self, traverser: int, street: int, contrib: List[int], raises: int,
+                 player: int, acted: int) -> float:
+        opponent = 1 - player
+        facing = contrib[opponent] > contrib[player]
+        history = history_index(raises, facing)
+        index = infoset_index(street, self.buckets[player][street], history)
+        strategy = self.current_strategy(index, history)
+
+        if player == traverser:
+            legal = legal_mask(history)
+            values = [0.0] * N_ACTIONS
+            node_value = 0.0
+            for a in range(N_ACTIONS):
+                if legal[a]:
+                    values[a] = self.child(traverser, street, contrib, raises, player, acted, a, facing)
+                    node_value += strategy[a] * values[a]
+            base = index * N_ACTIONS
+            for a in range(N_ACTIONS):
+                if legal[a]:
+                    self.regrets[base + a] += values[a] - node_value
+            return node_value
+
+        base = index * N_ACTIONS
+        for a in range(N_ACTIONS):
+            self.strategy_sum[base + a] += strategy[a]
+        action = self.rng.choices(range(N_ACTIONS), weights=strategy)[0]
+        return self.child(traverser, street, contrib, raises, player, acted, action, facing)
+
+    def child(self, traverser: int, street: int, contrib: List[int], raises: int,
+              player: int, acted: int, action: int, facing: bool) -> float:
+        opponent = 1 - player
+        if action == FOLD:
+            return -contrib[traverser] if player == traverser else contrib[player]
+
+        contrib = list(contrib)
+        if action == RAISE:
+            contrib[player] = contrib[opponent] + BET_SIZES[street]
+            return self.traverse(traverser, street, contrib, raises + 1, opponent, acted + 1)
+
+        contrib[player] = contrib[opponent]
+        # A preflop limp leaves the big blind its option; any other call or a second check closes the street
+        street_over = (facing and not (street == 0 and raises == 0)) or (not facing and acted >= 1)
+        if not street_over:
+            return self.traverse(traverser, street, contrib, raises, opponent, acted + 1)
+        if street == len(BOARD_SIZES) - 1:
+            if self.winner < 0:
+                return 0.0
+            return contrib[1 - traverser] if self.winner == traverser else -contrib[traverser]
+        return self.traverse(traverser, street + 1, contrib, 0, 1, 0)
+
+def run_batch(regrets: List[float], iterations: int, seed: int) -> Tuple[List[float], List[float]]:
+    """Worker entry point: returns (regret deltas, strategy sums) for `iterations` iterations."""
+    trainer = Trainer(regrets, seed)
+    for i in range(iterations):
+        trainer.iterate(i % 2)
+    deltas = [after - before for after, before in zip(trainer.regrets, regrets)]
+    return deltas, trainer.strategy_sum
+
+def average_strategy(strategy_sum: List[float]) -> List[float]:
+    """Normalises strategy sums per infoset; unvisited infosets play uniformly over legal actions."""
+    probs: List[float] = []
+    for index in range(N_INFOSETS):
+        legal = legal_mask(index % N_HISTORIES)
+        row = [strategy_sum[index * N_ACTIONS + a] if legal[a] else 0.0 for a in range(N_ACTIONS)]
+        total = sum(row)
+        if total <= 0:
+            row, total = [1.0 if ok else 0.0 for ok in legal], float(sum(legal))
+        probs.extend(p / total for p in row)
+    return probs
+
+def train(iterations: int, processes: Optional[int] = None, rounds: int = 10,
+          seed: Optional[int] = None) -> List[float]:
+    """Runs `iterations` MCCFR iterations in `rounds` synchronised rounds; returns the average strategy."""
+    processes = processes or os.cpu_count() or 1
+    rng = random.Random(seed)
+    regrets = [0.0] * (N_INFOSETS * N_ACTIONS)
+    strategy_sum = [0.0] * (N_INFOSETS * N_ACTIONS)
+    per_worker = max(1, iterations // (rounds * processes))
+
+    pool = ProcessPoolExecutor(processes, mp_context=multiprocessing.get_context("spawn")) if processes > 1 else None
+    try:
+        for r in range(rounds):
+            seeds = [rng.getrandbits(32) for _ in range(processes)]
+            if pool:
+                results = list(pool.map(run_batch, [regrets] * processes, [per_worker] * processes, seeds))
+            else:
+                results = [run_batch(regrets, per_worker, seeds[0])]
+            for deltas, sums in results:
+                for i, d in enumerate(deltas):
+                    regrets[i] += d
+                for i, s in enumerate(sums):
+                    strategy_sum[i] += s
+            # Regret-matching+: negative regrets are floored after each round
+            regrets = [max(x, 0.0) for x in regrets]
+            logger.info(f"Round {r + 1}/{rounds}: {(r + 1) * per_worker * processes} iterations")
+    finally:
+        if pool:
+            pool.shutdown()
+    return average_strategy(strategy_sum)
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Train the blueprint strategy table")
+    parser.add_argument("--iterations", type=int, default=100000)
+    parser.add_argument("--rounds", type=int, default=20, help="Synchronisation rounds between workers")
+    parser.add_argument("-j", "--processes", type=int, default=None, help="Worker processes (default: all cores)")
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--out", default="blueprint.bin")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s [%(levelname)s] %(name)s: %(message)s', datefmt='%H:%M:%S')
+
+    started = time.perf_counter()
+    probs = train(args.iterations, args.processes, args.rounds, args.seed)
+    write_table(args.out, probs)
+    print(f"Wrote {args.out} ({N_INFOSETS} infosets) in {time.perf_counter() - started:.1f}s")
+
+if __name__ == "__main__":
+    main()
@@ -4,7 +4,7 @@ import { useGameEngine } from './hooks/useGameEngine';
 import GameBoard from './components/GameBoard';
 
 const App: React.FC = () => {
-  const { gameState, handlePlayerAction, newGame, nextHand, isConnected, isLoading, error } = useGameEngine();
+  const { gameState, equity, handlePlayerAction, newGame, nextHand, isConnected, isLoading, error } = useGameEngine();
 
   if (!gameState) {
     return (
@@ -41,7 +41,7 @@ const App: React.FC = () => {
             </div>
         )}
 
-      <GameBoard gameState={gameState} />
+      <GameBoard gameState={gameState} equity={equity} />
       
       {gameState.stage !== 'HAND_OVER' && humanPlayer && (
           <ActionControls
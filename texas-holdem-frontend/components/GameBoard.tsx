@@ -5,15 +5,16 @@ import { ChipPile } from './ChipPile';
 import { WinnerOverlay } from './WinnerOverlay';
 import { HandStrength } from './HandStrength';
 import { motion } from 'framer-motion';
-import { GameState } from '../types';
+import { EquityEstimate, GameState } from '../types';
 
 import "../styles/GameBoard.css";
 
 interface GameBoardProps {
   gameState: GameState;
+  equity?: EquityEstimate | null;
 }
 
-const GameBoard: React.FC<GameBoardProps> = ({ gameState }) => {
+const GameBoard: React.FC<GameBoardProps> = ({ gameState, equity }) => {
   const [showWinnerOverlay, setShowWinnerOverlay] = useState(false);
   const [previousStage, setPreviousStage] = useState<string | null>(null);
 
@@ -99,6 +100,7 @@ const GameBoard: React.FC<GameBoardProps> = ({ gameState }) => {
                 <HandStrength
                   hand={humanPlayer.hand}
                   communityCards={communityCards}
+                  equity={equity}
                 />
               </div>
             )}
@@ -1,9 +1,11 @@
 import React, { useMemo } from 'react';
 import { motion } from 'framer-motion';
+import { EquityEstimate } from '../types';
 
 interface HandStrengthProps {
     hand: string[];
     communityCards: string[];
+    equity?: EquityEstimate | null;
 }
 
 const RANK_VALUES: { [key: string]: number } = {
@@ -100,10 +102,21 @@ function evaluateHand(hand: string[], community: string[]): HandResult {
     return { rank: 1, name: 'High Card', description: `${highCard.rank} high`, color: 'text-gray-300' };
 }
 
-export const HandStrength: React.FC<HandStrengthProps> = ({ hand, communityCards }) => {
+function sameCards(a: string[], b: string[]): boolean {
+    return a.length === b.length && a.every((card, i) => card === b[i]);
+}
+
+export const HandStrength: React.FC<HandStrengthProps> = ({ hand, communityCards, equity }) => {
     const result = useMemo(() => evaluateHand(hand, communityCards), [hand, communityCards]);
 
-    const strengthPercent = Math.min(100, (result.rank / 9) * 100);
+    // Server estimates arrive progressively; ignore any for cards no longer on the table
+    const liveEquity = equity && sameCards(equity.hand, hand) && sameCards(equity.communityCards, communityCards)
+        ? equity
+        : null;
+
+    const strengthPercent = liveEquity
+        ? liveEquity.equity * 100
+        : Math.min(100, (result.rank / 9) * 100);
 
     const getGradient = () => {
         if (result.rank >= 7) return 'from-fuchsia-500 to-purple-600';
@@ -126,6 +139,11 @@ export const HandStrength: React.FC<HandStrengthProps> = ({ hand, communityCards
         >
             <div className="flex items-center justify-between mb-1.5">
                 <span className={`font-bold text-sm ${result.color}`}>{result.name}</span>
+                {liveEquity && (
+                    <span className="text-xs font-mono text-gray-300 ml-2" title={`${liveEquity.samples} run-outs`}>
+                        {Math.round(liveEquity.equity * 100)}%{liveEquity.done ? '' : '…'} vs {liveEquity.opponents}
+                    </span>
+                )}
             </div>
 
             {result.description && (
@@ -1,5 +1,5 @@
 import { useState, useCallback, useEffect, useRef } from 'react';
-import { GameState, PlayerAction } from '../types';
+import { EquityEstimate, GameState, PlayerAction } from '../types';
 import { io, Socket } from 'socket.io-client';
 
 const API_BASE_URL = 'http://localhost:5001';
@@ -14,6 +14,7 @@ const socket: Socket = io(API_BASE_URL, {
 
 export const useGameEngine = () => {
   const [gameState, setGameState] = useState<GameState | null>(null);
+  const [equity, setEquity] = useState<EquityEstimate | null>(null);
   
   const [isConnected, setIsConnected] = useState(socket.connected);
   
@@ -67,10 +68,15 @@ export const useGameEngine = () => {
         setIsLoading(false);
     };
 
+    const onEquity = (estimate: EquityEstimate) => {
+        setEquity(estimate);
+    };
+
     socket.on('connect', onConnect);
     socket.on('disconnect', onDisconnect);
     socket.on('update', onUpdate);
     socket.on('error', onError);
+    socket.on('equity', onEquity);
 
     if (socket.connected) onConnect();
 
@@ -79,6 +85,7 @@ export const useGameEngine = () => {
       socket.off('disconnect', onDisconnect);
       socket.off('update', onUpdate);
       socket.off('error', onError);
+      socket.off('equity', onEquity);
       if (disconnectTimerRef.current) clearTimeout(disconnectTimerRef.current);
     };
   }, []);
@@ -126,5 +133,5 @@ export const useGameEngine = () => {
     }
   }, [gameState, isLoading]);
 
-  return { gameState, handlePlayerAction, newGame, nextHand, isConnected, isLoading, error };
+  return { gameState, equity, handlePlayerAction, newGame, nextHand, isConnected, isLoading, error };
 };
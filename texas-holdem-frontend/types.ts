@@ -26,4 +26,15 @@ export interface GameState {
   winners?: number[];
 }
 
+export interface EquityEstimate {
+  handNo: number;
+  hand: string[];
+  communityCards: string[];
+  opponents: number;
+  equity: number;
+  samples: number;
+  stdError: number;
+  done: boolean;
+}
+
 export type PlayerAction = 'fold' | 'check' | 'call' | 'bet' | 'raise';